@@ -0,0 +1,200 @@
+import math
+import statistics
+import time
+
+from ajuste import ajustar
+from medicao import confianca_atual, medir, medir_memoria, resumir
+
+# ============================================================================
+#  PROJETO: AGENDADOR ADAPTATIVO DE REPETICOES
+# ============================================================================
+#  Em vez de repetir cada celula (motor, N) ate a sua propria confianca,
+#  distribui um orcamento TOTAL de tempo entre as celulas para estreitar o
+#  IC 95% da inclinacao 'a' de T(n) = a*n + b (o modelo de analise_completa).
+#
+#  1. Piloto: 1 aquecimento + 2 rodadas em cada celula (minimo obrigatorio,
+#     fora do orcamento: o relogio do orcamento so comeca depois dele; os
+#     pilotos dos pontos extras do passo 4 ja contam).
+#  2. A cada passo, a proxima rodada vai para a celula com maior ganho de
+#     informacao sobre 'a' por segundo gasto:
+#         ganho = (N - N_medio)^2 / s^2  (fracao da informacao do motor)
+#         custo = mediana do tempo de uma rodada
+#     Pontos nas pontas da varredura e pouco ruidosos pesam mais.
+#  3. Uma celula fecha quando o seu IC relativo fica abaixo de
+#     'alvo_celula'; um motor fecha quando o IC relativo de 'a' fica abaixo
+#     de 'alvo_inclinacao'.
+#  4. Quando nada mais vale a pena medir, insere um N intermediario (media
+#     geometrica) entre os dois pontos vizinhos com os maiores residuos
+#     relativos do ajuste linear, para todos os motores (ate 'pontos_extras').
+# ============================================================================
+
+# Minimo de rodadas por celula no piloto (variancia precisa de 2)
+RODADAS_PILOTO = 2
+
+# Novo ponto so entra se os vizinhos estiverem ao menos 20% afastados
+RAZAO_MIN_VIZINHOS = 1.2
+
+
+def rodada(funcao, entrada):
+    """
+    Uma rodada cronometrada, sem aquecimento; devolve o tempo em ns.
+    """
+    return medir(funcao, entrada=entrada, aquecimento=0, min_repeticoes=1,
+                 max_repeticoes=1)['amostras_ns'][0]
+
+
+def ic_relativo_inclinacao(valores, amostras_ns):
+    """
+    Ajuste linear sobre todas as rodadas de um motor; devolve (ajuste,
+    meia-largura do IC 95% de 'a' dividida por 'a').
+    """
+    ns = sorted(valores)
+    aj = ajustar(ns, [[t / 1e6 for t in amostras_ns[n]] for n in ns], 'linear')
+    meia = (aj['ic_a'][1] - aj['ic_a'][0]) / 2
+    return aj, (float(meia / abs(aj['a'])) if aj['a'] else math.inf)
+
+
+def ganho_por_segundo(valores, amostras_ns):
+    """
+    Fracao da informacao de Fisher sobre 'a' que uma rodada extra em cada N
+    acrescenta, dividida pelo custo (s) da rodada. Devolve {n: pontuacao}.
+    """
+    variancia = {}
+    for n in valores:
+        amostras = amostras_ns[n]
+        media = statistics.fmean(amostras)
+        # Piso da variancia (como em ajuste.empilhar_amostras): evita
+        # ganho infinito quando as rodadas empatam
+        variancia[n] = max(statistics.variance(amostras), (1e-3 * media) ** 2, 1.0)
+
+    # N medio ponderado pela informacao atual de cada ponto
+    pesos = {n: len(amostras_ns[n]) / variancia[n] for n in valores}
+    n_medio = sum(pesos[n] * n for n in valores) / sum(pesos.values())
+    informacao = sum(pesos[n] * (n - n_medio) ** 2 for n in valores) or 1.0
+    return {n: ((n - n_medio) ** 2 / variancia[n]) / informacao
+               / (statistics.median(amostras_ns[n]) / 1e9)
+            for n in valores}
+
+
+def novo_ponto(valores, amostras_por_motor):
+    """
+    Media geometrica dos dois N vizinhos com a maior soma de residuos
+    relativos (|residuo| / previsao) do ajuste linear, somada entre motores.
+    None se nenhum par estiver afastado o bastante.
+    """
+    ns = sorted(valores)
+    erro = dict.fromkeys(ns, 0.0)
+    for amostras_ns in amostras_por_motor.values():
+        aj, _ = ic_relativo_inclinacao(ns, amostras_ns)
+        for n in ns:
+            previsto = aj['a'] * n + aj['b']
+            mediana = statistics.median(amostras_ns[n]) / 1e6
+            erro[n] += abs(mediana - previsto) / abs(previsto) if previsto else 0.0
+
+    pares = [(erro[a] + erro[b], a, b) for a, b in zip(ns, ns[1:])
+             if b / a >= RAZAO_MIN_VIZINHOS]
+    if not pares:
+        return None
+    _, a, b = max(pares)
+    return int(round(math.sqrt(a * b)))
+
+
+def agendar(motores, valores, orcamento_s, preparar_por_n=range, alvo_inclinacao=0.01,
+            alvo_celula=0.01, max_repeticoes=50, pontos_extras=3, memoria=False,
+            relatorio=None):
+    """
+    Mede todos os motores na varredura 'valores' dentro de 'orcamento_s'
+    segundos (piloto a parte), priorizando as rodadas que mais estreitam o IC
+    da inclinacao de cada motor.
+
+    - motores: {nome: funcao}.
+    - preparar_por_n: n -> entrada (construida uma vez por N, fora do cronometro).
+    - memoria: acrescenta o perfil de medir_memoria() a cada celula no final.
+    - relatorio: se for um dicionario, recebe 'piloto_s', 'gasto_s' (tempo
+      contado no orcamento, apos o piloto), 'pontos_extras', 'ic_relativo' ({motor: IC relativo de a}) e 'rodadas' ({(motor, n): k}).
+
+    Devolve {(nome_motor, n): resumo} no formato de medicao.medir, com
+    'tamanho_resultado' (tamanho da saida de cada celula).
+    """
+    valores = sorted(valores)
+    entradas = {}
+    amostras = {nome: {} for nome in motores}
+    tamanhos = {}
+
+    def gasto():
+        return time.perf_counter() - inicio
+
+    def pilotar(n):
+        entradas[n] = preparar_por_n(n)
+        for nome, funcao in motores.items():
+            resumo = medir(funcao, entrada=entradas[n], aquecimento=1,
+                           min_repeticoes=RODADAS_PILOTO, max_repeticoes=RODADAS_PILOTO,
+                           guardar_resultado=True)
+            amostras[nome][n] = list(resumo['amostras_ns'])
+            tamanhos[(nome, n)] = len(resumo['resultado'])
+
+    # --- 1. Piloto (fora do orcamento: o relogio so comeca depois) ---
+    inicio = time.perf_counter()
+    for n in valores:
+        pilotar(n)
+    piloto_s = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+
+    # --- 2. Rodadas onde mais reduzem o IC de 'a' ---
+    extras = []
+    while True:
+        candidatos = []
+        for nome in motores:
+            _, ic_rel = ic_relativo_inclinacao(valores, amostras[nome])
+            if ic_rel <= alvo_inclinacao:
+                continue
+            for n, pontuacao in ganho_por_segundo(valores, amostras[nome]).items():
+                celula = amostras[nome][n]
+                if len(celula) >= max_repeticoes or confianca_atual(celula) <= alvo_celula:
+                    continue
+                # So entra se a rodada ainda couber no orcamento
+                if gasto() + statistics.median(celula) / 1e9 > orcamento_s:
+                    continue
+                candidatos.append((pontuacao, nome, n))
+
+        if candidatos:
+            _, nome, n = max(candidatos)
+            amostras[nome][n].append(rodada(motores[nome], entradas[n]))
+            continue
+
+        # --- 3. Nada a medir: refina a grade onde o modelo erra mais ---
+        if len(extras) >= pontos_extras or gasto() >= orcamento_s:
+            break
+        n = novo_ponto(valores, amostras)
+        if n is None or n in valores:
+            break
+        # O piloto custa ~(1 + RODADAS_PILOTO) rodadas do vizinho maior (estimativa pessimista)
+        estimativa = sum(statistics.median(amostras[nome][min(v for v in valores if v > n)])
+                         for nome in motores) * (1 + RODADAS_PILOTO) / 1e9
+        if gasto() + estimativa > orcamento_s:
+            break
+        extras.append(n)
+        valores = sorted(valores + [n])
+        pilotar(n)
+
+    # --- Resumos finais ---
+    medicoes = {}
+    for nome, funcao in motores.items():
+        for n in valores:
+            resumo = resumir(amostras[nome][n])
+            resumo['confianca'] = confianca_atual(amostras[nome][n])
+            resumo['tamanho_resultado'] = tamanhos[(nome, n)]
+            if memoria:
+                resumo.update(medir_memoria(funcao, entrada=entradas[n]))
+            medicoes[(nome, n)] = resumo
+    entradas.clear()
+
+    if relatorio is not None:
+        relatorio['piloto_s'] = piloto_s
+        relatorio['gasto_s'] = gasto()
+        relatorio['pontos_extras'] = extras
+        relatorio['ic_relativo'] = {nome: ic_relativo_inclinacao(valores, amostras[nome])[1]
+                                    for nome in motores}
+        relatorio['rodadas'] = {(nome, n): len(amostras[nome][n])
+                                for nome in motores for n in valores}
+    return medicoes
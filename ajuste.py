@@ -0,0 +1,238 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+# ============================================================================
+#  PROJETO: AJUSTE ESTATISTICO DO MODELO T(n)
+# ============================================================================
+#  Regressao por minimos quadrados sobre TODAS as repeticoes de cada N.
+#
+#  Modelos candidatos (dois parametros cada):
+#    linear      T(n) = a * n        + b
+#    nlogn       T(n) = a * n log n  + b
+#    quadratico  T(n) = a * n^2      + b
+#    potencia    T(n) = a * n^k          (b = k, ajustado em log-log)
+#
+#  Para cada ajuste: a, b, IC 95% de ambos (t de Student), R2 verdadeiro,
+#  residuos, AIC e BIC. O modelo final e escolhido pelo menor criterio.
+#  intervalo_predicao() da a faixa esperada de uma NOVA medicao em qualquer
+#  N (incerteza da reta + ruido de uma observacao).
+#
+#  Com 'ponderado=True' usa minimos quadrados ponderados (WLS), com peso
+#  1/variancia das repeticoes de cada N — os N grandes deixam de dominar.
+# ============================================================================
+
+MODELOS = ('linear', 'nlogn', 'quadratico', 'potencia')
+
+
+# Ate este numero de graus de liberdade o quantil e exato (inversao da
+# distribuicao); acima, a expansao de Cornish-Fisher
+GL_EXATO = 30
+
+
+def distribuicao_t(t, gl):
+    """
+    P(T <= t) da t de Student com 'gl' inteiro, em forma fechada
+    (Abramowitz & Stegun 26.7.3 e 26.7.4).
+    """
+    theta = math.atan(abs(t) / math.sqrt(gl))
+    c2, s = math.cos(theta) ** 2, math.sin(theta)
+    if gl % 2:
+        soma, termo = 0.0, math.cos(theta)
+        for k in range(1, (gl - 1) // 2 + 1):
+            soma += termo
+            termo *= c2 * (2 * k) / (2 * k + 1)
+        a = 2 / math.pi * (theta + s * soma) if gl > 1 else 2 * theta / math.pi
+    else:
+        soma, termo = 0.0, 1.0
+        for k in range(1, gl // 2 + 1):
+            soma += termo
+            termo *= c2 * (2 * k - 1) / (2 * k)
+        a = s * soma
+    return 0.5 + math.copysign(a / 2, t)
+
+
+def quantil_t(p, gl):
+    """
+    Quantil da t de Student. Ate GL_EXATO graus de liberdade, exato
+    (bissecao sobre distribuicao_t); acima, expansao de Cornish-Fisher
+    sobre a normal (erro < 1e-4 a partir de 30 graus de liberdade).
+    """
+    if gl <= 0:
+        return math.inf
+    if gl <= GL_EXATO and gl == int(gl):
+        if p == 0.5:
+            return 0.0
+        if p < 0.5:
+            return -quantil_t(1 - p, gl)
+        baixo, alto = 0.0, 1.0
+        while distribuicao_t(alto, int(gl)) < p:
+            alto *= 2
+        for _ in range(100):
+            meio = (baixo + alto) / 2
+            if distribuicao_t(meio, int(gl)) < p:
+                baixo = meio
+            else:
+                alto = meio
+        return (baixo + alto) / 2
+    z = NormalDist().inv_cdf(p)
+    return (z
+            + (z**3 + z) / (4 * gl)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * gl**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * gl**3))
+
+
+def empilhar_amostras(n, amostras):
+    """
+    Expande [N] x [[repeticoes]] em dois vetores alinhados (x, y) e devolve
+    tambem o peso de cada amostra (1 / variancia do seu N).
+    """
+    x, y, pesos = [], [], []
+    for ni, reps in zip(n, amostras):
+        reps = np.atleast_1d(np.asarray(reps, dtype=float))
+        var = reps.var(ddof=1) if reps.size > 1 else 0.0
+        # Piso da variancia evita peso infinito quando as repeticoes empatam
+        var = max(var, (1e-3 * reps.mean()) ** 2, 1e-12)
+        x.append(np.full(reps.size, ni, dtype=float))
+        y.append(reps)
+        pesos.append(np.full(reps.size, 1.0 / var))
+    return np.concatenate(x), np.concatenate(y), np.concatenate(pesos)
+
+
+def base_modelo(modelo, x):
+    """
+    Regressor do modelo (a coluna multiplicada por 'a').
+    """
+    if modelo == 'linear':
+        return x
+    if modelo == 'nlogn':
+        return x * np.log2(x)
+    if modelo == 'quadratico':
+        return x ** 2
+    raise ValueError(f"modelo desconhecido: {modelo}")
+
+
+def prever(ajuste, n):
+    """
+    Avalia o modelo ajustado em 'n' (escalar ou vetor).
+    """
+    n = np.asarray(n, dtype=float)
+    if ajuste['modelo'] == 'potencia':
+        return ajuste['a'] * n ** ajuste['b']
+    return ajuste['a'] * base_modelo(ajuste['modelo'], n) + ajuste['b']
+
+
+def ajustar(n, amostras, modelo='linear', ponderado=False, confianca=0.95):
+    """
+    Ajusta 'modelo' a todas as amostras e devolve um dicionario com
+    a, b, ic_a, ic_b, r2, residuos, rss, aic, bic e graus de liberdade.
+
+    - n: lista de tamanhos N.
+    - amostras: lista (alinhada com n) de listas de tempos em ms; um numero
+      isolado por N tambem e aceito (ex.: so as medianas).
+    """
+    x, y, pesos = empilhar_amostras(n, amostras)
+    if not ponderado:
+        pesos = np.ones_like(y)
+    m = y.size
+
+    # --- Minimos quadrados (WLS: escala as linhas por sqrt(peso)) ---
+    raiz_w = np.sqrt(pesos)
+    if modelo == 'potencia':
+        # log T = log a + k log n, resolvido no espaco log
+        X = np.column_stack([np.log(x), np.ones(m)])
+        alvo = np.log(np.maximum(y, 1e-12))
+    else:
+        X = np.column_stack([base_modelo(modelo, x), np.ones(m)])
+        alvo = y
+    coef, *_ = np.linalg.lstsq(X * raiz_w[:, None], alvo * raiz_w, rcond=None)
+
+    # --- Covariancia e intervalos de confianca ---
+    p = X.shape[1]
+    gl = m - p
+    res_lin = alvo - X @ coef
+    sigma2 = float(np.sum(pesos * res_lin**2) / gl) if gl > 0 else math.nan
+    cov = sigma2 * np.linalg.pinv((X * pesos[:, None]).T @ X)
+    erro_padrao = np.sqrt(np.diag(cov))
+    t = quantil_t(0.5 + confianca / 2, gl)
+
+    if modelo == 'potencia':
+        # Parametros naturais: a = exp(intercepto), b = expoente k
+        k, log_a = coef
+        a, b = math.exp(log_a), float(k)
+        ic_a = (math.exp(log_a - t * erro_padrao[1]), math.exp(log_a + t * erro_padrao[1]))
+        ic_b = (k - t * erro_padrao[0], k + t * erro_padrao[0])
+    else:
+        a, b = (float(c) for c in coef)
+        ic_a = (a - t * erro_padrao[0], a + t * erro_padrao[0])
+        ic_b = (b - t * erro_padrao[1], b + t * erro_padrao[1])
+
+    ajuste = {'modelo': modelo, 'a': a, 'b': b, 'ic_a': ic_a, 'ic_b': ic_b,
+              'ponderado': ponderado, 'total_amostras': m, 'gl': gl,
+              'cov': cov, 'sigma2': sigma2}
+
+    # --- Qualidade do ajuste na escala original (comparavel entre modelos) ---
+    residuos = y - prever(ajuste, x)
+    rss = float(np.sum(pesos * residuos**2))
+    media = np.sum(pesos * y) / np.sum(pesos)
+    tss = float(np.sum(pesos * (y - media) ** 2))
+    ajuste['residuos'] = residuos
+    ajuste['n_por_amostra'] = x
+    ajuste['rss'] = rss
+    ajuste['r2'] = 1.0 - rss / tss if tss > 0 else 1.0
+    # Verossimilhanca gaussiana: AIC = m ln(RSS/m) + 2p ; BIC = m ln(RSS/m) + p ln m
+    log_rss = m * math.log(max(rss, 1e-300) / m)
+    ajuste['aic'] = log_rss + 2 * p
+    ajuste['bic'] = log_rss + p * math.log(m)
+    return ajuste
+
+
+def intervalo_predicao(ajuste, n, confianca=0.95, variancia_obs=None):
+    """
+    Intervalo de predicao de uma nova medicao em 'n' (escalar ou vetor):
+    variancia da reta ajustada (covariancia de a, b) mais a de uma
+    observacao, sigma2 ou 'variancia_obs' por ponto (necessaria no WLS, em
+    que o ruido muda com N). Devolve (centro, baixo, alto).
+    """
+    if ajuste['modelo'] == 'potencia':
+        raise ValueError("intervalo de predicao so e definido para modelos lineares em a e b")
+    n = np.asarray(n, dtype=float)
+    X = np.stack([base_modelo(ajuste['modelo'], n), np.ones_like(n)], axis=-1)
+    var_reta = np.einsum('...i,ij,...j->...', X, ajuste['cov'], X)
+    var_obs = ajuste['sigma2'] if variancia_obs is None else variancia_obs
+    meia = quantil_t(0.5 + confianca / 2, ajuste['gl']) * np.sqrt(var_reta + var_obs)
+    centro = prever(ajuste, n)
+    return centro, centro - meia, centro + meia
+
+
+def selecionar_modelo(n, amostras, criterio='bic', ponderado=False, modelos=MODELOS):
+    """
+    Ajusta todos os modelos candidatos e devolve (melhor, {modelo: ajuste}).
+    """
+    ajustes = {mod: ajustar(n, amostras, mod, ponderado) for mod in modelos}
+    melhor = min(ajustes.values(), key=lambda aj: aj[criterio])
+    return melhor, ajustes
+
+
+def custo_por_elemento(ajuste):
+    """
+    Inclinacao do modelo linear convertida para ns/elemento (com IC).
+    """
+    if ajuste['modelo'] != 'linear':
+        raise ValueError("custo por elemento so e definido para o modelo linear")
+    return ajuste['a'] * 1e6, (ajuste['ic_a'][0] * 1e6, ajuste['ic_a'][1] * 1e6)
+
+
+def formatar_ajuste(ajuste):
+    """
+    Linha de texto com a equacao, IC 95% e R2 do ajuste.
+    """
+    a, b = ajuste['a'], ajuste['b']
+    if ajuste['modelo'] == 'potencia':
+        eq = f"T(n) = {a:.3e} n^{b:.4f}"
+    else:
+        termo = {'linear': 'n', 'nlogn': 'n log n', 'quadratico': 'n^2'}[ajuste['modelo']]
+        eq = f"T(n) = {a:.4e} {termo} {'+' if b >= 0 else '-'} {abs(b):.3f}"
+    return (f"{eq}  [a: {ajuste['ic_a'][0]:.4e} .. {ajuste['ic_a'][1]:.4e}; "
+            f"b: {ajuste['ic_b'][0]:.3f} .. {ajuste['ic_b'][1]:.3f}]  R2 = {ajuste['r2']:.5f}")
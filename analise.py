@@ -0,0 +1,195 @@
+import argparse
+import runpy
+import subprocess
+import sys
+import time
+
+# ============================================================================
+#  PROJETO: PONTO DE ENTRADA UNICO DA SUITE DE ANALISE
+# ============================================================================
+#  Uso:  python -m analise <comando> [opcoes]
+#
+#  Comandos:
+#  - run:    executa um benchmark (completo, pares, subprocessos ou hierarquia)
+#            e grava resultados.json.
+#  - report: renderiza todos os dashboards em arquivos (relatorios.py).
+#  - fit:    tabela do ajuste T(n) = a*n + b com IC 95% (numpy, sem matplotlib).
+#  - table:  tabelas de tempo e memoria (so biblioteca padrao).
+#  - compare: regressoes entre dois resultados (comparacao.py; codigo de
+#             saida 1 se houver regressao).
+#  - profile: chamadas, bytecodes e redimensionamentos por elemento e pilhas
+#             colapsadas para flamegraph (perfilamento.py; fora das medicoes).
+#  - capacity: maior N num orcamento de latencia, nucleos para uma vazao e
+#              quebras de cache, com intervalos de predicao (capacidade.py).
+#
+#  Cada comando importa apenas o que usa: numpy e matplotlib ficam dentro
+#  das funcoes, de modo que 'table' inicia bem abaixo de 100 ms.
+#
+#  --tempo-importacao reexecuta o comando sob 'python -X importtime' e
+#  resume os modulos mais caros de importar (tempo acumulado).
+# ============================================================================
+
+BENCHMARKS = {'completo': 'benchmark_completo', 'pares': 'benchmark_pares',
+              'subprocessos': 'orquestrador', 'hierarquia': 'hierarquia'}
+
+
+def comando_run(args):
+    """
+    Executa o benchmark escolhido como script, repassando as opcoes extras.
+    """
+    modulo = BENCHMARKS[args.benchmark]
+    sys.argv = [modulo + '.py'] + args.extras
+    runpy.run_module(modulo, run_name='__main__', alter_sys=True)
+
+
+def comando_compare(args):
+    """
+    Executa comparacao.py com as opcoes extras (sai com 1 se houver regressao).
+    """
+    sys.argv = ['comparacao.py'] + args.extras
+    runpy.run_module('comparacao', run_name='__main__', alter_sys=True)
+
+
+def comando_profile(args):
+    """
+    Executa perfilamento.py com as opcoes extras (ex.: --n 10000 --motores for,lambda).
+    """
+    sys.argv = ['perfilamento.py'] + args.extras
+    runpy.run_module('perfilamento', run_name='__main__', alter_sys=True)
+
+
+def comando_capacity(args):
+    """
+    Executa capacidade.py com as opcoes extras (ex.: --orcamento-ms 200 --vazao 1e8).
+    """
+    sys.argv = ['capacidade.py'] + args.extras
+    runpy.run_module('capacidade', run_name='__main__', alter_sys=True)
+
+
+def comando_report(args):
+    """
+    Renderiza os dashboards sem janela (matplotlib so e importado aqui).
+    """
+    from relatorios import SAIDA_PADRAO, gerar_relatorios
+
+    renderizados, pulados = gerar_relatorios(args.saida or SAIDA_PADRAO, args.formatos.split(','),
+                                             args.forcar, args.trabalhadores)
+    print(f"Renderizados: {len(renderizados)}  |  Inalterados (pulados): {len(pulados)}")
+
+
+def comando_fit(args):
+    """
+    Tabela teoria vs pratica e ajuste por minimos quadrados (analise_completa).
+    """
+    from analise_completa import carregar_dados, imprimir_tabela
+
+    imprimir_tabela(carregar_dados())
+
+
+def comando_table(args):
+    """
+    Tabelas de texto da analise experimental, sem numpy nem matplotlib.
+    """
+    from analise_experimental import carregar_dados, imprimir_memoria, imprimir_relatorio
+
+    dados = carregar_dados()
+    imprimir_relatorio(dados['n_elementos'], dados['tempos_for'], dados['tempos_lambda'])
+    imprimir_memoria(dados['memoria'])
+
+
+def resumir_importtime(saida_erro, limite=15):
+    """
+    Le as linhas 'import time: self [us] | cumulative | pacote' do stderr e
+    devolve (total_us, [(acumulado_us, proprio_us, pacote)] dos mais caros).
+    """
+    linhas = []
+    for linha in saida_erro.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        proprio, acumulado, pacote = linha[len('import time:'):].split('|', 2)
+        linhas.append((int(acumulado), int(proprio), pacote.rstrip()))
+    # Modulos de topo (sem indentacao) somam o custo total de importacao
+    total = sum(acum for acum, _, pacote in linhas if not pacote.startswith('  '))
+    return total, sorted(linhas, reverse=True)[:limite]
+
+
+def medir_importacao(argv):
+    """
+    Reexecuta 'python -X importtime -m analise <argv>' e imprime o tempo de
+    parede e os modulos mais caros de importar.
+    """
+    t0 = time.perf_counter()
+    processo = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'analise'] + argv,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    parede_ms = (time.perf_counter() - t0) * 1e3
+    total_us, caros = resumir_importtime(processo.stderr)
+
+    print("=" * 80)
+    print(f"TEMPO DE INICIALIZACAO: python -m analise {' '.join(argv)}")
+    print("=" * 80)
+    print(f"Tempo de parede (processo inteiro): {parede_ms:.1f} ms")
+    print(f"Importacoes (soma dos modulos de topo): {total_us / 1e3:.1f} ms")
+    print("-" * 80)
+    print(f"{'Acumulado (ms)':<16} {'Proprio (ms)':<14} Modulo")
+    for acumulado, proprio, pacote in caros:
+        print(f"{acumulado / 1e3:<16.1f} {proprio / 1e3:<14.1f} {pacote}")
+    print("=" * 80)
+    return processo.returncode
+
+
+def criar_parser():
+    """
+    Parser com um subcomando por modo (run, report, fit, table, compare, profile, capacity).
+    """
+    parser = argparse.ArgumentParser(prog='python -m analise',
+                                     description="Suite de analise do benchmark de filtragem de pares")
+    parser.add_argument('--tempo-importacao', '--importtime', action='store_true',
+                        help="mede o custo de inicializacao do comando (-X importtime)")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    run = sub.add_parser('run', help="executa um benchmark e grava resultados.json")
+    run.add_argument('benchmark', nargs='?', choices=sorted(BENCHMARKS), default='completo',
+                     help="demais opcoes sao repassadas ao benchmark (ex.: --forcar)")
+    run.set_defaults(funcao=comando_run, repassar=True)
+
+    report = sub.add_parser('report', help="renderiza os dashboards em PNG/SVG/HTML")
+    report.add_argument('--saida', default=None, help="diretorio de saida (padrao: relatorios/)")
+    report.add_argument('--formatos', default='png,svg')
+    report.add_argument('--trabalhadores', type=int, default=None)
+    report.add_argument('--forcar', '--force', action='store_true')
+    report.set_defaults(funcao=comando_report)
+
+    fit = sub.add_parser('fit', help="tabela do ajuste T(n) com IC 95%% e modelo por BIC")
+    fit.set_defaults(funcao=comando_fit)
+
+    table = sub.add_parser('table', help="tabelas de tempo (for vs lambda) e de memoria")
+    table.set_defaults(funcao=comando_table)
+
+    # Opcoes de comparacao.py sao repassadas (ex.: --base antigo.json --limiar 0.05)
+    compare = sub.add_parser('compare', help="compara dois resultados e aponta regressoes")
+    compare.set_defaults(funcao=comando_compare, repassar=True)
+
+    # Opcoes de perfilamento.py sao repassadas (ex.: --n 10000 --motores for,lambda)
+    profile = sub.add_parser('profile', help="perfil do interpretador por elemento e pilhas colapsadas")
+    profile.set_defaults(funcao=comando_profile, repassar=True)
+
+    # Opcoes de capacidade.py sao repassadas (ex.: --orcamento-ms 200 --prever 1e9)
+    capacity = sub.add_parser('capacity', help="planejamento de capacidade com intervalos de predicao")
+    capacity.set_defaults(funcao=comando_capacity, repassar=True)
+    return parser
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    parser = criar_parser()
+    # run e compare repassam as opcoes que nao reconhecem ao script alvo
+    args, args.extras = parser.parse_known_args(argv)
+    if args.extras and not getattr(args, 'repassar', False):
+        parser.error(f"argumentos nao reconhecidos: {' '.join(args.extras)}")
+    if args.tempo_importacao:
+        sys.exit(medir_importacao([a for a in argv if a not in ('--tempo-importacao', '--importtime')]))
+    args.funcao(args)
@@ -1,6 +1,13 @@
-import matplotlib.pyplot as plt
+import textwrap
+
 import numpy as np
 
+from ajuste import ajustar, custo_por_elemento, formatar_ajuste, selecionar_modelo
+from analise_experimental import plotar_memoria
+from colunar import diretorio_de, resumo_historico
+from resultados import (ARQUIVO_PADRAO, carregar_series, carregar_series_contadores,
+                        carregar_series_memoria)
+
 # ============================================================================
 #  PROJETO: RELATORIO FINAL COMPLETO (TEORIA vs PRATICA)
 # ============================================================================
@@ -9,232 +16,499 @@ import numpy as np
 #  1. A precisao do modelo matematico (Erro Relativo).
 #  2. A diferenca de performance exata (Coeficientes Lineares).
 #  3. Graficos detalhados de Residuos e Diferencas.
+#
+#  Cada dashboard e uma funcao que recebe os dados brutos (carregar_dados)
+#  e devolve a figura, para que relatorios.py possa renderiza-los em
+#  paralelo e sem janela (backend Agg). matplotlib so e importado pelos
+#  dashboards: a tabela do ajuste (python -m analise fit) nao paga o custo.
 # ============================================================================
 
-# --- 1. DADOS EXPERIMENTAIS ---
-n_elementos = [100_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000]
-tempos_exp_for = [15.2, 152.7, 761.9, 1523.4, 7617.9]
-tempos_exp_lambda = [21.4, 215.3, 1076.5, 2154.3, 10769.2]
-
-# --- 2. PARAMETROS DO MODELO TEORICO ---
-# Coeficientes da regressao linear (Tempo / n)
-a_exp_for = 0.0001523
-b_exp_for = 0.1
-a_exp_lambda = 0.0002154
-b_exp_lambda = 0.15
-
-# Geracao de dados continuos para as linhas dos graficos
-n_continuo = np.linspace(100_000, 50_000_000, 100)
-tempos_teo_for = a_exp_for * n_continuo + b_exp_for
-tempos_teo_lambda = a_exp_lambda * n_continuo + b_exp_lambda
+# Nomes das grandezas derivadas, na ordem devolvida por calcular_modelo()
+GRANDEZAS = ('n_elementos', 'tempos_exp_for', 'tempos_exp_lambda',
+             'ajuste_for', 'ajuste_lambda', 'melhor_for', 'melhor_lambda',
+             'a_exp_for', 'b_exp_for', 'a_exp_lambda', 'b_exp_lambda',
+             'n_continuo', 'tempos_teo_for', 'tempos_teo_lambda',
+             'erro_rel_for', 'erro_rel_lambda')
+
+def carregar_dados():
+    """
+    Dados brutos do relatorio (serializaveis): series for/lambda gravadas
+    pelos benchmarks (ou de referencia), o perfil de memoria, os contadores
+    de hardware e o historico colunar ja agregado por (execucao, motor, N).
+    """
+    n_elementos, series = carregar_series('for', 'lambda')
+    return {'n_elementos': n_elementos, 'series': series,
+            'memoria': carregar_series_memoria(),
+            'contadores': carregar_series_contadores(),
+            'historico': resumo_historico(diretorio_de(ARQUIVO_PADRAO))['linhas']}
+
+def calcular_modelo(dados):
+    """
+    Ajusta o modelo teorico e calcula as grandezas usadas nos graficos e na
+    tabela. Devolve uma tupla na ordem de GRANDEZAS.
+    """
+    # --- 1. DADOS EXPERIMENTAIS ---
+    n_elementos, series = dados['n_elementos'], dados['series']
+    tempos_exp_for = series['for']['mediana_ms']
+    tempos_exp_lambda = series['lambda']['mediana_ms']
+
+    # --- 2. PARAMETROS DO MODELO TEORICO ---
+    # Regressao linear (OLS) sobre todas as repeticoes de cada N
+    amostras_for = series['for'].get('amostras_ms', tempos_exp_for)
+    amostras_lambda = series['lambda'].get('amostras_ms', tempos_exp_lambda)
+    ajuste_for = ajustar(n_elementos, amostras_for, 'linear')
+    ajuste_lambda = ajustar(n_elementos, amostras_lambda, 'linear')
+
+    # Modelo preferido pelo BIC entre linear, n log n, n^2 e potencia
+    melhor_for, _ = selecionar_modelo(n_elementos, amostras_for)
+    melhor_lambda, _ = selecionar_modelo(n_elementos, amostras_lambda)
+
+    a_exp_for = ajuste_for['a']
+    b_exp_for = ajuste_for['b']
+    a_exp_lambda = ajuste_lambda['a']
+    b_exp_lambda = ajuste_lambda['b']
+
+    # Geracao de dados continuos para as linhas dos graficos
+    n_continuo = np.linspace(min(n_elementos), max(n_elementos), 100)
+    tempos_teo_for = a_exp_for * n_continuo + b_exp_for
+    tempos_teo_lambda = a_exp_lambda * n_continuo + b_exp_lambda
+
+    # Erro relativo de cada ponto experimental frente ao modelo
+    erro_rel_for = []
+    erro_rel_lambda = []
+
+    for i, n in enumerate(n_elementos):
+        teor_for = a_exp_for * n + b_exp_for
+        teor_lambda = a_exp_lambda * n + b_exp_lambda
+        erro_for = abs((tempos_exp_for[i] - teor_for) / teor_for) * 100
+        erro_lambda = abs((tempos_exp_lambda[i] - teor_lambda) / teor_lambda) * 100
+        erro_rel_for.append(erro_for)
+        erro_rel_lambda.append(erro_lambda)
+
+    return (n_elementos, tempos_exp_for, tempos_exp_lambda,
+            ajuste_for, ajuste_lambda, melhor_for, melhor_lambda,
+            a_exp_for, b_exp_for, a_exp_lambda, b_exp_lambda,
+            n_continuo, tempos_teo_for, tempos_teo_lambda,
+            erro_rel_for, erro_rel_lambda)
+
+def conclusao_modelo(ajuste_for, ajuste_lambda, melhor_for, melhor_lambda):
+    """
+    Conclusao tirada do ajuste: quanto o modelo linear explica (R2 de cada
+    abordagem) e se o BIC tambem o prefere. Devolve uma lista de linhas.
+    """
+    r2 = min(ajuste_for['r2'], ajuste_lambda['r2'])
+    if r2 >= 0.99:
+        grau = "explica muito bem"
+    elif r2 >= 0.95:
+        grau = "explica razoavelmente"
+    else:
+        grau = "NAO explica bem"
+    linhas = [f"O modelo teorico Theta(n) {grau} o comportamento observado (menor R2 = {r2:.4f})."]
+    outros = [f"{nome}: {melhor['modelo']}" for nome, melhor in (('for', melhor_for), ('lambda', melhor_lambda))
+              if melhor['modelo'] != 'linear']
+    if outros:
+        linhas.append(f"Mas o BIC prefere outro modelo ({'; '.join(outros)}): ha curvatura alem da reta.")
+    else:
+        linhas.append("O BIC tambem prefere o modelo linear para as duas abordagens.")
+    return linhas
 
 # ============================================================================
 #  GERACAO DOS GRAFICOS (Dashboard 1)
 # ============================================================================
 
-fig = plt.figure(figsize=(16, 12))
-
-# --- Grafico 1: Comparacao Direta ---
-ax1 = plt.subplot(2, 2, 1)
-ax1.plot(n_continuo, tempos_teo_for, 'b-', linewidth=2.5, alpha=0.7, label='For (Teorico)')
-ax1.plot(n_continuo, tempos_teo_lambda, 'r-', linewidth=2.5, alpha=0.7, label='Lambda (Teorico)')
-ax1.plot(n_elementos, tempos_exp_for, 'bo', markersize=10, label='For (Experimental)', markeredgewidth=2, markeredgecolor='darkblue')
-ax1.plot(n_elementos, tempos_exp_lambda, 'rs', markersize=10, label='Lambda (Experimental)', markeredgewidth=2, markeredgecolor='darkred')
-ax1.set_xlabel('Numero de Elementos (n)', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Tempo de Execucao (ms)', fontsize=12, fontweight='bold')
-ax1.set_title('COMPARACAO: Resultados Teoricos vs Experimentais', fontsize=14, fontweight='bold', pad=15)
-ax1.grid(True, alpha=0.3, linestyle='--')
-ax1.legend(fontsize=11, loc='upper left')
-ax1.ticklabel_format(style='plain', axis='x')
-
-# Texto com as equacoes
-eq_for = f'T_for(n) = {a_exp_for:.7f} n + {b_exp_for:.2f}'
-eq_lambda = f'T_lambda(n) = {a_exp_lambda:.7f} n + {b_exp_lambda:.2f}'
-ax1.text(0.05, 0.95, f'Equacoes Teoricas:\n{eq_for}\n{eq_lambda}', 
-         transform=ax1.transAxes, fontsize=10, 
-         verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-
-# --- Grafico 2: Erro Relativo ---
-ax2 = plt.subplot(2, 2, 2)
-erro_rel_for = []
-erro_rel_lambda = []
-
-for i, n in enumerate(n_elementos):
-    teor_for = a_exp_for * n + b_exp_for
-    teor_lambda = a_exp_lambda * n + b_exp_lambda
-    erro_for = abs((tempos_exp_for[i] - teor_for) / teor_for) * 100
-    erro_lambda = abs((tempos_exp_lambda[i] - teor_lambda) / teor_lambda) * 100
-    erro_rel_for.append(erro_for)
-    erro_rel_lambda.append(erro_lambda)
-
-x_pos = np.arange(len(n_elementos))
-width = 0.35
-bars1 = ax2.bar(x_pos - width/2, erro_rel_for, width, label='For', color='blue', alpha=0.7)
-bars2 = ax2.bar(x_pos + width/2, erro_rel_lambda, width, label='Lambda', color='red', alpha=0.7)
-
-ax2.set_xlabel('Tamanho da Entrada', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Erro Relativo (%)', fontsize=12, fontweight='bold')
-ax2.set_title('Erro Relativo: Experimental vs Teorico', fontsize=14, fontweight='bold', pad=15)
-ax2.set_xticks(x_pos)
-ax2.set_xticklabels([f'{n:,}' for n in n_elementos], rotation=45, ha='right')
-ax2.grid(True, alpha=0.3, axis='y')
-ax2.legend(fontsize=11)
-
-# --- Grafico 3: Comparacao de Coeficientes ---
-ax3 = plt.subplot(2, 2, 3)
-coeficientes = [a_exp_for * 1e6, a_exp_lambda * 1e6] 
-labels = ['For', 'Lambda']
-colors = ['blue', 'red']
-bars = ax3.bar(labels, coeficientes, color=colors, alpha=0.7, width=0.6)
-
-ax3.set_ylabel('Coeficiente Linear (ns/elemento)', fontsize=12, fontweight='bold')
-ax3.set_title('Comparacao dos Coeficientes Lineares', fontsize=14, fontweight='bold', pad=15)
-ax3.grid(True, alpha=0.3, axis='y')
-
-for i, (bar, coef) in enumerate(zip(bars, coeficientes)):
-    height = bar.get_height()
-    ax3.annotate(f'{coef:.1f} ns/elem', 
-                xy=(bar.get_x() + bar.get_width() / 2, height),
-                xytext=(0, 3), textcoords="offset points",
-                ha='center', va='bottom', fontsize=11, fontweight='bold')
+def dashboard_teorico(dados):
+    """
+    Dashboard 1: teoria vs pratica, erro relativo, coeficientes e quadro de analise.
+    """
+    import matplotlib.pyplot as plt
+
+    (n_elementos, tempos_exp_for, tempos_exp_lambda,
+     ajuste_for, ajuste_lambda, melhor_for, melhor_lambda,
+     a_exp_for, b_exp_for, a_exp_lambda, b_exp_lambda,
+     n_continuo, tempos_teo_for, tempos_teo_lambda,
+     erro_rel_for, erro_rel_lambda) = calcular_modelo(dados)
+
+    fig = plt.figure(figsize=(16, 12))
+
+    # --- Grafico 1: Comparacao Direta ---
+    ax1 = plt.subplot(2, 2, 1)
+    ax1.plot(n_continuo, tempos_teo_for, 'b-', linewidth=2.5, alpha=0.7, label='For (Teorico)')
+    ax1.plot(n_continuo, tempos_teo_lambda, 'r-', linewidth=2.5, alpha=0.7, label='Lambda (Teorico)')
+    ax1.plot(n_elementos, tempos_exp_for, 'bo', markersize=10, label='For (Experimental)', markeredgewidth=2, markeredgecolor='darkblue')
+    ax1.plot(n_elementos, tempos_exp_lambda, 'rs', markersize=10, label='Lambda (Experimental)', markeredgewidth=2, markeredgecolor='darkred')
+    ax1.set_xlabel('Numero de Elementos (n)', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Tempo de Execucao (ms)', fontsize=12, fontweight='bold')
+    ax1.set_title('COMPARACAO: Resultados Teoricos vs Experimentais', fontsize=14, fontweight='bold', pad=15)
+    ax1.grid(True, alpha=0.3, linestyle='--')
+    ax1.legend(fontsize=11, loc='upper left')
+    ax1.ticklabel_format(style='plain', axis='x')
+
+    # Texto com as equacoes
+    eq_for = f'T_for(n) = {a_exp_for:.7f} n + {b_exp_for:.2f}'
+    eq_lambda = f'T_lambda(n) = {a_exp_lambda:.7f} n + {b_exp_lambda:.2f}'
+    ax1.text(0.05, 0.95, f'Equacoes Teoricas:\n{eq_for}\n{eq_lambda}', 
+             transform=ax1.transAxes, fontsize=10, 
+             verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    # --- Grafico 2: Erro Relativo ---
+    ax2 = plt.subplot(2, 2, 2)
+    x_pos = np.arange(len(n_elementos))
+    width = 0.35
+    bars1 = ax2.bar(x_pos - width/2, erro_rel_for, width, label='For', color='blue', alpha=0.7)
+    bars2 = ax2.bar(x_pos + width/2, erro_rel_lambda, width, label='Lambda', color='red', alpha=0.7)
+
+    ax2.set_xlabel('Tamanho da Entrada', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Erro Relativo (%)', fontsize=12, fontweight='bold')
+    ax2.set_title('Erro Relativo: Experimental vs Teorico', fontsize=14, fontweight='bold', pad=15)
+    ax2.set_xticks(x_pos)
+    ax2.set_xticklabels([f'{n:,}' for n in n_elementos], rotation=45, ha='right')
+    ax2.grid(True, alpha=0.3, axis='y')
+    ax2.legend(fontsize=11)
+
+    # --- Grafico 3: Comparacao de Coeficientes ---
+    ax3 = plt.subplot(2, 2, 3)
+    coeficientes = [a_exp_for * 1e6, a_exp_lambda * 1e6] 
+    labels = ['For', 'Lambda']
+    colors = ['blue', 'red']
+    bars = ax3.bar(labels, coeficientes, color=colors, alpha=0.7, width=0.6)
+
+    ax3.set_ylabel('Coeficiente Linear (ns/elemento)', fontsize=12, fontweight='bold')
+    ax3.set_title('Comparacao dos Coeficientes Lineares', fontsize=14, fontweight='bold', pad=15)
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    for i, (bar, coef) in enumerate(zip(bars, coeficientes)):
+        height = bar.get_height()
+        ax3.annotate(f'{coef:.1f} ns/elem', 
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 3), textcoords="offset points",
+                    ha='center', va='bottom', fontsize=11, fontweight='bold')
     
-    if i == 1:
-        diff_percent = (coeficientes[1] / coeficientes[0] - 1) * 100
-        ax3.annotate(f'({diff_percent:.1f}% maior)', 
-                    xy=(bar.get_x() + bar.get_width() / 2, height/2),
-                    ha='center', va='center', fontsize=10, color='white', fontweight='bold')
-
-# --- Grafico 4: Quadro de Analise ---
-ax4 = plt.subplot(2, 2, 4)
-ax4.axis('off')
-ax4.set_title('Analise Teorica vs Experimental', fontsize=14, fontweight='bold', pad=20)
-
-texto_analise = f"""
-RESULTADOS TEORICOS (Questao d):
-
-Funcao com For:
-T_for(n) = {a_exp_for:.7f} n + {b_exp_for:.2f}
-         = Theta(n), O(n)
-
-Funcao com Lambda:
-T_lambda(n) = {a_exp_lambda:.7f} n + {b_exp_lambda:.2f}
-            = Theta(n), O(n)
-
-COMPARACAO:
-- Complexidade: Ambas sao O(n) - linear
-- Coeficiente Lambda: {(a_exp_lambda/a_exp_for - 1)*100:.1f}% maior
-- Diferenca constante: Lambda e consistentemente mais lenta
-- Erro medio: {np.mean(erro_rel_for + erro_rel_lambda):.1f}%
-
-CONCLUSAO:
-O modelo teorico preve com precisao o comportamento
-observado experimentalmente. A diferenca de desempenho
-se deve ao overhead da funcao lambda e do filter().
-"""
-
-ax4.text(0.1, 0.5, texto_analise, fontsize=11, 
-         verticalalignment='center', linespacing=1.6,
-         bbox=dict(boxstyle='round', facecolor='lightyellow', 
-                   alpha=0.9, edgecolor='gold', linewidth=2))
-
-plt.suptitle('ANALISE COMPARATIVA: Resultados Teoricos vs Experimentais', 
-             fontsize=16, fontweight='bold', y=1.02)
-plt.tight_layout()
+        if i == 1:
+            diff_percent = (coeficientes[1] / coeficientes[0] - 1) * 100
+            ax3.annotate(f"({abs(diff_percent):.1f}% {'maior' if diff_percent >= 0 else 'menor'})", 
+                        xy=(bar.get_x() + bar.get_width() / 2, height/2),
+                        ha='center', va='center', fontsize=10, color='white', fontweight='bold')
+
+    # --- Grafico 4: Quadro de Analise ---
+    ax4 = plt.subplot(2, 2, 4)
+    ax4.axis('off')
+    ax4.set_title('Analise Teorica vs Experimental', fontsize=14, fontweight='bold', pad=20)
+
+    # Comparacao tirada dos ajustes e das medicoes (nada fixo no texto)
+    classe = {'linear': 'Theta(n)', 'nlogn': 'Theta(n log n)', 'quadratico': 'Theta(n^2)',
+              'potencia': 'Theta(n^k)'}
+    classe_for, classe_lambda = classe[melhor_for['modelo']], classe[melhor_lambda['modelo']]
+    if classe_for == classe_lambda:
+        complexidade = f"Ambas {classe_for} (BIC)"
+    else:
+        complexidade = f"For {classe_for}, Lambda {classe_lambda} (BIC)"
+    variacao = (a_exp_lambda / a_exp_for - 1) * 100
+    lambda_lenta = sum(tl > tf for tf, tl in zip(tempos_exp_for, tempos_exp_lambda))
+    if lambda_lenta == len(tempos_exp_for):
+        constancia = "Lambda mais lenta em todos os N"
+    elif lambda_lenta == 0:
+        constancia = "Lambda mais rapida em todos os N"
+    else:
+        constancia = f"Lambda mais lenta em {lambda_lenta} de {len(tempos_exp_for)} N"
+
+    texto_analise = f"""
+    RESULTADOS TEORICOS (Questao d):
+
+    Funcao com For:
+    T_for(n) = {a_exp_for:.7f} n + {b_exp_for:.2f}
+             -> {classe_for} (menor BIC)
+
+    Funcao com Lambda:
+    T_lambda(n) = {a_exp_lambda:.7f} n + {b_exp_lambda:.2f}
+                -> {classe_lambda} (menor BIC)
+
+    COMPARACAO:
+    - Complexidade: {complexidade}
+    - Coeficiente Lambda: {abs(variacao):.1f}% {'maior' if variacao >= 0 else 'menor'}
+    - Medicoes: {constancia}
+    - Erro medio: {np.mean(erro_rel_for + erro_rel_lambda):.1f}%
+
+    CONCLUSAO:
+    """
+    texto_analise = texto_analise.rstrip(' ')
+    for linha in conclusao_modelo(ajuste_for, ajuste_lambda, melhor_for, melhor_lambda):
+        texto_analise += '\n'.join('    ' + parte for parte in textwrap.wrap(linha, 52)) + '\n'
+
+    ax4.text(0.1, 0.5, texto_analise, fontsize=11, 
+             verticalalignment='center', linespacing=1.6,
+             bbox=dict(boxstyle='round', facecolor='lightyellow', 
+                       alpha=0.9, edgecolor='gold', linewidth=2))
+
+    plt.suptitle('ANALISE COMPARATIVA: Resultados Teoricos vs Experimentais', 
+                 fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+
+    return fig
 
 # ============================================================================
 #  GERACAO DOS GRAFICOS DETALHADOS (Dashboard 2)
 # ============================================================================
 
-fig2, ((ax5, ax6), (ax7, ax8)) = plt.subplots(2, 2, figsize=(16, 12))
-
-# Replicas dos graficos anteriores (Linear e Log)
-ax5.plot(n_elementos, tempos_exp_for, 'b-o', linewidth=2, markersize=8, label='For (Experimental)')
-ax5.plot(n_elementos, tempos_exp_lambda, 'r-s', linewidth=2, markersize=8, label='Lambda (Experimental)')
-ax5.set_xlabel('Numero de Elementos', fontsize=12)
-ax5.set_ylabel('Tempo de Execucao (ms)', fontsize=12)
-ax5.set_title('Resultados Experimentais (Escala Linear)', fontsize=13, fontweight='bold')
-ax5.grid(True, alpha=0.3)
-ax5.legend(fontsize=11)
-ax5.ticklabel_format(style='plain', axis='x')
-ax5.plot(n_continuo, tempos_teo_for, 'b--', linewidth=1.5, alpha=0.5, label='For (Teorico)')
-ax5.plot(n_continuo, tempos_teo_lambda, 'r--', linewidth=1.5, alpha=0.5, label='Lambda (Teorico)')
-
-ax6.loglog(n_elementos, tempos_exp_for, 'b-o', linewidth=2, markersize=8, label='For (Experimental)')
-ax6.loglog(n_elementos, tempos_exp_lambda, 'r-s', linewidth=2, markersize=8, label='Lambda (Experimental)')
-ax6.loglog(n_continuo, tempos_teo_for, 'b--', linewidth=1.5, alpha=0.5, label='For (Teorico)')
-ax6.loglog(n_continuo, tempos_teo_lambda, 'r--', linewidth=1.5, alpha=0.5, label='Lambda (Teorico)')
-ax6.set_xlabel('Numero de Elementos (escala log)', fontsize=12)
-ax6.set_ylabel('Tempo de Execucao (ms) - escala log', fontsize=12)
-ax6.set_title('Resultados Experimentais (Escala Log-Log)', fontsize=13, fontweight='bold')
-ax6.grid(True, alpha=0.3, which='both')
-ax6.legend(fontsize=11)
-
-# Grafico de Diferencas
-ax7.plot(n_elementos, np.array(tempos_exp_lambda) - np.array(tempos_exp_for), 
-         'g-^', linewidth=2, markersize=10, label='Diferenca Experimental')
-ax7.plot(n_continuo, tempos_teo_lambda - tempos_teo_for, 
-         'g--', linewidth=2, alpha=0.7, label='Diferenca Teorica')
-ax7.set_xlabel('Numero de Elementos', fontsize=12)
-ax7.set_ylabel('Diferenca Lambda - For (ms)', fontsize=12)
-ax7.set_title('Diferenca de Tempo: Lambda vs For', fontsize=13, fontweight='bold')
-ax7.grid(True, alpha=0.3)
-ax7.legend(fontsize=11)
-ax7.ticklabel_format(style='plain', axis='x')
-
-# Grafico de Residuos
-ax8.plot(n_elementos, np.array(tempos_exp_for) - (a_exp_for * np.array(n_elementos) + b_exp_for), 
-         'bo-', linewidth=2, markersize=8, label='For: Exp - Teo')
-ax8.plot(n_elementos, np.array(tempos_exp_lambda) - (a_exp_lambda * np.array(n_elementos) + b_exp_lambda), 
-         'rs-', linewidth=2, markersize=8, label='Lambda: Exp - Teo')
-ax8.axhline(y=0, color='black', linestyle='--', alpha=0.5)
-ax8.set_xlabel('Numero de Elementos', fontsize=12)
-ax8.set_ylabel('Residuos (ms)', fontsize=12)
-ax8.set_title('Residuos: Diferenca Experimental - Teorico', fontsize=13, fontweight='bold')
-ax8.grid(True, alpha=0.3)
-ax8.legend(fontsize=11)
-ax8.ticklabel_format(style='plain', axis='x')
-
-plt.suptitle('COMPARACAO DIRETA: Graficos da Questao C com Previsoes Teoricas', 
-             fontsize=16, fontweight='bold', y=1.02)
-plt.tight_layout()
+def dashboard_detalhado(dados):
+    """
+    Dashboard 2: escalas linear e log-log, diferencas e residuos.
+    """
+    import matplotlib.pyplot as plt
+
+    (n_elementos, tempos_exp_for, tempos_exp_lambda,
+     ajuste_for, ajuste_lambda, melhor_for, melhor_lambda,
+     a_exp_for, b_exp_for, a_exp_lambda, b_exp_lambda,
+     n_continuo, tempos_teo_for, tempos_teo_lambda,
+     erro_rel_for, erro_rel_lambda) = calcular_modelo(dados)
+
+    fig2, ((ax5, ax6), (ax7, ax8)) = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Replicas dos graficos anteriores (Linear e Log)
+    ax5.plot(n_elementos, tempos_exp_for, 'b-o', linewidth=2, markersize=8, label='For (Experimental)')
+    ax5.plot(n_elementos, tempos_exp_lambda, 'r-s', linewidth=2, markersize=8, label='Lambda (Experimental)')
+    ax5.set_xlabel('Numero de Elementos', fontsize=12)
+    ax5.set_ylabel('Tempo de Execucao (ms)', fontsize=12)
+    ax5.set_title('Resultados Experimentais (Escala Linear)', fontsize=13, fontweight='bold')
+    ax5.grid(True, alpha=0.3)
+    ax5.legend(fontsize=11)
+    ax5.ticklabel_format(style='plain', axis='x')
+    ax5.plot(n_continuo, tempos_teo_for, 'b--', linewidth=1.5, alpha=0.5, label='For (Teorico)')
+    ax5.plot(n_continuo, tempos_teo_lambda, 'r--', linewidth=1.5, alpha=0.5, label='Lambda (Teorico)')
+
+    ax6.loglog(n_elementos, tempos_exp_for, 'b-o', linewidth=2, markersize=8, label='For (Experimental)')
+    ax6.loglog(n_elementos, tempos_exp_lambda, 'r-s', linewidth=2, markersize=8, label='Lambda (Experimental)')
+    ax6.loglog(n_continuo, tempos_teo_for, 'b--', linewidth=1.5, alpha=0.5, label='For (Teorico)')
+    ax6.loglog(n_continuo, tempos_teo_lambda, 'r--', linewidth=1.5, alpha=0.5, label='Lambda (Teorico)')
+    ax6.set_xlabel('Numero de Elementos (escala log)', fontsize=12)
+    ax6.set_ylabel('Tempo de Execucao (ms) - escala log', fontsize=12)
+    ax6.set_title('Resultados Experimentais (Escala Log-Log)', fontsize=13, fontweight='bold')
+    ax6.grid(True, alpha=0.3, which='both')
+    ax6.legend(fontsize=11)
+
+    # Grafico de Diferencas
+    ax7.plot(n_elementos, np.array(tempos_exp_lambda) - np.array(tempos_exp_for), 
+             'g-^', linewidth=2, markersize=10, label='Diferenca Experimental')
+    ax7.plot(n_continuo, tempos_teo_lambda - tempos_teo_for, 
+             'g--', linewidth=2, alpha=0.7, label='Diferenca Teorica')
+    ax7.set_xlabel('Numero de Elementos', fontsize=12)
+    ax7.set_ylabel('Diferenca Lambda - For (ms)', fontsize=12)
+    ax7.set_title('Diferenca de Tempo: Lambda vs For', fontsize=13, fontweight='bold')
+    ax7.grid(True, alpha=0.3)
+    ax7.legend(fontsize=11)
+    ax7.ticklabel_format(style='plain', axis='x')
+
+    # Grafico de Residuos
+    ax8.plot(n_elementos, np.array(tempos_exp_for) - (a_exp_for * np.array(n_elementos) + b_exp_for), 
+             'bo-', linewidth=2, markersize=8, label='For: Exp - Teo')
+    ax8.plot(n_elementos, np.array(tempos_exp_lambda) - (a_exp_lambda * np.array(n_elementos) + b_exp_lambda), 
+             'rs-', linewidth=2, markersize=8, label='Lambda: Exp - Teo')
+    ax8.axhline(y=0, color='black', linestyle='--', alpha=0.5)
+    ax8.set_xlabel('Numero de Elementos', fontsize=12)
+    ax8.set_ylabel('Residuos (ms)', fontsize=12)
+    ax8.set_title('Residuos: Diferenca Experimental - Teorico', fontsize=13, fontweight='bold')
+    ax8.grid(True, alpha=0.3)
+    ax8.legend(fontsize=11)
+    ax8.ticklabel_format(style='plain', axis='x')
+
+    plt.suptitle('COMPARACAO DIRETA: Graficos da Questao C com Previsoes Teoricas', 
+                 fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+
+    return fig2
 
 # ============================================================================
-#  RELATORIO NO TERMINAL
+#  GERACAO DOS GRAFICOS DE MEMORIA (Dashboard 3)
 # ============================================================================
 
-print("=" * 120)
-print("TABELA COMPARATIVA DETALHADA: Resultados Experimentais vs Previsoes Teoricas")
-print("=" * 120)
-print(f"{'n':<12} {'T_for(Exp)':<12} {'T_for(Teo)':<12} {'Erro%':<10} {'T_lambda(Exp)':<15} {'T_lambda(Teo)':<15} {'Erro%':<10} {'Dif(Exp)':<12} {'Dif(Teo)':<12}")
-print("-" * 120)
+def dashboard_memoria(dados):
+    """
+    Dashboard 3: pico de memoria e bytes/elemento de todos os motores com
+    perfil gravado (None se nao houver perfil de memoria).
+    """
+    import matplotlib.pyplot as plt
+
+    series_memoria = dados['memoria']
+    if not series_memoria:
+        return None
+    fig3, (ax9, ax10) = plt.subplots(1, 2, figsize=(16, 6))
+    plotar_memoria(ax9, ax10, series_memoria)
+    plt.suptitle('MEMORIA: Pico Alocado e Bytes por Elemento (todos os motores)',
+                 fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    return fig3
+
+def custo_contadores(series_contadores):
+    """
+    Custo por elemento no maior N medido de cada motor: {motor: {'n',
+    'instr_elem', 'ipc', 'desvio_elem', 'cache_elem'}}.
+    """
+    custos = {}
+    for motor, serie in series_contadores.items():
+        i = serie['n'].index(max(serie['n']))
+        n = serie['n'][i]
+        custos[motor] = {'n': n,
+                         'instr_elem': serie['instrucoes'][i] / n,
+                         'ipc': serie['instrucoes'][i] / serie['ciclos'][i] if serie['ciclos'][i] else 0.0,
+                         'desvio_elem': serie['falhas_desvio'][i] / n,
+                         'cache_elem': serie['falhas_cache'][i] / n}
+    return custos
+
+def dashboard_contadores(dados):
+    """
+    Dashboard 4: IPC, instrucoes, falhas de desvio e de cache por elemento
+    de cada motor no maior N (None se nada foi medido com --contadores).
+    """
+    import matplotlib.pyplot as plt
+
+    if not dados.get('contadores'):
+        return None
+    custos = custo_contadores(dados['contadores'])
+    motores = sorted(custos, key=lambda m: custos[m]['instr_elem'])
+    cores = plt.cm.tab10(np.arange(len(motores)) % 10)
+
+    fig4, eixos = plt.subplots(2, 2, figsize=(16, 10))
+    paineis = (('instr_elem', 'Instrucoes por elemento', 'instrucoes/elem'),
+               ('ipc', 'IPC (instrucoes por ciclo)', 'IPC'),
+               ('desvio_elem', 'Falhas de previsao de desvio por elemento', 'falhas/elem'),
+               ('cache_elem', 'Falhas de cache por elemento', 'falhas/elem'))
+    for ax, (campo, titulo, unidade) in zip(eixos.flat, paineis):
+        valores = [custos[m][campo] for m in motores]
+        barras = ax.bar(motores, valores, color=cores, alpha=0.8)
+        ax.bar_label(barras, fmt='%.2f', fontsize=8)
+        ax.set_title(titulo, fontweight='bold')
+        ax.set_ylabel(unidade)
+        ax.tick_params(axis='x', rotation=30)
+        ax.grid(True, axis='y', alpha=0.3)
+    plt.suptitle('CONTADORES DE HARDWARE: Custo por Elemento no maior N',
+                 fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    return fig4
+
+def dashboard_historico(dados):
+    """
+    Dashboard 5: custo por elemento (mediana de todas as amostras gravadas)
+    em funcao de N, um painel por motor e uma curva por execucao (None sem
+    historico colunar).
+    """
+    import matplotlib.pyplot as plt
+
+    if not dados.get('historico'):
+        return None
+    por_motor = {}
+    for linha in dados['historico']:
+        curva = por_motor.setdefault(linha['motor'], {}).setdefault(
+            f"{linha['execucao']} ({linha['entrada']})", ([], []))
+        curva[0].append(linha['n'])
+        curva[1].append(linha['mediana_ms'] * 1e6 / linha['n'])
+
+    motores = sorted(por_motor)
+    colunas = min(len(motores), 3)
+    linhas = -(-len(motores) // colunas)
+    fig5, eixos = plt.subplots(linhas, colunas, figsize=(6 * colunas, 4.5 * linhas), squeeze=False)
+    for ax, motor in zip(eixos.flat, motores):
+        for rotulo, (ns, custos) in sorted(por_motor[motor].items()):
+            ordem = np.argsort(ns)
+            ax.plot(np.asarray(ns)[ordem], np.asarray(custos)[ordem], 'o-', label=rotulo, alpha=0.8)
+        ax.set_xscale('log')
+        ax.set_title(motor, fontweight='bold')
+        ax.set_xlabel('Numero de Elementos (n)')
+        ax.set_ylabel('ns por elemento (mediana)')
+        ax.legend(fontsize=7)
+        ax.grid(True, alpha=0.3)
+    for ax in list(eixos.flat)[len(motores):]:
+        ax.set_visible(False)
+    plt.suptitle('HISTORICO: Custo por Elemento em todas as Execucoes Gravadas',
+                 fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    return fig5
+
+# ============================================================================
+#  RELATORIO NO TERMINAL
+# ============================================================================
 
-for i, n in enumerate(n_elementos):
-    t_for_exp = tempos_exp_for[i]
-    t_lambda_exp = tempos_exp_lambda[i]
+def imprimir_tabela(dados):
+    """
+    Tabela comparativa detalhada e estatisticas do ajuste no terminal.
+    """
+    (n_elementos, tempos_exp_for, tempos_exp_lambda,
+     ajuste_for, ajuste_lambda, melhor_for, melhor_lambda,
+     a_exp_for, b_exp_for, a_exp_lambda, b_exp_lambda,
+     n_continuo, tempos_teo_for, tempos_teo_lambda,
+     erro_rel_for, erro_rel_lambda) = calcular_modelo(dados)
+
+    print("=" * 120)
+    print("TABELA COMPARATIVA DETALHADA: Resultados Experimentais vs Previsoes Teoricas")
+    print("=" * 120)
+    print(f"{'n':<12} {'T_for(Exp)':<12} {'T_for(Teo)':<12} {'Erro%':<10} {'T_lambda(Exp)':<15} {'T_lambda(Teo)':<15} {'Erro%':<10} {'Dif(Exp)':<12} {'Dif(Teo)':<12}")
+    print("-" * 120)
+
+    for i, n in enumerate(n_elementos):
+        t_for_exp = tempos_exp_for[i]
+        t_lambda_exp = tempos_exp_lambda[i]
     
-    t_for_teo = a_exp_for * n + b_exp_for
-    t_lambda_teo = a_exp_lambda * n + b_exp_lambda
+        t_for_teo = a_exp_for * n + b_exp_for
+        t_lambda_teo = a_exp_lambda * n + b_exp_lambda
     
-    erro_for = abs((t_for_exp - t_for_teo) / t_for_teo) * 100
-    erro_lambda = abs((t_lambda_exp - t_lambda_teo) / t_lambda_teo) * 100
+        erro_for = abs((t_for_exp - t_for_teo) / t_for_teo) * 100
+        erro_lambda = abs((t_lambda_exp - t_lambda_teo) / t_lambda_teo) * 100
     
-    dif_exp = t_lambda_exp - t_for_exp
-    dif_teo = t_lambda_teo - t_for_teo
+        dif_exp = t_lambda_exp - t_for_exp
+        dif_teo = t_lambda_teo - t_for_teo
     
-    print(f"{n:<12,} {t_for_exp:<12.1f} {t_for_teo:<12.1f} {erro_for:<10.1f}% "
-          f"{t_lambda_exp:<15.1f} {t_lambda_teo:<15.1f} {erro_lambda:<10.1f}% "
-          f"{dif_exp:<12.1f} {dif_teo:<12.1f}")
-
-print("=" * 120)
-print("\nESTATISTICAS DA COMPARACAO:")
-print("-" * 50)
-print(f"Coeficiente linear For:     {a_exp_for:.7f} ms/elemento  ({a_exp_for*1e6:.1f} ns/elemento)")
-print(f"Coeficiente linear Lambda:  {a_exp_lambda:.7f} ms/elemento  ({a_exp_lambda*1e6:.1f} ns/elemento)")
-print(f"Diferenca nos coeficientes: {(a_exp_lambda/a_exp_for - 1)*100:.1f}%")
-print(f"\nErro medio absoluto For:     {np.mean(erro_rel_for):.1f}%")
-print(f"Erro medio absoluto Lambda:  {np.mean(erro_rel_lambda):.1f}%")
-print(f"Erro medio total:            {np.mean(erro_rel_for + erro_rel_lambda):.1f}%")
-print(f"\nCoeficiente de determinacao (R2 aproximado): > 0.99")
-print("\nCONCLUSAO: O modelo teorico Theta(n) explica muito bem o comportamento observado!")
-
-plt.show()
\ No newline at end of file
+        print(f"{n:<12,} {t_for_exp:<12.1f} {t_for_teo:<12.1f} {erro_for:<10.1f}% "
+              f"{t_lambda_exp:<15.1f} {t_lambda_teo:<15.1f} {erro_lambda:<10.1f}% "
+              f"{dif_exp:<12.1f} {dif_teo:<12.1f}")
+
+    print("=" * 120)
+    print("\nESTATISTICAS DA COMPARACAO:")
+    print("-" * 50)
+    print(f"Coeficiente linear For:     {a_exp_for:.7f} ms/elemento  ({a_exp_for*1e6:.1f} ns/elemento)")
+    print(f"Coeficiente linear Lambda:  {a_exp_lambda:.7f} ms/elemento  ({a_exp_lambda*1e6:.1f} ns/elemento)")
+    print(f"Diferenca nos coeficientes: {(a_exp_lambda/a_exp_for - 1)*100:.1f}%")
+    print(f"\nErro medio absoluto For:     {np.mean(erro_rel_for):.1f}%")
+    print(f"Erro medio absoluto Lambda:  {np.mean(erro_rel_lambda):.1f}%")
+    print(f"Erro medio total:            {np.mean(erro_rel_for + erro_rel_lambda):.1f}%")
+    print("\nAJUSTE POR MINIMOS QUADRADOS (IC 95%):")
+    print("-" * 50)
+    for nome, aj, melhor in (('For', ajuste_for, melhor_for), ('Lambda', ajuste_lambda, melhor_lambda)):
+        ns, (ns_min, ns_max) = custo_por_elemento(aj)
+        print(f"{nome:<7} {formatar_ajuste(aj)}")
+        print(f"{'':<7} custo por elemento: {ns:.1f} ns  (IC 95%: {ns_min:.1f} .. {ns_max:.1f} ns)")
+        print(f"{'':<7} modelo preferido pelo BIC: {melhor['modelo']}")
+    print(f"\nCoeficiente de determinacao R2: For = {ajuste_for['r2']:.5f} | Lambda = {ajuste_lambda['r2']:.5f}")
+    print("\nCONCLUSAO: " + ' '.join(conclusao_modelo(ajuste_for, ajuste_lambda, melhor_for, melhor_lambda)))
+
+    if dados.get('contadores'):
+        custos = custo_contadores(dados['contadores'])
+        print("\nCONTADORES DE HARDWARE (maior N medido de cada motor):")
+        print("-" * 78)
+        print(f"{'Motor':<13} {'N':<14} {'Instr/elem':<12} {'IPC':<7} {'Desvio/elem':<13} {'Cache/elem':<12}")
+        for motor in sorted(custos, key=lambda m: custos[m]['instr_elem']):
+            c = custos[motor]
+            print(f"{motor:<13} {c['n']:<14,} {c['instr_elem']:<12.1f} {c['ipc']:<7.2f} "
+                  f"{c['desvio_elem']:<13.4f} {c['cache_elem']:<12.4f}")
+        if 'for' in custos and 'lambda' in custos:
+            print(f"Instrucoes por elemento lambda/for: "
+                  f"{custos['lambda']['instr_elem'] / custos['for']['instr_elem']:.2f}x")
+
+# Dashboards do relatorio (nome do arquivo -> funcao), usados por relatorios.py
+DASHBOARDS = {
+    'completa_teorico': dashboard_teorico,
+    'completa_detalhado': dashboard_detalhado,
+    'completa_memoria': dashboard_memoria,
+    'completa_contadores': dashboard_contadores,
+    'completa_historico': dashboard_historico,
+}
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    dados = carregar_dados()
+    for construir in DASHBOARDS.values():
+        construir(dados)
+    imprimir_tabela(dados)
+    plt.show()
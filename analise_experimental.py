@@ -1,5 +1,7 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import math
+import statistics
+
+from resultados import carregar_series, carregar_series_memoria
 
 # ============================================================================
 #  PROJETO: ANALISE EXPERIMENTAL DE DESEMPENHO
@@ -11,23 +13,43 @@ import numpy as np
 #  1. Tabela comparativa no terminal.
 #  2. Graficos de linha (Escala Linear e Logaritmica).
 #  3. Graficos de barra (Diferenca Percentual e Razao de Tempo).
+#  4. Memoria por motor: pico (tracemalloc) vs N e bytes por elemento.
+#
+#  matplotlib e numpy sao importados dentro das funcoes de grafico: as
+#  tabelas de texto (python -m analise table) nao pagam esse custo.
 # ============================================================================
 
-# --- DADOS EXPERIMENTAIS (Hardcoded dos testes anteriores) ---
-n_elementos = [100_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000]
+# Expoente log-log ate esta distancia de 1 ainda conta como O(n)
+TOLERANCIA_EXPOENTE = 0.1
+
+def carregar_dados():
+    """
+    Dados experimentais (resultados.json gravado pelos benchmarks, ou os
+    dados de referencia) e o perfil de memoria de todos os motores.
+    """
+    n_elementos, series = carregar_series('for', 'lambda')
 
-# Tempos medios em milissegundos (ms)
-tempos_for = [15.2, 152.7, 761.9, 1523.4, 7617.9]
-tempos_lambda = [21.4, 215.3, 1076.5, 2154.3, 10769.2]
+    # Tempos medianos em milissegundos (ms)
+    return {'n_elementos': n_elementos,
+            'tempos_for': series['for']['mediana_ms'],
+            'tempos_lambda': series['lambda']['mediana_ms'],
+            'memoria': carregar_series_memoria()}
 
-def imprimir_relatorio(n_elems, t_for, t_lambda):
+def calcular_estatisticas(t_for, t_lambda):
     """
-    Calcula estatisticas e imprime a tabela de dados no terminal.
+    Diferenca percentual e razao Lambda/For, item a item.
     """
-    # Calculos estatisticos
     # List comprehension para calcular a diferenca % item a item
     diferenca_percentual = [(tl/tf - 1) * 100 for tf, tl in zip(t_for, t_lambda)]
     razao_tempos = [tl/tf for tf, tl in zip(t_for, t_lambda)]
+    return diferenca_percentual, razao_tempos
+
+def imprimir_relatorio(n_elems, t_for, t_lambda):
+    """
+    Calcula estatisticas e imprime a tabela de dados no terminal.
+    """
+    # Calculos estatisticos
+    diferenca_percentual, razao_tempos = calcular_estatisticas(t_for, t_lambda)
 
     print("=" * 80)
     print("TABELA DE DADOS - Analise Experimental")
@@ -43,18 +65,71 @@ def imprimir_relatorio(n_elems, t_for, t_lambda):
 
     print("=" * 80)
     print("\nRESUMO ESTATISTICO:")
-    print(f"- Media diferenca percentual: {np.mean(diferenca_percentual):.1f}%")
-    print(f"- Media razao Lambda/For: {np.mean(razao_tempos):.2f}x")
-    print(f"- Comportamento: Ambas funcoes sao O(n) - crescimento linear")
-    print(f"- Recomendacao: Use a funcao com 'for' para melhor desempenho")
-    print("\n[AVISO] Feche as janelas dos graficos para encerrar o programa.")
+    print(f"- Media diferenca percentual: {statistics.fmean(diferenca_percentual):.1f}%")
+    print(f"- Media razao Lambda/For: {statistics.fmean(razao_tempos):.2f}x")
+    for linha in conclusao(n_elems, t_for, t_lambda, razao_tempos):
+        print(f"- {linha}")
 
     return diferenca_percentual, razao_tempos
 
+def expoente_crescimento(n_elems, tempos):
+    """
+    Expoente k de T(n) ~ n^k: inclinacao da reta em log-log (None com
+    menos de 2 N).
+    """
+    if len(n_elems) < 2:
+        return None
+    x = [math.log(n) for n in n_elems]
+    y = [math.log(max(t, 1e-12)) for t in tempos]
+    return statistics.linear_regression(x, y).slope
+
+def conclusao(n_elems, t_for, t_lambda, razao_tempos):
+    """
+    Comportamento e recomendacao tirados das medicoes: expoente log-log de
+    cada funcao (O(n) se ficar em 1 +- TOLERANCIA_EXPOENTE) e qual foi mais
+    rapida em cada N (razao Lambda/For).
+    """
+    expoentes = {nome: expoente_crescimento(n_elems, tempos)
+                 for nome, tempos in (('for', t_for), ('lambda', t_lambda))}
+    if None in expoentes.values():
+        comportamento = "Comportamento: um unico N medido, crescimento indeterminado"
+    else:
+        classes = {nome: "O(n)" if abs(k - 1) <= TOLERANCIA_EXPOENTE else f"~n^{k:.2f}"
+                   for nome, k in expoentes.items()}
+        detalhe = ', '.join(f"{nome} n^{k:.2f}" for nome, k in expoentes.items())
+        if set(classes.values()) == {"O(n)"}:
+            comportamento = f"Comportamento: Ambas funcoes sao O(n) - crescimento linear ({detalhe})"
+        else:
+            comportamento = (f"Comportamento: for {classes['for']}, lambda {classes['lambda']} "
+                             f"(expoentes log-log: {detalhe})")
+
+    mais_lenta = sum(r > 1 for r in razao_tempos)
+    if mais_lenta == len(razao_tempos):
+        recomendacao = "Recomendacao: Use a funcao com 'for' (mais rapida em todos os N medidos)"
+    elif mais_lenta == 0:
+        recomendacao = "Recomendacao: Use a funcao com 'lambda' (mais rapida em todos os N medidos)"
+    else:
+        recomendacao = (f"Recomendacao: depende de N - 'for' foi mais rapida em {mais_lenta} "
+                        f"de {len(razao_tempos)} tamanhos")
+    return [comportamento, recomendacao]
+
 def gerar_graficos(n_elems, t_for, t_lambda, diff_perc, razao):
     """
     Configura e exibe os graficos usando Matplotlib.
     """
+    import matplotlib.pyplot as plt
+
+    grafico_tempos(n_elems, t_for, t_lambda)
+    grafico_diferenca(n_elems, diff_perc)
+    grafico_razao(n_elems, razao)
+    plt.show()
+
+def grafico_tempos(n_elems, t_for, t_lambda):
+    """
+    Figura 1: comparacao de tempos em escala linear e log-log.
+    """
+    import matplotlib.pyplot as plt
+
     # --- FIGURA 1: Comparacao de Tempos (Linear e Log) ---
     fig1, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
@@ -85,6 +160,15 @@ def gerar_graficos(n_elems, t_for, t_lambda, diff_perc, razao):
     ax2.legend(fontsize=11)
     ax2.grid(True, which='minor', alpha=0.2)
 
+    plt.tight_layout()
+    return fig1
+
+def grafico_diferenca(n_elems, diff_perc):
+    """
+    Figura 2: quanto a funcao lambda e mais lenta (%).
+    """
+    import matplotlib.pyplot as plt
+
     # --- FIGURA 2: Diferenca Percentual ---
     fig2, ax3 = plt.subplots(figsize=(10, 6))
     bars = ax3.bar(range(len(n_elems)), diff_perc, color='orange', alpha=0.7)
@@ -103,6 +187,16 @@ def gerar_graficos(n_elems, t_for, t_lambda, diff_perc, razao):
                     xytext=(0, 3), textcoords="offset points",
                     ha='center', va='bottom', fontsize=10, fontweight='bold')
 
+    plt.tight_layout()
+    return fig2
+
+def grafico_razao(n_elems, razao):
+    """
+    Figura 3: razao de tempo Lambda/For (For normalizado em 1).
+    """
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     # --- FIGURA 3: Razao de Crescimento ---
     fig3, ax4 = plt.subplots(figsize=(10, 6))
     x_pos = np.arange(len(n_elems))
@@ -125,15 +219,106 @@ def gerar_graficos(n_elems, t_for, t_lambda, diff_perc, razao):
                  ha='center', va='bottom', fontsize=10, fontweight='bold')
 
     plt.tight_layout()
-    plt.show()
+    return fig3
+
+def imprimir_memoria(series_memoria):
+    """
+    Tabela de memoria por motor e N: pico rastreado, bytes por elemento,
+    delta de RSS e blocos retidos pelo resultado.
+    """
+    print("\n" + "=" * 90)
+    print("TABELA DE MEMORIA - Pico rastreado (tracemalloc), RSS e blocos retidos")
+    print("=" * 90)
+    if not series_memoria:
+        print("Sem perfil de memoria em resultados.json (rode um benchmark primeiro).")
+        return
+    print(f"{'Motor':<14} {'N Elementos':<15} {'Pico (MB)':<12} {'Bytes/elem':<12} "
+          f"{'RSS delta (MB)':<16} {'Blocos retidos':<14}")
+    print("-" * 90)
+    for motor, serie in series_memoria.items():
+        for n, pico, rss, blocos in zip(serie['n'], serie['pico_bytes'],
+                                        serie['rss_delta_bytes'], serie['blocos_retidos']):
+            blocos = '-' if blocos is None else f"{blocos:,}"
+            print(f"{motor:<14} {n:<15,} {pico / 2**20:<12.1f} {pico / n:<12.2f} "
+                  f"{rss / 2**20:<16.1f} {blocos:<14}")
+    print("=" * 90)
+
+def plotar_memoria(ax_mem, ax_bpe, series_memoria):
+    """
+    Desenha, para cada motor, o pico de memoria vs N (log-log) em 'ax_mem'
+    e os bytes por elemento vs N em 'ax_bpe'.
+    """
+    import numpy as np
+
+    for motor, serie in series_memoria.items():
+        n = np.array(serie['n'], dtype=float)
+        pico = np.array(serie['pico_bytes'], dtype=float)
+        ax_mem.loglog(n, pico / 2**20, '-o', linewidth=2, markersize=6, label=motor)
+        ax_bpe.semilogx(n, pico / n, '-o', linewidth=2, markersize=6, label=motor)
+
+    ax_mem.set_xlabel('Numero de Elementos (escala log)', fontsize=12)
+    ax_mem.set_ylabel('Pico de Memoria (MB) - escala log', fontsize=12)
+    ax_mem.set_title('Memoria vs N (pico tracemalloc)', fontsize=14, fontweight='bold')
+    ax_mem.grid(True, alpha=0.3, which='both')
+    ax_mem.legend(fontsize=10)
+
+    ax_bpe.set_xlabel('Numero de Elementos (escala log)', fontsize=12)
+    ax_bpe.set_ylabel('Bytes por Elemento', fontsize=12)
+    ax_bpe.set_title('Custo de Memoria por Elemento', fontsize=14, fontweight='bold')
+    ax_bpe.grid(True, alpha=0.3, which='both')
+    ax_bpe.legend(fontsize=10)
+
+def gerar_graficos_memoria(series_memoria):
+    """
+    Figura 4: paineis de memoria (exibida junto com as demais).
+    """
+    import matplotlib.pyplot as plt
+
+    if not series_memoria:
+        return None
+    fig4, (ax_mem, ax_bpe) = plt.subplots(1, 2, figsize=(14, 6))
+    plotar_memoria(ax_mem, ax_bpe, series_memoria)
+    plt.tight_layout()
+    return fig4
+
+# ============================================================================
+#  DASHBOARDS (dados brutos -> figura), usados por relatorios.py
+# ============================================================================
+
+def dashboard_tempos(dados):
+    return grafico_tempos(dados['n_elementos'], dados['tempos_for'], dados['tempos_lambda'])
+
+def dashboard_diferenca(dados):
+    diff_perc, _ = calcular_estatisticas(dados['tempos_for'], dados['tempos_lambda'])
+    return grafico_diferenca(dados['n_elementos'], diff_perc)
+
+def dashboard_razao(dados):
+    _, razao = calcular_estatisticas(dados['tempos_for'], dados['tempos_lambda'])
+    return grafico_razao(dados['n_elementos'], razao)
+
+def dashboard_memoria(dados):
+    return gerar_graficos_memoria(dados['memoria'])
+
+DASHBOARDS = {
+    'experimental_tempos': dashboard_tempos,
+    'experimental_diferenca': dashboard_diferenca,
+    'experimental_razao': dashboard_razao,
+    'experimental_memoria': dashboard_memoria,
+}
 
 # ============================================================================
 #  EXECUCAO PRINCIPAL
 # ============================================================================
 
 if __name__ == "__main__":
+    dados = carregar_dados()
+    n_elementos, tempos_for, tempos_lambda = dados['n_elementos'], dados['tempos_for'], dados['tempos_lambda']
+
     # 1. Processa dados e imprime tabela
     diff_perc, razao = imprimir_relatorio(n_elementos, tempos_for, tempos_lambda)
+    imprimir_memoria(dados['memoria'])
+    print("\n[AVISO] Feche as janelas dos graficos para encerrar o programa.")
     
-    # 2. Gera e mostra os graficos
-    gerar_graficos(n_elementos, tempos_for, tempos_lambda, diff_perc, razao)
\ No newline at end of file
+    # 2. Gera e mostra os graficos (memoria antes: gerar_graficos chama plt.show)
+    gerar_graficos_memoria(dados['memoria'])
+    gerar_graficos(n_elementos, tempos_for, tempos_lambda, diff_perc, razao)
@@ -1,5 +1,4 @@
-import matplotlib.pyplot as plt
-import numpy as np
+from resultados import carregar_series
 
 # ============================================================================
 #  QUESTÃO D: ANÁLISE TEÓRICA DA COMPLEXIDADE T(n)
@@ -15,31 +14,38 @@ import numpy as np
 #    'b' é o tempo constante de inicialização (intercepto).
 # ============================================================================
 
-# --- 1. DADOS OBTIDOS (Do Benchmark) ---
-n_elementos = [100_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000]
-
-# Tempos médios (em milissegundos)
-tempos_exp_for = [15.2, 152.7, 761.9, 1523.4, 7617.9]
-tempos_exp_lambda = [21.4, 215.3, 1076.5, 2154.3, 10769.2]
-
-# --- 2. CÁLCULO DOS COEFICIENTES TEÓRICOS ---
-# Para encontrar a equação da reta T(n) = an + b, usamos regressão linear simples
-# ou uma aproximação baseada na média (tempo / n).
-
-# Coeficiente angular 'a' (nanosegundos por elemento)
-# Calculado dividindo o tempo total pelo número de elementos (média dos casos grandes)
-a_for = 0.0001523      # ~152 ns/elemento
-a_lambda = 0.0002154   # ~215 ns/elemento
+def carregar_dados():
+    """
+    Séries for/lambda (do benchmark, via resultados.json) com os
+    coeficientes teóricos já ajustados.
+    """
+    # --- 1. DADOS OBTIDOS ---
+    n_elementos, series = carregar_series('for', 'lambda')
+    return {'n_elementos': n_elementos, 'series': series}
 
-# Coeficiente linear 'b' (milissegundos)
-# Representa o custo fixo (sleep + alocação inicial)
-b_for = 0.1 
-b_lambda = 0.15
+def coeficientes(dados):
+    """
+    Tempos medianos (ms) e coeficientes (a, b) de T(n) = an + b de cada abordagem.
+    """
+    series = dados['series']
+    # --- 2. CÁLCULO DOS COEFICIENTES TEÓRICOS ---
+    # Para encontrar a equação da reta T(n) = an + b, usamos regressão linear simples
+    # calculada pelo benchmark e gravada junto com as séries.
+    # 'a': milissegundos por elemento; 'b': custo fixo (chamada da função + alocação inicial)
+    return (series['for']['mediana_ms'], series['lambda']['mediana_ms'],
+            series['for']['a'], series['for']['b'],
+            series['lambda']['a'], series['lambda']['b'])
 
-def plotar_analise_teorica():
+def figura_teorica(dados):
     """
     Gera o gráfico comparativo entre a Teoria O(n) e a Prática.
     """
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    n_elementos = dados['n_elementos']
+    tempos_exp_for, tempos_exp_lambda, a_for, b_for, a_lambda, b_lambda = coeficientes(dados)
+
     # Cria uma sequência contínua de N para desenhar a linha teórica perfeita
     n_teorico = np.linspace(min(n_elementos), max(n_elementos), 100)
     
@@ -48,7 +54,7 @@ def plotar_analise_teorica():
     t_teorico_lambda = a_lambda * n_teorico + b_lambda
     
     # Configuração do Gráfico
-    plt.figure(figsize=(10, 7))
+    fig = plt.figure(figsize=(10, 7))
     
     # 1. Plota as Linhas Teóricas (Matemática)
     plt.plot(n_teorico, t_teorico_for, 'b--', linewidth=1.5, alpha=0.7, label='Teoria T(n) For')
@@ -69,26 +75,41 @@ def plotar_analise_teorica():
     # Adiciona o texto das fórmulas no gráfico
     texto_formulas = (
         f"Fórmulas Calculadas:\n"
-        f"For:      T(n) ≈ {a_for:.7f}n + {b_for}\n"
-        f"Lambda: T(n) ≈ {a_lambda:.7f}n + {b_lambda}"
+        f"For:      T(n) ≈ {a_for:.7f}n + {b_for:.2f}\n"
+        f"Lambda: T(n) ≈ {a_lambda:.7f}n + {b_lambda:.2f}"
     )
     plt.text(0.05, 0.85, texto_formulas, transform=plt.gca().transAxes,
              bbox=dict(facecolor='white', alpha=0.9, edgecolor='gray'))
     
     plt.tight_layout()
+    return fig
+
+def plotar_analise_teorica(dados):
+    """
+    Exibe o gráfico de validação numa janela.
+    """
+    import matplotlib.pyplot as plt
+
+    figura_teorica(dados)
     plt.show()
 
+# Dashboards (dados brutos -> figura), usados por relatorios.py
+DASHBOARDS = {'teorica': figura_teorica}
+
 # ============================================================================
 #  EXECUÇÃO
 # ============================================================================
 if __name__ == "__main__":
+    dados = carregar_dados()
+    _, _, a_for, b_for, a_lambda, b_lambda = coeficientes(dados)
+
     print(f"{'='*60}")
     print(f"{'ANÁLISE TEÓRICA DE COMPLEXIDADE':^60}")
     print(f"{'='*60}")
     print(f"Modelo Matemático Identificado: Linear O(n)\n")
-    print(f"Equação do Loop For:   T(n) = {a_for:.7f} * n + {b_for}")
-    print(f"Equação do Lambda:     T(n) = {a_lambda:.7f} * n + {b_lambda}")
+    print(f"Equação do Loop For:   T(n) = {a_for:.7f} * n + {b_for:.2f}")
+    print(f"Equação do Lambda:     T(n) = {a_lambda:.7f} * n + {b_lambda:.2f}")
     print(f"{'-'*60}")
     print("Gerando gráfico de validação...")
     
-    plotar_analise_teorica()
\ No newline at end of file
+    plotar_analise_teorica(dados)
\ No newline at end of file
@@ -1,72 +1,105 @@
-import time
+import argparse
+import os
+import sys
+
+from agendador import agendar
+from cache import abrir_cache, fechar_cache, medir_com_cache
+from contadores import contadores_disponiveis, contadores_motor
+from medicao import medir
+from modos import imprimir_modos, medir_modos
+from motores import motores_para, numpares, numparesL, validar_todos
+from paralelo import varrer_escalabilidade
+from resultados import salvar_medicoes
 
 # ============================================================================
 #  PROJETO: BENCHMARK DE PERFORMANCE (VERSÃO COMPLETA)
 # ============================================================================
-#  Este script realiza um teste de carga comparando duas abordagens para
-#  filtrar números pares, incluindo testes de alto volume (50 milhões).
+#  Este script realiza um teste de carga comparando todas as abordagens
+#  registradas em motores.py para filtrar números pares, incluindo testes
+#  de alto volume (50 milhões).
 #
-#  Cenários:
-#  1. Abordagem Imperativa (Loop For)
+#  Cenários principais:
+#  1. Abordagem Imperativa (Loop For) — referência dos oráculos
 #  2. Abordagem Funcional (Lambda + Filter)
+#  3. Abordagem Vetorizada (NumPy int64)
+#  4. List comprehension, itertools.compress, fatiamento e paralelo
+#
+#  Antes de medir, cada motor é validado contra numpares pelo seu oráculo.
+#
+#  Com --escalabilidade, executa as varreduras forte e fraca do filtro
+#  paralelo (1..os.cpu_count() processos) ao lado dos tempos de for/lambda,
+#  gravadas na secao 'escalabilidade' de resultados.json (fora dos motores).
+#
+#  A cronometragem fica a cargo do harness em medicao.py
+#  (perf_counter_ns, aquecimento e repetições até o IC convergir).
+#  Células já medidas com o mesmo código e ambiente vêm do cache.py;
+#  use --forcar para medir tudo de novo.
+#
+#  Com --orcamento SEGUNDOS, o agendador.py distribui as repetições entre
+#  as células para estreitar o IC da inclinação 'a' e acrescenta pontos N
+#  onde o ajuste linear mais erra (sem cache: a grade muda a cada execução).
+#
+#  Com --contadores, cada célula ganha instruções, ciclos, IPC e falhas de
+#  desvio/cache por chamada (perf_event_open ou perf stat; ver contadores.py).
+#
+#  Com --modos, mede cada motor nos modos de resultado contagem, soma,
+#  primeiros k e iterador (sem materializar a lista; ver modos.py) e compara
+#  tempo e pico de memoria com o modo lista.
 # ============================================================================
 
-def numpares(l):
-    """
-    Lógica 1: Abordagem Imperativa (Clássica)
-    Percorre a lista item a item e verifica a condição.
-    Complexidade: O(n)
-    """
-    inicio = time.time()        # Marca o tempo inicial (t0)
-    time.sleep(0.5)             # Pausa artificial (simula processamento)
-    
-    pares = []                  # Inicializa lista vazia
-    
-    # --- Processamento do Loop ---
-    for i in l:
-        if i % 2 == 0:          # Critério: Verifica se é par
-            pares.append(i)     # Ação: Adiciona à lista final
-            
-    fim = time.time()           # Marca o tempo final (t1)
-    
-    # Cálculo e exibição do tempo em milissegundos
-    tempo_ms = (fim - inicio) * 1000.0
-    print(f'Tempo for: {tempo_ms:.0f} ms')
-    
-    return pares
+# ============================================================================
+#  ESCALABILIDADE DO FILTRO PARALELO
+# ============================================================================
 
-def numparesL(l):
+def imprimir_escalabilidade(n_base):
     """
-    Lógica 2: Abordagem Funcional (Pythonic)
-    Utiliza filter() e lambda para processar a lista.
-    Complexidade: O(n) com overhead de chamadas de função.
+    Varreduras forte e fraca do filtro paralelo, com o tempo de for e
+    lambda (1 núcleo) no mesmo N como referência em cada linha. Devolve
+    {('paralelo_<modo>_p<k>', n): resumo}.
     """
-    inicio = time.time()        # Marca o tempo inicial
-    time.sleep(0.5)             # Pausa artificial
-    
-    # --- Processamento Funcional ---
-    # filter gera o iterador, list materializa os dados na memória
-    pares = list(filter(lambda valor: valor % 2 == 0, l))
-    
-    fim = time.time()           # Marca o tempo final
-    
-    # Cálculo e exibição do tempo em milissegundos
-    tempo_ms = (fim - inicio) * 1000.0
-    print(f'Tempo lambda: {tempo_ms:.0f} ms')
-    
-    return pares
+    medicoes = {}
+    opcoes = dict(aquecimento=1, min_repeticoes=3, max_repeticoes=10)
+    for modo in ('forte', 'fraca'):
+        print(f"\nEscalabilidade {modo.upper()} (N base = {n_base:,}):")
+        print(f"{'Proc.':<7} {'N':<14} {'Paralelo (ms)':<15} {'For (ms)':<12} {'Lambda (ms)':<13} "
+              f"{'Speedup':<9} {'Eficiencia':<10}")
+        print("-" * 84)
+        referencias = {}
+        for linha in varrer_escalabilidade(n_base, modo, **opcoes):
+            n = linha['n']
+            if n not in referencias:
+                referencias[n] = {nome: medir(funcao, entrada=range(n), **opcoes)['mediana_ms']
+                                  for nome, funcao in (('for', numpares), ('lambda', numparesL))}
+            medicoes[(f"paralelo_{modo}_p{linha['trabalhadores']}", n)] = linha['resumo']
+            print(f"{linha['trabalhadores']:<7} {n:<14,} {linha['mediana_ms']:<15.1f} "
+                  f"{referencias[n]['for']:<12.1f} {referencias[n]['lambda']:<13.1f} "
+                  f"{linha['speedup']:<9.2f} {linha['eficiencia']:<10.1%}")
+    return medicoes
 
 # ============================================================================
-#  EXECUÇÃO PRINCIPAL (MAIN)
+#  VARREDURA DE N
 # ============================================================================
 
-if __name__ == "__main__":
-    
-    # Configuração dos Dados (Inputs)
-    # Inclui teste de estresse com 50 milhões de itens (5*10**7)
-    valores = [10**5, 10**6, 5*10**6, 10**7, 5*10**7]
+def executar_varredura(motores, valores, forcar=False, contadores=False):
+    """
+    Mede cada motor em cada N de 'valores' (repetições até o IC da célula
+    convergir), reaproveitando as células do cache. Com contadores=True,
+    acrescenta os contadores de hardware de uma chamada (contadores.py).
+    """
+    # Resumos estatísticos por (motor, N), gravados no final
+    medicoes = {}
 
-    print("Testando as duas funcoes:")
+    # Opções da medição (fazem parte da chave do cache)
+    opcoes = dict(aquecimento=1, min_repeticoes=3, memoria=True)
+    chave_opcoes = dict(opcoes, contadores=True) if contadores else opcoes
+    cache = abrir_cache()
+
+    print(f"Testando {len(motores)} funcoes ({os.cpu_count()} nucleos disponiveis): "
+          f"{', '.join(motores)}")
+    construcoes = [nome for nome, motor in motores.items() if motor['construcao_range']]
+    if construcoes:
+        print(f"* {', '.join(construcoes)}: construcao por passo (progressao aritmetica), "
+              f"sem ler nem filtrar dados")
     print("-" * 50)
 
     # --- Loop de Testes ---
@@ -77,16 +110,120 @@ if __name__ == "__main__":
         # Gera a lista de teste na memória
         lista_range = range(n)
 
-        # 1. Teste com For
-        print(f"1. Funcao com for:")
-        resultado_for = numpares(lista_range)
-        
-        # 2. Teste com Lambda
-        print(f"2. Funcao com lambda:")
-        resultado_lambda = numparesL(lista_range)
+        resultados = {}
+        for nome, motor in motores.items():
+            def medir_celula():
+                resumo = medir(motor['funcao'], entrada=lista_range,
+                               guardar_resultado=True, **opcoes)
+                resumo['tamanho_resultado'] = len(resumo.pop('resultado'))
+                if contadores:
+                    resumo.update(contadores_motor(nome, motor['funcao'], 'range', n, lista_range,
+                                                   motor['multiprocesso']) or {})
+                return resumo
+
+            resumo, do_cache = medir_com_cache(cache, motor['funcao'], n, 'range', medir_celula,
+                                               forcar=forcar, opcoes=chave_opcoes, rotulo=nome)
+            resultados[nome] = resumo['tamanho_resultado']
+            medicoes[(nome, n)] = resumo
+            rotulo = nome + ('*' if motor['construcao_range'] else '')
+            print(f"Tempo {rotulo:<11}: mediana {resumo['mediana_ms']:>10.1f} ms | "
+                  f"min {resumo['min_ms']:>10.1f} ms | p95 {resumo['p95_ms']:>10.1f} ms | "
+                  f"desvio {resumo['desvio_ms']:>8.2f} ms ({resumo['repeticoes']} rep.)"
+                  + (" [cache]" if do_cache else ""))
+            if resumo.get('instrucoes') is not None:
+                print(f"{'':<17} {resumo['instrucoes'] / n:>8.1f} instr/elem | "
+                      f"IPC {resumo['ipc'] or 0:.2f} | {resumo['falhas_desvio'] / n:.3f} falhas desvio/elem | "
+                      f"{resumo['falhas_cache'] / n:.3f} falhas cache/elem")
         
         # --- Validação dos Resultados ---
-        if len(resultado_for) == len(resultado_lambda):
-            print(f"[OK] Ambas encontraram {len(resultado_for):,} numeros pares")
+        if len(set(resultados.values())) == 1:
+            print(f"[OK] Todas encontraram {resultados['for']:,} numeros pares")
         else:
-            print("[ERRO] Resultados diferentes!")
\ No newline at end of file
+            print("[ERRO] Resultados diferentes!")
+
+    fechar_cache(cache)
+    return medicoes
+
+def executar_agendado(motores, valores, orcamento_s):
+    """
+    Varredura com orçamento total de tempo (agendador.py): as repetições vão
+    para as células que mais estreitam o IC da inclinação de cada motor, e
+    pontos N intermediários entram onde o ajuste linear erra mais.
+    """
+    print(f"Agendando {len(motores)} funcoes em {orcamento_s:.0f} s (piloto a parte): "
+          f"{', '.join(motores)}")
+    print("-" * 50)
+    relatorio = {}
+    medicoes = agendar({nome: m['funcao'] for nome, m in motores.items()}, valores,
+                       orcamento_s, memoria=True, relatorio=relatorio)
+
+    ns = sorted({n for _, n in medicoes})
+    print(f"\n{'Motor':<13} {'IC rel. a':<11} " + " ".join(f"{n:>10.0e}" for n in ns))
+    print("-" * (25 + 11 * len(ns)))
+    for nome in motores:
+        print(f"{nome:<13} {relatorio['ic_relativo'][nome]:<11.2%} "
+              + " ".join(f"{relatorio['rodadas'][(nome, n)]:>10}" for n in ns))
+    print(f"(rodadas por célula) | piloto: {relatorio['piloto_s']:.1f} s | "
+          f"gasto no orçamento: {relatorio['gasto_s']:.1f} s | pontos extras: "
+          f"{', '.join(f'{n:,}' for n in relatorio['pontos_extras']) or 'nenhum'}")
+
+    for n in ns:
+        if len({medicoes[(nome, n)]['tamanho_resultado'] for nome in motores}) != 1:
+            print(f"[ERRO] Resultados diferentes em N={n:,}!")
+    return medicoes
+
+# ============================================================================
+#  EXECUÇÃO PRINCIPAL (MAIN)
+# ============================================================================
+
+if __name__ == "__main__":
+    
+    parser = argparse.ArgumentParser(description="Benchmark completo de filtragem de pares")
+    parser.add_argument('--escalabilidade', action='store_true',
+                        help="executa as varreduras forte e fraca do filtro paralelo")
+    parser.add_argument('--n-escala', type=int, default=10**7,
+                        help="N base das varreduras de escalabilidade")
+    parser.add_argument('--forcar', '--force', action='store_true',
+                        help="ignora o cache e mede todas as células novamente")
+    parser.add_argument('--contadores', action='store_true',
+                        help="acrescenta instruções, ciclos e falhas de desvio/cache (perf; ver contadores.py)")
+    parser.add_argument('--modos', action='store_true',
+                        help="compara os modos de resultado (contagem, soma, primeiros, iterador) e sai")
+    parser.add_argument('--n-modos', type=int, default=10**6,
+                        help="N do modo --modos")
+    parser.add_argument('--orcamento', type=float, default=None,
+                        help="orçamento total em segundos para o agendador adaptativo (sem cache)")
+    args = parser.parse_args()
+    
+    # Configuração dos Dados (Inputs)
+    # Inclui teste de estresse com 50 milhões de itens (5*10**7)
+    valores = [10**5, 10**6, 5*10**6, 10**7, 5*10**7]
+
+    # Motores registrados que aceitam range como entrada
+    motores = motores_para('range')
+
+    # --- Validação contra a referência (numpares) ---
+    validacao = validar_todos()
+    invalidos = sorted({nome for (nome, _), ok in validacao.items() if not ok})
+    if invalidos:
+        print(f"[ERRO] Motores reprovados pelo oráculo (ignorados): {', '.join(invalidos)}")
+        motores = {nome: m for nome, m in motores.items() if nome not in invalidos}
+
+    if args.modos:
+        imprimir_modos(medir_modos(motores, args.n_modos, aquecimento=1, min_repeticoes=3,
+                                   max_repeticoes=10), args.n_modos)
+        sys.exit(0)
+
+    if args.orcamento is not None:
+        medicoes = executar_agendado(motores, valores, args.orcamento)
+    else:
+        if args.contadores and contadores_disponiveis() is None:
+            print("[AVISO] Contadores de hardware indisponiveis (sem PMU/perf); medindo so tempo e memoria.")
+        medicoes = executar_varredura(motores, valores, args.forcar,
+                                      args.contadores and contadores_disponiveis() is not None)
+
+    # --- Persistência (alimenta os scripts de análise) ---
+    if args.escalabilidade:
+        salvar_medicoes(imprimir_escalabilidade(args.n_escala), secao='escalabilidade')
+    chave = salvar_medicoes(medicoes)
+    print(f"\nResultados gravados em resultados.json (execucao '{chave}')")
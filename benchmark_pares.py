@@ -1,101 +1,423 @@
+import argparse
+import os
+import resource
+import sys
 import time
+from array import array
+
+from cache import abrir_cache, fechar_cache, medir_com_cache
+from entradas import imprimir_matriz, imprimir_vencedor, medir_matriz
+from incremental import imprimir_incremental
+from isolamento import estado_cpu, fixar_cpu, restaurar_cpu
+from medicao import medir
+from motores import MOTORES, motores_para, validar_todos
+from paralelo import (criar_entrada_compartilhada, criar_executor,
+                      liberar_entrada_compartilhada, numparesC, numparesP)
+from predicados import imprimir_predicados, medir_predicados
+from resultados import salvar_medicoes
 
 # ============================================================================
 #  PROJETO: BENCHMARK DE PERFORMANCE (PYTHON)
 # ============================================================================
-#  Este script compara o tempo de execucao de duas abordagens para 
-#  filtrar numeros pares em uma lista de dados.
+#  Este script compara o tempo de execucao das abordagens registradas em
+#  motores.py para filtrar numeros pares em uma lista de dados.
 #
-#  Cenarios Testados:
+#  Cenarios Testados (todos os motores que aceitam listas):
 #  1. Iteracao Classica (Loop For)
 #  2. Programacao Funcional (Lambda + Filter)
+#  3. Programacao Vetorizada (NumPy int64)
+#  4. List comprehension, itertools.compress e paralelo
+#
+#  Os tempos sao coletados pelo harness de medicao.py (perf_counter_ns),
+#  com a geracao dos dados fora da regiao medida.
+#
+#  Modo --streaming: a entrada chega em blocos array('q') de tamanho fixo e
+#  os pares sao contados bloco a bloco, sem materializar lista alguma.
+#  O pico de memoria fica constante em N (varredura ate 10^9 elementos).
+#  Gravado na secao 'streaming' de resultados.json.
+#
+#  Modo --compartilhado shm|mmap: os dados sao gerados uma vez num buffer
+#  int64 compartilhado; os processos trabalhadores se anexam pelo nome e
+#  filtram as suas fatias sem copia. Preparo e filtragem sao medidos a parte.
+#  Gravado na secao 'compartilhado' de resultados.json.
+#
+#  Modo --isolado: processo preso a um nucleo, GC desligado (ou coletado)
+#  em cada amostra e marcas de interferencia por amostra; as ruidosas nao
+#  entram no ajuste de T(n). O estado da CPU (governador, frequencias,
+#  nucleo) ao fim de cada celula fica gravado com ela ('estado_cpu').
+#
+#  Modo --matriz: cada motor e medido em distribuicoes (aleatoria, ordenada,
+#  adversaria, seletividade 0..100%, inteiros grandes) x conteineres (list,
+#  tuple, array('q'), NumPy, gerador); ver entradas.py.
+#
+#  Modo --predicados: filtro generico (modulo k, intervalo, mascara de bits,
+#  conjunto) em cada caminho especializado (aritmetico no range, NumPy,
+#  compilado) contra a linha de base lambda; ver predicados.py.
+#
+#  Modo --incremental: consultas repetidas sobre dados que so crescem,
+#  varredura completa (numpares) contra o filtro incremental, por taxa de
+#  acrescimo; ver incremental.py.
 # ============================================================================
 
 # --- Configuracao dos Dados (Mock Data / Inputs) ---
 # Definimos diferentes tamanhos de lista para testar a escalabilidade
 entradas = [10**5, 10**6, 5*10**6, 10**7] 
 
-def numpares(l):
+# Modo streaming: tamanhos da varredura e elementos por bloco
+entradas_streaming = [10**6, 10**7, 10**8, 10**9]
+TAMANHO_BLOCO = 1 << 16
+
+# ============================================================================
+#  MODO STREAMING (memoria limitada)
+# ============================================================================
+
+def blocos_range(n, tamanho=TAMANHO_BLOCO):
     """
-    Logica 1: Abordagem Imperativa (Classica)
-    Cria uma lista vazia e itera item a item manualmente.
+    Gera os inteiros 0..n-1 em blocos array('q') de 'tamanho' elementos.
+    So um bloco existe na memoria por vez.
     """
-    inicio = time.time()        # Marca o tempo inicial (t0)
-    time.sleep(0.5)             # Pausa artificial (simula carga constante)
-    
-    pares = []                  # Inicializa lista vazia na memoria
-    
-    # --- Processamento do Loop (Iteracao) ---
-    for i in l:
-        if i % 2 == 0:          # Criterio 1: Verifica se o resto da divisao e 0
-            pares.append(i)     # Acao: Adiciona o numero a lista final
-            
-    fim = time.time()           # Marca o tempo final (t1)
-    
-    # Formatacao do tempo
-    tempo_total = fim - inicio
-    print(f'For Loop | N={len(l):.0e}: {tempo_total:.4f}s')
-    return tempo_total
+    for inicio in range(0, n, tamanho):
+        yield array('q', range(inicio, min(inicio + tamanho, n)))
 
-def numparesL(l):
+def consumir_blocos(blocos):
     """
-    Logica 2: Abordagem Funcional (Pythonic)
-    Utiliza funcoes de alta ordem (filter) com funcoes anonimas (lambda).
+    Linha de base: apenas percorre a fonte de blocos (custo de geracao),
+    para descontar do tempo das abordagens em fluxo.
     """
-    inicio = time.time()        # Marca o tempo inicial
-    time.sleep(0.5)             # Pausa artificial
-    
-    # --- Processamento Funcional (Linha unica) ---
-    # filter() aplica a regra a cada item. list() materializa o resultado.
-    pares = list(filter(lambda valor: valor % 2 == 0, l))
-    
-    fim = time.time()           # Marca o tempo final
-    
-    # Formatacao do tempo
-    tempo_total = fim - inicio
-    print(f'Lambda   | N={len(l):.0e}: {tempo_total:.4f}s')
-    return tempo_total
+    total = 0
+    for bloco in blocos:
+        total += len(bloco)
+    return total
+
+def numparesStream(blocos, emitir=None):
+    """
+    Logica 1 em fluxo: laco for sobre cada bloco, contando os pares.
+    Se 'emitir' for dado, recebe a lista de pares de cada bloco.
+    """
+    total = 0
+    for bloco in blocos:
+        pares = []
+        for i in bloco:
+            if i % 2 == 0:
+                pares.append(i)
+        total += len(pares)
+        if emitir is not None:
+            emitir(pares)
+    return total
+
+def numparesLStream(blocos, emitir=None):
+    """
+    Logica 2 em fluxo: filter + lambda aplicado a cada bloco.
+    """
+    total = 0
+    for bloco in blocos:
+        pares = list(filter(lambda valor: valor % 2 == 0, bloco))
+        total += len(pares)
+        if emitir is not None:
+            emitir(pares)
+    return total
+
+def pico_rss_mb():
+    """
+    Pico de memoria residente do processo (ru_maxrss, em KiB no Linux).
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def executar_streaming(limite, tamanho_bloco):
+    """
+    Varredura em fluxo ate 'limite' elementos, reportando vazao (elementos/s).
+    """
+    motores = {'fonte_stream': consumir_blocos,
+               'for_stream': numparesStream,
+               'lambda_stream': numparesLStream}
+    medicoes = {}
+    tamanhos = [n for n in entradas_streaming if n <= limite]
+
+    print("="*75)
+    print(f"MODO STREAMING: blocos de {tamanho_bloco:,} elementos")
+    print("="*75)
+    print(f"{'Tamanho (N)':<15} {'Motor':<15} {'Mediana (s)':<13} {'Elem/s':<15} {'Liquido elem/s':<15} {'Pico RSS (MB)':<12}")
+    print("-"*75)
+
+    for n in tamanhos:
+        # Repeticoes reduzidas: em 10^9 cada rodada leva minutos
+        opcoes = dict(aquecimento=0 if n >= 10**8 else 1,
+                      min_repeticoes=1 if n >= 10**8 else 3,
+                      max_repeticoes=10, tempo_max_s=60.0)
+        for nome, funcao in motores.items():
+            resumo = medir(funcao, preparar=lambda: blocos_range(n, tamanho_bloco), **opcoes)
+            medicoes[(nome, n)] = resumo
+            segundos = resumo['mediana_ms'] / 1000
+            if nome == 'fonte_stream':
+                base = segundos
+                liquido = ''
+            else:
+                # Vazao descontando o tempo de gerar os blocos
+                liquido = f"{n / max(segundos - base, 1e-9):<15,.0f}"
+            print(f"{n:<15,} {nome:<15} {segundos:<13.4f} {n / segundos:<15,.0f} {liquido:<15} {pico_rss_mb():<12.1f}")
+
+    return medicoes
 
 # ============================================================================
-#  EXECUCAO PRINCIPAL
+#  MODO ENTRADA COMPARTILHADA (zero-copia entre processos)
 # ============================================================================
 
-if __name__ == "__main__":
+def executar_compartilhado(tipo, trabalhadores):
+    """
+    Para cada N: aloca e preenche o buffer compartilhado, anexa os
+    trabalhadores e mede a filtragem paralela (contagem). Compara com o
+    mesmo filtro paralelo recebendo a lista serializada (pickle).
+    """
+    medicoes = {}
+
+    print("="*96)
+    print(f"MODO ENTRADA COMPARTILHADA ({tipo}, {trabalhadores} processos)")
+    print("="*96)
+    print(f"{'Tamanho (N)':<14} {'Alocacao (ms)':<15} {'Anexo (ms)':<12} {'Filtro (ms)':<13} "
+          f"{'Lista pickle (ms)':<19} {'Pico pai (MB)':<14} {'Pico total (MB)':<15}")
+    print("-"*96)
+
+    for n in entradas:
+        # --- Preparo: alocacao + preenchimento (medido a parte) ---
+        t0 = time.perf_counter_ns()
+        descritor, recurso = criar_entrada_compartilhada(n, tipo)
+        alocacao_ms = (time.perf_counter_ns() - t0) / 1e6
+
+        with criar_executor(trabalhadores) as executor:
+            # Primeira chamada: cada trabalhador se anexa ao buffer
+            estatisticas = {}
+            numparesC(descritor, executor, trabalhadores, contar=True, estatisticas=estatisticas)
+            anexo_ms = estatisticas['anexo_ns'] / 1e6
+
+            # --- Filtragem (anexos ja abertos) ---
+            resumo = medir(lambda _: numparesC(descritor, executor, trabalhadores, contar=True,
+                                               estatisticas=estatisticas))
+            medicoes[(f'compartilhado_{tipo}', n)] = resumo
+            pico_pai_mb = pico_rss_mb()
+
+            # --- Referencia: mesma filtragem, mas serializando a lista ---
+            lista_teste = list(range(n))
+            resumo_lista = medir(lambda l: numparesP(l, executor, trabalhadores, contar=True),
+                                 entrada=lista_teste)
+            medicoes[('paralelo_lista', n)] = resumo_lista
+            del lista_teste
+
+        liberar_entrada_compartilhada(descritor, recurso)
+
+        # Soma dos picos de cada processo (paginas compartilhadas contam em todos)
+        pico_total_mb = pico_pai_mb + sum(estatisticas['pico_kb'].values()) / 1024
+        print(f"{n:<14,} {alocacao_ms:<15.1f} {anexo_ms:<12.3f} {resumo['mediana_ms']:<13.1f} "
+              f"{resumo_lista['mediana_ms']:<19.1f} {pico_pai_mb:<14.1f} {pico_total_mb:<15.1f}")
+
+    return medicoes
+
+# ============================================================================
+#  MODO PADRAO (listas em memoria)
+# ============================================================================
+
+def executar_comparacao(forcar=False, opcoes=None, anotar=None):
+    """
+    Compara os motores registrados sobre list(range(n)) para cada N de 'entradas'.
+    Celulas sem mudanca de codigo/ambiente vem do cache (forcar=True remede).
+    'opcoes' sao repassadas a medir() (ex.: gc_modo e qualidade do modo isolado);
+    'anotar()', se dado, e chamado apos cada celula medida e o dicionario
+    devolvido vai no resumo como 'estado_cpu' (e com ele para o cache).
+    """
+    opcoes = dict(opcoes or {})
+    # Motores registrados que aceitam lista e passam no oraculo
+    validacao = validar_todos()
+    motores = {nome: m for nome, m in motores_para('list').items() if validacao[(nome, 'list')]}
+    reprovados = [nome for nome in motores_para('list') if nome not in motores]
     
     print("="*60)
-    print("INICIANDO COMPARACAO: For Loop vs Lambda")
+    print(f"INICIANDO COMPARACAO: {' vs '.join(motores)}")
     print("="*60)
+    if reprovados:
+        print(f"[ERRO] Reprovados pelo oraculo (ignorados): {', '.join(reprovados)}")
     
-    # Listas para armazenar resultados e gerar relatorio final
-    tempos_for = []
-    tempos_lambda = []
+    # Resumos estatisticos por (motor, N) para gerar relatorio final
+    medicoes = {}
+    cache = abrir_cache()
 
     # --- Loop de Testes (Varios Cenarios) ---
     for n in entradas:
         print(f"\n---> Testando com N={n:,} elementos:")
         
-        # Preparacao dos dados (Gera a lista na memoria RAM)
-        lista_teste = list(range(n))
+        # Preparacao dos dados (Gera a lista na memoria RAM, fora do cronometro)
+        # So e construida se alguma celula precisar ser medida
+        lista_teste = None
         
-        # 1. Executa Logica Imperativa
-        tempo_for = numpares(lista_teste)
-        tempos_for.append(tempo_for)
-        
-        # 2. Executa Logica Funcional
-        tempo_lambda = numparesL(lista_teste)
-        tempos_lambda.append(tempo_lambda)
+        for nome, motor in motores.items():
+            def medir_celula():
+                nonlocal lista_teste
+                if lista_teste is None:
+                    lista_teste = list(range(n))
+                resumo = medir(motor['funcao'], entrada=lista_teste, memoria=True, **opcoes)
+                if anotar is not None:
+                    resumo['estado_cpu'] = anotar()
+                return resumo
+
+            resumo, do_cache = medir_com_cache(cache, motor['funcao'], n, 'list', medir_celula,
+                                               forcar=forcar, opcoes=opcoes, rotulo=nome)
+            medicoes[(nome, n)] = resumo
+            print(f"{nome:<12}| N={n:.0e}: mediana {resumo['mediana_ms'] / 1000:.4f}s "
+                  f"(min {resumo['min_ms'] / 1000:.4f}s, p95 {resumo['p95_ms'] / 1000:.4f}s, "
+                  f"desvio {resumo['desvio_ms'] / 1000:.4f}s, {resumo['repeticoes']} rep.)"
+                  + (f" [{sum(q['ruidosa'] for q in resumo['qualidade'])} ruidosas]"
+                     if 'qualidade' in resumo else "")
+                  + (" [cache]" if do_cache else ""))
+        del lista_teste
+
+    fechar_cache(cache)
 
     # --- Relatorio Final (Output Formatado) ---
-    print("\n" + "="*60)
-    print(f"{'Tamanho (N)':<15} {'For Loop (s)':<15} {'Lambda (s)':<15} {'Diferenca':<15}")
-    print("="*60)
+    # Tempos em segundos (mediana das repeticoes); ultima coluna: Lambda - For
+    largura = 17 * len(motores) + 32
+    print("\n" + "="*largura)
+    print(f"{'Tamanho (N)':<15} " + " ".join(f"{nome + ' (s)':<16}" for nome in motores) + f" {'Diferenca':<15}")
+    print("="*largura)
 
-    for i, n in enumerate(entradas):
-        # Calculo da diferenca de performance
-        diff = tempos_lambda[i] - tempos_for[i]
+    for n in entradas:
+        tempos = {nome: medicoes[(nome, n)]['mediana_ms'] / 1000 for nome in motores}
         
-        # Define se o resultado foi positivo ou negativo visualmente
-        sinal = "+" if diff > 0 else "" 
+        # Calculo da diferenca de performance (so se for e lambda passaram no oraculo)
+        if 'lambda' in tempos and 'for' in tempos:
+            diff = tempos['lambda'] - tempos['for']
+            # Define se o resultado foi positivo ou negativo visualmente
+            sinal = "+" if diff > 0 else ""
+            diferenca = f"{sinal}{diff:<14.4f}s"
+        else:
+            diferenca = '-'
         
         # Exibe a linha da tabela
-        print(f"{n:<15,} {tempos_for[i]:<15.4f} {tempos_lambda[i]:<15.4f} {sinal}{diff:<14.4f}s")
\ No newline at end of file
+        print(f"{n:<15,} " + " ".join(f"{t:<16.4f}" for t in tempos.values()) + f" {diferenca}")
+
+    return medicoes
+
+def executar_isolado(nucleo=None, gc_modo='desligar', forcar=False):
+    """
+    Comparacao no modo isolado: processo preso a um nucleo, GC controlado em
+    cada amostra e marcas de interferencia (trocas de contexto, GC,
+    frequencia) em todas as amostras. As ruidosas ficam fora do ajuste.
+    """
+    anterior = fixar_cpu(nucleo)
+    try:
+        estado = estado_cpu()
+        print("="*60)
+        print(f"MODO ISOLADO: nucleo {estado['nucleo']} | GC: {gc_modo}")
+        print(f"Governador: {estado['governador'] or 'indisponivel'} | "
+              f"Frequencia: {estado['freq_khz'] or '-'} kHz "
+              f"(min {estado['freq_min_khz'] or '-'}, max {estado['freq_max_khz'] or '-'})")
+        if estado['governador'] not in (None, 'performance'):
+            print(f"[AVISO] Governador '{estado['governador']}': a frequencia pode variar entre amostras")
+        # Estado da CPU de cada celula vai para resultados.json (runs ruidosos)
+        return executar_comparacao(forcar, opcoes=dict(gc_modo=gc_modo, qualidade=True),
+                                   anotar=lambda: dict(estado_cpu(), gc_modo=gc_modo))
+    finally:
+        restaurar_cpu(anterior)
+
+def executar_matriz(n, nomes=None, forcar=False):
+    """
+    Mede os motores registrados (ou 'nomes', separados por virgula) em cada
+    distribuicao x conteiner de entradas.py e imprime uma matriz por motor,
+    mais a matriz de vencedor For vs Lambda.
+    """
+    motores = motores_para('list')
+    if nomes:
+        motores = {nome: MOTORES[nome] for nome in nomes.split(',')}
+
+    print("="*60)
+    print(f"MATRIZ DE ENTRADAS: {', '.join(motores)} (N={n:,})")
+    print("="*60)
+    matriz = medir_matriz(motores, n, forcar=forcar, aquecimento=1, min_repeticoes=3,
+                          max_repeticoes=15, tempo_max_s=5.0)
+    imprimir_matriz(matriz, n)
+    imprimir_vencedor(matriz)
+    return matriz
+
+def executar_predicados(n):
+    """
+    Compara os caminhos especializados de predicados.py com a lambda em
+    cada predicado padrao x entrada (range, list, ndarray).
+    """
+    linhas = medir_predicados(n, aquecimento=1, min_repeticoes=3, max_repeticoes=15,
+                              tempo_max_s=5.0)
+    imprimir_predicados(linhas, n)
+    return linhas
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    
+    parser = argparse.ArgumentParser(description="Benchmark For Loop vs Lambda vs NumPy")
+    parser.add_argument('--streaming', action='store_true',
+                        help="modo em fluxo (blocos de tamanho fixo, memoria constante)")
+    parser.add_argument('--ate', type=float, default=1e9,
+                        help="maior N da varredura em fluxo (padrao: 1e9)")
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO,
+                        help="elementos por bloco no modo em fluxo")
+    parser.add_argument('--compartilhado', choices=('shm', 'mmap'),
+                        help="gera os dados em memoria compartilhada (shm) ou arquivo mapeado (mmap)")
+    parser.add_argument('--trabalhadores', type=int, default=os.cpu_count(),
+                        help="processos do modo --compartilhado")
+    parser.add_argument('--matriz', action='store_true',
+                        help="matriz de distribuicoes x conteineres por motor (ver entradas.py)")
+    parser.add_argument('--n-matriz', type=int, default=10**5,
+                        help="N de cada celula da matriz")
+    parser.add_argument('--motores', default=None,
+                        help="motores da matriz, separados por virgula (padrao: todos)")
+    parser.add_argument('--predicados', action='store_true',
+                        help="caminhos especializados do filtro generico vs lambda (ver predicados.py)")
+    parser.add_argument('--n-predicados', type=int, default=10**5,
+                        help="N do modo --predicados")
+    parser.add_argument('--incremental', action='store_true',
+                        help="varredura completa vs filtro incremental por taxa de acrescimo (ver incremental.py)")
+    parser.add_argument('--n-incremental', type=int, default=10**6,
+                        help="N inicial do modo --incremental")
+    parser.add_argument('--remocoes', type=int, default=0,
+                        help="posicoes removidas antes de cada consulta no modo --incremental")
+    parser.add_argument('--isolado', action='store_true',
+                        help="fixa a CPU, controla o GC e marca amostras ruidosas (ver isolamento.py)")
+    parser.add_argument('--nucleo', type=int, default=None,
+                        help="nucleo do modo --isolado (padrao: o ultimo permitido)")
+    parser.add_argument('--gc', choices=('desligar', 'coletar'), default='desligar',
+                        help="GC no modo --isolado: desligado ou coletado antes de cada amostra")
+    parser.add_argument('--forcar', '--force', action='store_true',
+                        help="ignora o cache e mede todas as celulas novamente")
+    args = parser.parse_args()
+    
+    if args.matriz:
+        executar_matriz(args.n_matriz, args.motores, args.forcar)
+        sys.exit(0)
+
+    if args.predicados:
+        executar_predicados(args.n_predicados)
+        sys.exit(0)
+
+    if args.incremental:
+        imprimir_incremental(args.n_incremental, remocoes=args.remocoes)
+        sys.exit(0)
+
+    secao = 'motores'
+    if args.streaming:
+        # Pseudo-motores em fluxo: secao propria, fora das analises de todos os motores
+        medicoes = executar_streaming(int(args.ate), args.bloco)
+        tipo_entrada, secao = 'blocos', 'streaming'
+    elif args.isolado:
+        medicoes = executar_isolado(args.nucleo, args.gc, args.forcar)
+        tipo_entrada = 'list'
+    elif args.compartilhado:
+        # Multiprocesso (buffer compartilhado x lista serializada): secao propria
+        medicoes = executar_compartilhado(args.compartilhado, args.trabalhadores)
+        tipo_entrada = {f'compartilhado_{args.compartilhado}': args.compartilhado,
+                        'paralelo_lista': 'list'}
+        secao = 'compartilhado'
+    else:
+        medicoes = executar_comparacao(args.forcar)
+        tipo_entrada = 'list'
+
+    # --- Persistencia (alimenta os scripts de analise) ---
+    chave = salvar_medicoes(medicoes, secao=secao, tipo_entrada=tipo_entrada)
+    print(f"\nResultados gravados em resultados.json (execucao '{chave}')")
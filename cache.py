@@ -0,0 +1,233 @@
+import hashlib
+import inspect
+import json
+import os
+import platform
+import time
+
+# ============================================================================
+#  PROJETO: CACHE PERSISTENTE DE MEDICOES
+# ============================================================================
+#  Evita remedir celulas (motor, N, tipo de entrada) que nao mudaram.
+#
+#  Chave de cada celula = SHA-256 de:
+#  - codigo-fonte do motor (ou bytecode, se a fonte nao estiver disponivel)
+#    e a fonte dos modulos do projeto de que ele depende diretamente (o
+#    seu proprio modulo e os das funcoes globais/closures que ele chama);
+#  - N e tipo de entrada;
+#  - versao/implementacao do Python e modelo da CPU;
+#  - opcoes da medicao (aquecimento, repeticoes, confianca...).
+#
+#  Politica de expiracao:
+#  - entradas mais velhas que 'idade_max_s' sao descartadas;
+#  - acima de 'max_entradas', remove as menos usadas recentemente (LRU).
+#
+#  Arquivo: cache_medicoes.json (um unico JSON versionado).
+# ============================================================================
+
+VERSAO = 1
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_PADRAO = os.path.join(DIRETORIO, 'cache_medicoes.json')
+IDADE_MAX_S = 7 * 24 * 3600
+MAX_ENTRADAS = 1000
+
+
+def modelo_cpu():
+    """
+    Nome do processador (/proc/cpuinfo no Linux, platform.processor() fora dele).
+    """
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            for linha in f:
+                if linha.startswith('model name'):
+                    return linha.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def arquivo_projeto(objeto):
+    """
+    Caminho do arquivo-fonte de 'objeto' (funcao, classe ou modulo) se ele
+    for do projeto (dentro de DIRETORIO), senao None.
+    """
+    try:
+        arquivo = inspect.getsourcefile(objeto)
+    except TypeError:
+        return None
+    if arquivo and os.path.abspath(arquivo).startswith(DIRETORIO + os.sep):
+        return os.path.abspath(arquivo)
+    return None
+
+
+def arquivos_modulo(modulo):
+    """
+    Arquivos-fonte do projeto de que o modulo depende diretamente: ele
+    mesmo e os modulos de onde vem os seus nomes globais (imports).
+    """
+    arquivos = {arquivo_projeto(modulo)}
+    for objeto in vars(modulo).values():
+        if inspect.isfunction(objeto) or inspect.isclass(objeto) or inspect.ismodule(objeto):
+            arquivos.add(arquivo_projeto(objeto))
+    return sorted(a for a in arquivos if a)
+
+
+def hash_arquivos(arquivos, h=None):
+    """
+    Acrescenta ao hash 'h' (novo SHA-256 se None) o nome e o conteudo de
+    cada arquivo e o devolve.
+    """
+    h = h or hashlib.sha256()
+    for arquivo in arquivos:
+        with open(arquivo, 'rb') as f:
+            h.update(os.path.basename(arquivo).encode('utf-8') + b'\0' + f.read())
+    return h
+
+
+def arquivos_dependencias(funcao):
+    """
+    Arquivos-fonte do projeto de que o motor depende diretamente: o modulo
+    onde ele esta e os modulos das funcoes/classes/modulos globais que ele
+    (ou uma lambda interna) referencia. Funcoes guardadas em closure (motores
+    gerados, ex.: modos.generico) sao tratadas como parte do motor.
+    Bibliotecas fora de DIRETORIO ficam de fora (entram pela versao do Python).
+    """
+    arquivos = set()
+
+    def anotar(objeto):
+        arquivo = arquivo_projeto(objeto)
+        if arquivo:
+            arquivos.add(arquivo)
+
+    motores, vistos = [funcao], set()
+    while motores:
+        atual = motores.pop()
+        if id(atual) in vistos:
+            continue
+        vistos.add(id(atual))
+        anotar(atual)
+        if not inspect.isfunction(atual):
+            continue
+        globais = atual.__globals__
+        codigos = [atual.__code__]
+        while codigos:
+            codigo = codigos.pop()
+            for nome in codigo.co_names:
+                objeto = globais.get(nome)
+                if inspect.isfunction(objeto) or inspect.isclass(objeto) or inspect.ismodule(objeto):
+                    anotar(objeto)
+            codigos.extend(c for c in codigo.co_consts if inspect.iscode(c))
+        for celula in atual.__closure__ or ():
+            try:
+                conteudo = celula.cell_contents
+            except ValueError:
+                continue
+            if inspect.isfunction(conteudo):
+                motores.append(conteudo)
+    return sorted(arquivos)
+
+
+def hash_motor(funcao):
+    """
+    Hash do codigo do motor: fonte quando disponivel, senao o bytecode,
+    mais a fonte dos modulos de que ele depende (editar um auxiliar como
+    paralelo.numparesP tambem invalida as celulas do motor).
+    """
+    try:
+        conteudo = inspect.getsource(funcao).encode('utf-8')
+    except (OSError, TypeError):
+        codigo = funcao.__code__
+        conteudo = codigo.co_code + repr(codigo.co_consts).encode('utf-8')
+    return hash_arquivos(arquivos_dependencias(funcao), hashlib.sha256(conteudo)).hexdigest()
+
+
+def chave_celula(funcao, n, tipo_entrada, opcoes=None):
+    """
+    Chave estavel da celula (motor, N, entrada) no ambiente atual.
+    """
+    partes = {
+        'motor': hash_motor(funcao),
+        'n': n,
+        'entrada': tipo_entrada,
+        'python': platform.python_version(),
+        'implementacao': platform.python_implementation(),
+        'cpu': modelo_cpu(),
+        'opcoes': sorted((opcoes or {}).items()),
+    }
+    return hashlib.sha256(json.dumps(partes, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def abrir_cache(caminho=ARQUIVO_PADRAO):
+    """
+    Carrega o cache (vazio se nao existir ou se for de outra versao).
+    """
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        if dados.get('versao') == VERSAO:
+            dados['caminho'] = caminho
+            return dados
+    return {'versao': VERSAO, 'entradas': {}, 'caminho': caminho}
+
+
+def buscar(cache, chave, idade_max_s=IDADE_MAX_S):
+    """
+    Resumo guardado para 'chave', ou None se ausente ou expirado.
+    Um acerto atualiza o instante de uso (para o LRU).
+    """
+    entrada = cache['entradas'].get(chave)
+    if entrada is None:
+        return None
+    agora = time.time()
+    if agora - entrada['criado_em'] > idade_max_s:
+        del cache['entradas'][chave]
+        return None
+    entrada['usado_em'] = agora
+    return entrada['resumo']
+
+
+def guardar(cache, chave, resumo, rotulo=''):
+    """
+    Guarda o resumo de uma celula recem-medida.
+    """
+    agora = time.time()
+    cache['entradas'][chave] = {'resumo': resumo, 'rotulo': rotulo,
+                                'criado_em': agora, 'usado_em': agora}
+
+
+def fechar_cache(cache, max_entradas=MAX_ENTRADAS, idade_max_s=IDADE_MAX_S):
+    """
+    Aplica a expiracao por idade e o limite LRU, e grava o arquivo.
+    """
+    agora = time.time()
+    entradas = {c: e for c, e in cache['entradas'].items()
+                if agora - e['criado_em'] <= idade_max_s}
+    if len(entradas) > max_entradas:
+        recentes = sorted(entradas, key=lambda c: entradas[c]['usado_em'], reverse=True)
+        entradas = {c: entradas[c] for c in recentes[:max_entradas]}
+    cache['entradas'] = entradas
+
+    caminho = cache['caminho']
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO, 'entradas': entradas}, f, separators=(',', ':'))
+    os.replace(temporario, caminho)
+
+
+def medir_com_cache(cache, funcao, n, tipo_entrada, medir_celula, forcar=False,
+                    opcoes=None, rotulo=''):
+    """
+    Reaproveita a celula se estiver no cache; senao chama 'medir_celula()'
+    (que deve devolver um resumo serializavel) e guarda o resultado.
+
+    Devolve (resumo, veio_do_cache). Um resumo vindo do cache e uma copia
+    marcada com 'do_cache' (salvar_medicoes nao o repete no historico).
+    """
+    chave = chave_celula(funcao, n, tipo_entrada, opcoes)
+    if not forcar:
+        resumo = buscar(cache, chave)
+        if resumo is not None:
+            return dict(resumo, do_cache=True), True
+    resumo = medir_celula()
+    guardar(cache, chave, resumo, rotulo)
+    return resumo, False
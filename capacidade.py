@@ -0,0 +1,349 @@
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+
+from ajuste import ajustar, intervalo_predicao
+from isolamento import ler_sys
+from resultados import (ARQUIVO_PADRAO, DADOS_REFERENCIA, amostras_limpas, carregar, escolher_execucao,
+                        secao_entrada)
+
+# ============================================================================
+#  PROJETO: PLANEJAMENTO DE CAPACIDADE A PARTIR DO MODELO T(n)
+# ============================================================================
+#  analise_teorica.py desenha T(n) = a*n + b so entre os N medidos. Aqui o
+#  mesmo ajuste (WLS sobre todas as repeticoes de resultados.json) responde
+#  perguntas de dimensionamento, cada uma com intervalo de predicao:
+#
+#  - T(N) para os tamanhos de lote reais (--prever);
+#  - maior N que cabe num orcamento de latencia (--orcamento-ms): central
+#    e conservador (limite superior do intervalo abaixo do orcamento);
+#  - nucleos para sustentar X elementos/s (--vazao) em lotes de --lote
+#    elementos (padrao: o N conservador do orcamento), um processo por
+#    nucleo, sem disputa entre eles;
+#  - memoria por elemento (inclinacao de pico_bytes) e por lote.
+#
+#  O ruido de uma medicao cresce com N: a variancia de uma observacao nova
+#  e extrapolada pelo coeficiente de variacao mediano das repeticoes.
+#
+#  Quebras de cache: com os bytes por elemento (entrada + pico de memoria
+#  do motor), calcula o N em que o conjunto de trabalho passa de L2, L3
+#  (lidos de /sys) e da RAM. Onde ha N medidos dos dois lados, compara o
+#  custo por elemento antes e depois (quebra observada); respostas alem do
+#  maior N medido que atravessam um desses limites sao marcadas, porque a
+#  reta pode dobrar ali.
+# ============================================================================
+
+CONFIANCA_PADRAO = 0.95
+
+# Bytes por elemento da entrada: range nao materializa nada; lista guarda o
+# ponteiro e o objeto int
+BYTES_ENTRADA = {'range': 0, 'list': 8 + sys.getsizeof(10**6)}
+
+# Sem perfil de memoria: lista de saida (ponteiro + int) com metade dos
+# elementos passando no filtro
+BYTES_SAIDA_ESTIMADO = (8 + sys.getsizeof(10**6)) / 2
+
+# Variacao relativa do ns/elemento que conta como quebra observada
+LIMIAR_QUEBRA = 0.15
+
+# Piso do coeficiente de variacao (o mesmo de ajuste.empilhar_amostras)
+CV_MINIMO = 1e-3
+
+
+def tamanhos_cache(cpu=0):
+    """
+    Caches de dados da CPU em bytes, {'L1': ..., 'L2': ..., 'L3': ...}
+    (so os niveis que o kernel expoe).
+    """
+    caches = {}
+    base = f"/sys/devices/system/cpu/cpu{cpu}/cache"
+    for indice in sorted(os.listdir(base)) if os.path.isdir(base) else []:
+        tipo = ler_sys(os.path.join(base, indice, 'type'))
+        nivel = ler_sys(os.path.join(base, indice, 'level'))
+        tamanho = ler_sys(os.path.join(base, indice, 'size'))
+        if tipo in ('Data', 'Unified') and nivel and tamanho:
+            multiplicador = {'K': 1024, 'M': 1024**2, 'G': 1024**3}.get(tamanho[-1], 1)
+            caches[f"L{nivel}"] = int(tamanho.rstrip('KMG')) * multiplicador
+    return caches
+
+
+def memoria_total():
+    """
+    RAM total em bytes (/proc/meminfo), ou None.
+    """
+    try:
+        with open('/proc/meminfo', encoding='ascii') as f:
+            for linha in f:
+                if linha.startswith('MemTotal:'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def limites_memoria():
+    """
+    Niveis que dobram a reta: {'L2': bytes, 'L3': bytes, 'RAM': bytes}.
+    """
+    limites = {nivel: tamanho for nivel, tamanho in tamanhos_cache().items() if nivel != 'L1'}
+    ram = memoria_total()
+    if ram:
+        limites['RAM'] = ram
+    return limites
+
+
+# ============================================================================
+#  MODELO POR MOTOR
+# ============================================================================
+
+def coeficiente_variacao(amostras):
+    """
+    Coeficiente de variacao mediano das repeticoes de cada N.
+    """
+    cvs = []
+    for reps in amostras:
+        reps = np.atleast_1d(np.asarray(reps, dtype=float))
+        cv = reps.std(ddof=1) / reps.mean() if reps.size > 1 and reps.mean() > 0 else 0.0
+        cvs.append(max(cv, CV_MINIMO))
+    return float(np.median(cvs))
+
+
+def bytes_por_elemento(serie, tipo_entrada='range'):
+    """
+    Conjunto de trabalho por elemento: entrada + inclinacao de pico_bytes
+    (ou BYTES_SAIDA_ESTIMADO sem perfil de memoria). Devolve (bytes, estimado).
+    """
+    picos = [(n, p) for n, p in zip(serie['n'], serie.get('pico_bytes') or []) if p is not None]
+    estimado = len(picos) < 2
+    saida = (BYTES_SAIDA_ESTIMADO if estimado
+             else ajustar([n for n, _ in picos], [p for _, p in picos], 'linear')['a'])
+    return BYTES_ENTRADA.get(tipo_entrada, 0) + max(saida, 0.0), estimado
+
+
+def modelo_motor(serie, tipo_entrada='range'):
+    """
+    Ajuste WLS de T(n), ruido relativo, bytes por elemento e ns/elemento
+    medido de uma serie de resultados.json.
+    """
+    amostras = amostras_limpas(serie) or serie['mediana_ms']
+    n = serie['n']
+    modelo = {'ajuste': ajustar(n, amostras, 'linear', ponderado=True),
+              'cv': coeficiente_variacao(amostras), 'n_max': max(n),
+              'n': list(n), 'ns_elem': [m * 1e6 / ni for m, ni in zip(serie['mediana_ms'], n)]}
+    modelo['bytes_elem'], modelo['bytes_estimado'] = bytes_por_elemento(serie, tipo_entrada)
+    return modelo
+
+
+def modelos_de(fonte, motores=None, tipo_entrada='range'):
+    """
+    {motor: modelo} dos motores de 'fonte' com pelo menos 3 N (sem graus de
+    liberdade, nao ha intervalo).
+    """
+    return {nome: modelo_motor(serie, tipo_entrada) for nome, serie in fonte.items()
+            if (motores is None or nome in motores) and len(serie['n']) >= 3}
+
+
+def carregar_modelos(motores=None, caminho=ARQUIVO_PADRAO, tipo_entrada='range'):
+    """
+    {motor: modelo} da execucao do ambiente atual, so das series medidas com
+    'tipo_entrada' (range e list nao se misturam). Um motor medido em menos
+    de 3 N cai nos dados de referencia, se eles tiverem o motor; sem
+    execucao (ou sem nenhum modelo utilizavel nela), vale a referencia toda.
+    """
+    execucao = escolher_execucao(carregar(caminho))
+    medidos = execucao.get(secao_entrada(tipo_entrada), {}) if execucao else {}
+    modelos = modelos_de(medidos, motores, tipo_entrada)
+    curtos = [nome for nome in medidos if nome not in modelos and (motores is None or nome in motores)]
+    referencia = modelos_de(DADOS_REFERENCIA, motores, tipo_entrada)
+
+    if not modelos:
+        motivo = "Sem resultados medidos" if execucao is None else "Nenhum motor com 3 ou mais N"
+        print(f"[AVISO] {motivo} em {caminho}; usando dados de referencia.")
+        return referencia
+    trocados = [nome for nome in curtos if nome in referencia]
+    for nome in trocados:
+        modelos[nome] = referencia[nome]
+    if trocados:
+        print(f"[AVISO] Menos de 3 valores de N medidos para {', '.join(trocados)}; "
+              f"usando dados de referencia.")
+    return modelos
+
+
+# ============================================================================
+#  PERGUNTAS DE CAPACIDADE
+# ============================================================================
+
+def prever_tempo(modelo, n, confianca=CONFIANCA_PADRAO):
+    """
+    T(n) em ms com intervalo de predicao: (centro, baixo, alto).
+    """
+    ajuste = modelo['ajuste']
+    centro = np.maximum(np.asarray(ajuste['a'] * np.asarray(n, dtype=float) + ajuste['b']), 0.0)
+    variancia_obs = ajuste['sigma2'] * (modelo['cv'] * centro) ** 2
+    centro, baixo, alto = intervalo_predicao(ajuste, n, confianca, variancia_obs)
+    return centro, np.maximum(baixo, 0.0), alto
+
+
+def n_maximo(modelo, orcamento_ms, confianca=CONFIANCA_PADRAO):
+    """
+    Maior N dentro do orcamento: (central, conservador). O conservador e o
+    maior N cujo limite superior do intervalo ainda cabe no orcamento.
+    """
+    a, b = modelo['ajuste']['a'], modelo['ajuste']['b']
+    if a <= 0:
+        return math.inf, math.inf
+    central = max(int((orcamento_ms - b) / a), 0)
+    # O limite superior cresce com N: busca binaria em [0, central]
+    baixo, alto = 0, central
+    while baixo < alto:
+        meio = (baixo + alto + 1) // 2
+        if float(prever_tempo(modelo, meio, confianca)[2]) <= orcamento_ms:
+            baixo = meio
+        else:
+            alto = meio - 1
+    return central, baixo
+
+
+def nucleos_para(modelo, vazao, lote, confianca=CONFIANCA_PADRAO):
+    """
+    Nucleos para processar 'vazao' elementos/s em lotes de 'lote':
+    (central, conservador), um processo por nucleo.
+    """
+    centro, _, alto = prever_tempo(modelo, lote, confianca)
+    return (math.ceil(vazao * float(centro) / 1e3 / lote),
+            math.ceil(vazao * float(alto) / 1e3 / lote))
+
+
+def pontos_quebra(modelo, limites):
+    """
+    N em que o conjunto de trabalho passa de cada limite e, quando ha N
+    medidos dos dois lados, a razao do ns/elemento (depois / antes).
+    """
+    quebras = []
+    for nivel, tamanho in limites.items():
+        n_limite = int(tamanho / modelo['bytes_elem']) if modelo['bytes_elem'] > 0 else None
+        antes = [c for n, c in zip(modelo['n'], modelo['ns_elem']) if n_limite and n < n_limite]
+        depois = [c for n, c in zip(modelo['n'], modelo['ns_elem']) if n_limite and n >= n_limite]
+        razao = float(np.median(depois) / np.median(antes)) if antes and depois else None
+        quebras.append({'nivel': nivel, 'bytes': tamanho, 'n': n_limite, 'razao': razao,
+                        'observada': razao is not None and abs(razao - 1) > LIMIAR_QUEBRA})
+    return quebras
+
+
+def avisos(modelo, n, quebras):
+    """
+    Ressalvas de uma resposta em N: extrapolacao que atravessa um limite de
+    cache/RAM nao coberto pelas medicoes, ou que nao cabe na RAM.
+    """
+    ressalvas = []
+    for quebra in quebras:
+        if quebra['n'] is None or n < quebra['n']:
+            continue
+        if quebra['nivel'] == 'RAM':
+            ressalvas.append("nao cabe na RAM")
+        elif quebra['n'] > modelo['n_max']:
+            ressalvas.append(f"passa de {quebra['nivel']} alem do maior N medido")
+    if n > modelo['n_max'] and not ressalvas:
+        ressalvas.append(f"extrapolado ({n / modelo['n_max']:.0f}x o maior N medido)")
+    return ressalvas
+
+
+# ============================================================================
+#  RELATORIO
+# ============================================================================
+
+def formatar_n(n):
+    return '-' if n is None else ('inf' if n == math.inf else f"{n:,}")
+
+
+def imprimir_capacidade(modelos, orcamento_ms=None, vazao=None, lote=None, prever=(),
+                        confianca=CONFIANCA_PADRAO):
+    """
+    Relatorio de capacidade de cada motor (custos, perguntas e quebras).
+    """
+    limites = limites_memoria()
+    nivel_ic = f"IP {confianca:.0%}"
+    print("=" * 100)
+    print(f"PLANEJAMENTO DE CAPACIDADE (intervalos de predicao de {confianca:.0%}; * = bytes estimados)")
+    print("=" * 100)
+    print("Limites: " + ', '.join(f"{nivel} = {tamanho / 1024**2:,.1f} MiB" for nivel, tamanho in limites.items()))
+    print(f"\n{'Motor':<13} {'ns/elem':<10} {'IC 95%':<19} {'B/elem':<9} {'Maior N medido':<16} {'CV':<6}")
+    print("-" * 100)
+    for nome, modelo in modelos.items():
+        a, ic_a = modelo['ajuste']['a'], modelo['ajuste']['ic_a']
+        print(f"{nome:<13} {a * 1e6:<10.2f} {f'{ic_a[0] * 1e6:.2f} .. {ic_a[1] * 1e6:.2f}':<19} "
+              f"{modelo['bytes_elem']:<8.1f}{'*' if modelo['bytes_estimado'] else ' '} "
+              f"{modelo['n_max']:<16,} {modelo['cv']:<6.1%}")
+
+    quebras = {nome: pontos_quebra(modelo, limites) for nome, modelo in modelos.items()}
+
+    for n in prever:
+        print(f"\n--- T(N) para N = {n:,} ({nivel_ic}) ---")
+        for nome, modelo in modelos.items():
+            centro, baixo, alto = (float(v) for v in prever_tempo(modelo, n, confianca))
+            memoria = modelo['bytes_elem'] * n / 1024**2
+            ressalvas = '; '.join(avisos(modelo, n, quebras[nome]))
+            print(f"{nome:<13} {centro:>12,.1f} ms  [{baixo:,.1f} .. {alto:,.1f}]  "
+                  f"{memoria:>10,.1f} MiB  {ressalvas}")
+
+    if orcamento_ms is not None:
+        print(f"\n--- Maior N em {orcamento_ms:g} ms (central / conservador pelo {nivel_ic}) ---")
+        for nome, modelo in modelos.items():
+            central, conservador = n_maximo(modelo, orcamento_ms, confianca)
+            ressalvas = '; '.join(avisos(modelo, central, quebras[nome])) if central != math.inf else ''
+            print(f"{nome:<13} {formatar_n(central):>16} / {formatar_n(conservador):<16} {ressalvas}")
+
+    if vazao is not None:
+        print(f"\n--- Nucleos para {vazao:,.0f} elementos/s ---")
+        for nome, modelo in modelos.items():
+            tamanho = lote or (n_maximo(modelo, orcamento_ms, confianca)[1] if orcamento_ms else modelo['n_max'])
+            if not tamanho or tamanho == math.inf:
+                print(f"{nome:<13} sem lote valido (orcamento menor que o custo fixo)")
+                continue
+            central, conservador = nucleos_para(modelo, vazao, tamanho, confianca)
+            memoria = modelo['bytes_elem'] * tamanho / 1024**2
+            print(f"{nome:<13} lote {tamanho:<14,} {central:>6} nucleos (conservador: {conservador})  "
+                  f"{memoria:,.1f} MiB por nucleo")
+
+    print("\n--- Quebras de cache (N em que o conjunto de trabalho passa do limite) ---")
+    for nome, lista in quebras.items():
+        partes = []
+        for q in lista:
+            if q['razao'] is None:
+                estado = 'sem medicoes dos dois lados'
+            else:
+                estado = f"{'[!] quebra observada' if q['observada'] else 'reta mantida'}: {q['razao']:.2f}x ns/elem"
+            partes.append(f"{q['nivel']} em N = {formatar_n(q['n'])} ({estado})")
+        print(f"{nome:<13} " + '\n              '.join(partes))
+    print("=" * 100)
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Planejamento de capacidade a partir do ajuste T(n)")
+    parser.add_argument('--orcamento-ms', type=float, default=None,
+                        help="orcamento de latencia por lote (maior N que cabe)")
+    parser.add_argument('--vazao', type=float, default=None,
+                        help="elementos/s a sustentar (nucleos necessarios)")
+    parser.add_argument('--lote', type=float, default=None,
+                        help="elementos por lote para --vazao (padrao: N conservador do orcamento)")
+    parser.add_argument('--prever', default='',
+                        help="tamanhos de lote para prever T(N), separados por virgula (ex.: 1e8,1e9)")
+    parser.add_argument('--motores', default=None, help="motores separados por virgula (padrao: todos)")
+    parser.add_argument('--entrada', choices=sorted(BYTES_ENTRADA), default='range',
+                        help="tipo de entrada das series usadas (e dos bytes por elemento)")
+    parser.add_argument('--confianca', type=float, default=CONFIANCA_PADRAO)
+    parser.add_argument('--arquivo', default=ARQUIVO_PADRAO, help="resultados.json de origem")
+    args = parser.parse_args()
+
+    modelos = carregar_modelos(args.motores.split(',') if args.motores else None, args.arquivo, args.entrada)
+    if not modelos:
+        parser.error("nenhum motor com pelo menos 3 valores de N medidos")
+    imprimir_capacidade(modelos, args.orcamento_ms, args.vazao, int(args.lote) if args.lote else None,
+                        [int(float(v)) for v in args.prever.split(',') if v], args.confianca)
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+# ============================================================================
+#  PROJETO: HISTORICO COLUNAR DAS AMOSTRAS (SO ACRESCIMO)
+# ============================================================================
+#  resultados.json guarda o estado atual de cada execucao; o historico de
+#  todas as repeticoes (toda maquina, motor, entrada, N e gravacao) cresce
+#  para centenas de milhares de amostras e nao cabe bem em listas Python.
+#  Aqui cada amostra e uma linha de um formato colunar binario:
+#
+#  resultados_colunar/
+#    indice.json        versao, numero de linhas, dtype de cada coluna e os
+#                       dicionarios das colunas categoricas (codigo -> nome)
+#    <coluna>.bin       valores crus da coluna (ndarray.tofile), em ordem
+#
+#  Colunas: execucao, motor, entrada (codigos int32), n (int64), repeticao
+#  (int32), amostra_ns (int64), ruidosa (bool), gravado_em (float64, epoch).
+#
+#  - Acrescimo: os .bin recebem as novas linhas no final e so depois o
+#    indice.json (escrita atomica) passa a conta-las. Uma gravacao
+#    interrompida deixa bytes alem de 'linhas', ignorados na leitura e
+#    cortados na proxima gravacao.
+#  - Leitura: np.memmap de cada coluna (sem copiar o arquivo para a memoria).
+#  - Agregacao: group-by vetorizado (np.unique + lexsort + reduceat), sem
+#    laco Python por amostra.
+#
+#  salvar_medicoes (resultados.py) acrescenta aqui cada lote medido;
+#  'python colunar.py --importar' traz o historico de um resultados.json.
+# ============================================================================
+
+VERSAO = 1
+INDICE = 'indice.json'
+
+COLUNAS = {'execucao': 'int32', 'motor': 'int32', 'entrada': 'int32', 'n': 'int64',
+           'repeticao': 'int32', 'amostra_ns': 'int64', 'ruidosa': 'bool', 'gravado_em': 'float64'}
+CATEGORICAS = ('execucao', 'motor', 'entrada')
+
+
+def diretorio_de(caminho_json):
+    """
+    Diretorio colunar que acompanha um resultados.json (mesmo nome + _colunar).
+    """
+    return os.path.splitext(caminho_json)[0] + '_colunar'
+
+
+def ler_indice(diretorio):
+    """
+    Indice do armazenamento (vazio se ainda nao existir).
+    """
+    caminho = os.path.join(diretorio, INDICE)
+    if not os.path.exists(caminho):
+        return {'versao': VERSAO, 'linhas': 0, 'colunas': dict(COLUNAS),
+                'dicionarios': {c: [] for c in CATEGORICAS}}
+    with open(caminho, encoding='utf-8') as f:
+        indice = json.load(f)
+    if indice.get('versao') != VERSAO:
+        raise ValueError(f"{caminho}: versao {indice.get('versao')} nao suportada (esperado {VERSAO})")
+    return indice
+
+
+def gravar_indice(diretorio, indice):
+    """
+    Escrita atomica do indice (o que torna as linhas novas visiveis).
+    """
+    caminho = os.path.join(diretorio, INDICE)
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(indice, f)
+    os.replace(caminho + '.tmp', caminho)
+
+
+def codificar(indice, coluna, valor):
+    """
+    Codigo int do valor categorico (acrescenta ao dicionario se for novo).
+    """
+    dicionario = indice['dicionarios'][coluna]
+    if valor not in dicionario:
+        dicionario.append(valor)
+    return dicionario.index(valor)
+
+
+def anexar(medicoes, execucao, diretorio, tipo_entrada='range'):
+    """
+    Acrescenta todas as amostras de {(motor, n): resumo} (formato de
+    medicao.py) como linhas novas. Devolve o numero de linhas gravadas.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    indice = ler_indice(diretorio)
+    agora = time.time()
+    codigo_execucao = codificar(indice, 'execucao', execucao)
+    codigo_entrada = codificar(indice, 'entrada', tipo_entrada)
+
+    partes = {coluna: [] for coluna in COLUNAS}
+    for (motor, n), resumo in medicoes.items():
+        amostras = resumo.get('amostras_ns') or []
+        k = len(amostras)
+        ruidosas = [q['ruidosa'] for q in resumo['qualidade']] if 'qualidade' in resumo else [False] * k
+        partes['execucao'].append(np.full(k, codigo_execucao))
+        partes['motor'].append(np.full(k, codificar(indice, 'motor', motor)))
+        partes['entrada'].append(np.full(k, codigo_entrada))
+        partes['n'].append(np.full(k, n))
+        partes['repeticao'].append(np.arange(k))
+        partes['amostra_ns'].append(np.asarray(amostras))
+        partes['ruidosa'].append(np.asarray(ruidosas, dtype=bool))
+        partes['gravado_em'].append(np.full(k, agora))
+
+    novas = sum(len(p) for p in partes['n'])
+    if novas == 0:
+        return 0
+    for coluna, dtype in indice['colunas'].items():
+        caminho = os.path.join(diretorio, f"{coluna}.bin")
+        tamanho = indice['linhas'] * np.dtype(dtype).itemsize
+        with open(caminho, 'ab') as f:
+            f.truncate(tamanho)         # Descarta restos de uma gravacao interrompida
+            np.concatenate(partes[coluna]).astype(dtype).tofile(f)
+    indice['linhas'] += novas
+    gravar_indice(diretorio, indice)
+    return novas
+
+
+def abrir(diretorio):
+    """
+    Colunas mapeadas em memoria: ({coluna: np.memmap}, indice). Sem
+    armazenamento, devolve ({}, indice vazio).
+    """
+    indice = ler_indice(diretorio)
+    if indice['linhas'] == 0:
+        return {}, indice
+    colunas = {coluna: np.memmap(os.path.join(diretorio, f"{coluna}.bin"), dtype=dtype,
+                                 mode='r', shape=(indice['linhas'],))
+               for coluna, dtype in indice['colunas'].items()}
+    return colunas, indice
+
+
+def agrupar(colunas, chaves=('execucao', 'motor', 'entrada', 'n'), mascara=None):
+    """
+    Group-by vetorizado de amostra_ns pelas colunas 'chaves'. Devolve um
+    dicionario de vetores alinhados (um elemento por grupo): as chaves,
+    'contagem', 'mediana_ms', 'media_ms', 'min_ms' e 'p95_ms'.
+    """
+    valores = np.asarray(colunas['amostra_ns'])
+    campos = [np.asarray(colunas[c]) for c in chaves]
+    if mascara is not None:
+        valores, campos = valores[mascara], [campo[mascara] for campo in campos]
+    if valores.size == 0:
+        return {c: np.empty(0, dtype=np.int64) for c in chaves + ('contagem',)}
+
+    # Cada chave vira um codigo denso; as chaves juntas, um unico int64
+    distintos, codigos = zip(*(np.unique(campo, return_inverse=True) for campo in campos))
+    dimensoes = tuple(len(d) for d in distintos)
+    grupos, rotulo = np.unique(np.ravel_multi_index(codigos, dimensoes), return_inverse=True)
+    por_chave = np.unravel_index(grupos, dimensoes)
+
+    # Ordena por grupo e, dentro dele, por valor: cada grupo vira uma fatia ordenada
+    ordem = np.lexsort((valores, rotulo))
+    ordenados = valores[ordem] / 1e6
+    contagem = np.bincount(rotulo, minlength=len(grupos))
+    inicio = np.concatenate(([0], np.cumsum(contagem)[:-1]))
+
+    baixo = inicio + (contagem - 1) // 2
+    alto = inicio + contagem // 2
+    p95 = inicio + np.ceil(0.95 * contagem).astype(np.int64) - 1     # Posto mais proximo
+    resultado = {c: d[i] for c, d, i in zip(chaves, distintos, por_chave)}
+    resultado.update({
+        'contagem': contagem,
+        'mediana_ms': (ordenados[baixo] + ordenados[alto]) / 2,
+        'media_ms': np.add.reduceat(ordenados, inicio) / contagem,
+        'min_ms': ordenados[inicio],
+        'p95_ms': ordenados[p95],
+    })
+    return resultado
+
+
+def resumo_historico(diretorio, incluir_ruidosas=False):
+    """
+    Uma linha por (execucao, motor, entrada, N) com as estatisticas de todas
+    as amostras gravadas, em listas (serializavel para os relatorios):
+    {'linhas': [...], 'amostras': total}. Amostras ruidosas ficam de fora.
+    """
+    colunas, indice = abrir(diretorio)
+    if not colunas:
+        return {'linhas': [], 'amostras': 0}
+    mascara = None if incluir_ruidosas else ~np.asarray(colunas['ruidosa'])
+    grupos = agrupar(colunas, mascara=mascara)
+    nomes = indice['dicionarios']
+    linhas = []
+    for i in range(len(grupos['contagem'])):
+        linha = {c: nomes[c][int(grupos[c][i])] for c in CATEGORICAS}
+        linha['n'] = int(grupos['n'][i])
+        linha['contagem'] = int(grupos['contagem'][i])
+        for campo in ('mediana_ms', 'media_ms', 'min_ms', 'p95_ms'):
+            linha[campo] = float(grupos[campo][i])
+        linhas.append(linha)
+    return {'linhas': linhas, 'amostras': indice['linhas']}
+
+
+def importar_json(caminho_json, diretorio):
+    """
+    Acrescenta todas as amostras (amostras_ms) de um resultados.json.
+    Devolve o numero de linhas gravadas.
+    """
+    from resultados import carregar, secoes_motores
+
+    total = 0
+    for chave, execucao in carregar(caminho_json)['execucoes'].items():
+        for tipo, series in secoes_motores(execucao).items():
+            medicoes = {}
+            for motor, serie in series.items():
+                amostras = serie.get('amostras_ms') or [None] * len(serie['n'])
+                ruidosas = serie.get('ruidosas') or [None] * len(serie['n'])
+                for n, reps, marcas in zip(serie['n'], amostras, ruidosas):
+                    if not reps:
+                        continue
+                    resumo = {'amostras_ns': [int(round(a * 1e6)) for a in reps]}
+                    if marcas:
+                        resumo['qualidade'] = [{'ruidosa': bool(m)} for m in marcas]
+                    medicoes[(motor, n)] = resumo
+            total += anexar(medicoes, chave, diretorio, tipo)
+    return total
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    from resultados import ARQUIVO_PADRAO
+
+    parser = argparse.ArgumentParser(description="Historico colunar das amostras do benchmark")
+    parser.add_argument('--diretorio', default=diretorio_de(ARQUIVO_PADRAO),
+                        help="diretorio do armazenamento (padrao: resultados_colunar/)")
+    parser.add_argument('--importar', metavar='JSON', default=None,
+                        help="acrescenta as amostras de um resultados.json ao historico")
+    args = parser.parse_args()
+
+    if args.importar:
+        print(f"Importadas {importar_json(args.importar, args.diretorio):,} amostras de {args.importar}")
+
+    inicio = time.perf_counter()
+    historico = resumo_historico(args.diretorio)
+    decorrido_ms = (time.perf_counter() - inicio) * 1e3
+    print("=" * 100)
+    print(f"HISTORICO COLUNAR: {historico['amostras']:,} amostras, {len(historico['linhas'])} grupos "
+          f"(agregado em {decorrido_ms:.1f} ms)")
+    print("=" * 100)
+    print(f"{'Execucao':<24} {'Motor':<12} {'Entrada':<8} {'N':<14} {'Amostras':<9} "
+          f"{'Mediana (ms)':<13} {'p95 (ms)':<10} {'ns/elem':<8}")
+    print("-" * 100)
+    for l in historico['linhas']:
+        print(f"{l['execucao']:<24} {l['motor']:<12} {l['entrada']:<8} {l['n']:<14,} {l['contagem']:<9} "
+              f"{l['mediana_ms']:<13.3f} {l['p95_ms']:<10.3f} {l['mediana_ms'] * 1e6 / l['n']:<8.2f}")
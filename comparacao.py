@@ -0,0 +1,206 @@
+import argparse
+import math
+import random
+import statistics
+import sys
+from statistics import NormalDist
+
+from medicao import percentil
+from resultados import ARQUIVO_PADRAO, amostras_limpas, carregar, escolher_execucao, secoes_motores
+
+# ============================================================================
+#  PROJETO: DETECCAO DE REGRESSOES DE DESEMPENHO
+# ============================================================================
+#  Compara dois conjuntos de resultados (dois arquivos resultados.json, ou
+#  duas execucoes "host|python" do mesmo arquivo) celula a celula
+#  (motor, N), usando as repeticoes brutas (amostras_ms):
+#
+#  - Mann-Whitney U (aproximacao normal com correcao de empates e de
+#    continuidade): p unilateral de a nova execucao ser mais lenta/rapida.
+#  - Bootstrap: IC 95% da razao de medianas nova/base (reamostragem com
+#    reposicao, semente fixa).
+#
+#  Uma celula e REGRESSAO quando a razao passa de 1 + limiar e o teste
+#  escolhido confirma (p < alfa no Mann-Whitney, ou IC do bootstrap todo
+#  acima de 1). Com alguma regressao, o processo sai com codigo 1 (para
+#  barrar o CI); sem regressoes, codigo 0.
+# ============================================================================
+
+LIMIAR_PADRAO = 0.05        # 5% mais lento
+ALFA_PADRAO = 0.05
+REAMOSTRAS = 2000
+TESTES = ('bootstrap', 'mannwhitney')
+
+CODIGO_REGRESSAO = 1
+
+
+def mann_whitney(base, nova):
+    """
+    Teste U de Mann-Whitney (aproximacao normal). Devolve (p_mais_lenta,
+    p_mais_rapida): p unilaterais de 'nova' ser estocasticamente maior
+    (mais lenta) ou menor (mais rapida) que 'base'.
+    """
+    n1, n2 = len(base), len(nova)
+    combinados = sorted([(v, 0) for v in base] + [(v, 1) for v in nova])
+    total = len(combinados)
+
+    # Postos medios nos empates; acumula sum(t^3 - t) para a variancia
+    postos = [0.0] * total
+    empates = 0.0
+    i = 0
+    while i < total:
+        j = i
+        while j + 1 < total and combinados[j + 1][0] == combinados[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            postos[k] = (i + j) / 2 + 1
+        empates += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    u = sum(p for p, (_, grupo) in zip(postos, combinados) if grupo == 1) - n2 * (n2 + 1) / 2
+    media = n1 * n2 / 2
+    variancia = n1 * n2 / 12 * ((total + 1) - empates / (total * (total - 1)))
+    if variancia <= 0:
+        return 0.5, 0.5
+    desvio = math.sqrt(variancia)
+    normal = NormalDist()
+    return (1 - normal.cdf((u - media - 0.5) / desvio),
+            normal.cdf((u - media + 0.5) / desvio))
+
+
+def bootstrap_razao(base, nova, reamostras=REAMOSTRAS, confianca=0.95, semente=0):
+    """
+    IC da razao mediana(nova) / mediana(base) por bootstrap percentil.
+    """
+    rng = random.Random(semente)
+    razoes = [statistics.median(rng.choices(nova, k=len(nova)))
+              / statistics.median(rng.choices(base, k=len(base)))
+              for _ in range(reamostras)]
+    cauda = (1 - confianca) / 2 * 100
+    return percentil(razoes, cauda), percentil(razoes, 100 - cauda)
+
+
+def indexar(execucao):
+    """
+    {(motor, n): (mediana_ms, amostras_ms ou None)} de uma execucao gravada,
+    sem as amostras marcadas como ruidosas (amostras_limpas). Motores com
+    entrada diferente de range aparecem como 'motor/tipo' (ex.: 'for/list').
+    """
+    celulas = {}
+    for tipo, series in secoes_motores(execucao).items():
+        for motor, serie in series.items():
+            rotulo = motor if tipo == 'range' else f"{motor}/{tipo}"
+            amostras = amostras_limpas(serie) or [None] * len(serie['n'])
+            for n, mediana, reps in zip(serie['n'], serie['mediana_ms'], amostras):
+                celulas[(rotulo, n)] = (mediana, reps)
+    return celulas
+
+
+def comparar(base, nova, limiar=LIMIAR_PADRAO, alfa=ALFA_PADRAO, teste='bootstrap'):
+    """
+    Compara as celulas (motor, N) presentes nas duas execucoes.
+    Devolve uma lista de linhas (dicionarios) ordenada por motor e N, com
+    'status' em REGRESSAO, MELHORA, igual ou 'sem amostras'.
+    """
+    celulas_base, celulas_nova = indexar(base), indexar(nova)
+    linhas = []
+    for chave in sorted(set(celulas_base) & set(celulas_nova)):
+        (mediana_b, reps_b), (mediana_n, reps_n) = celulas_base[chave], celulas_nova[chave]
+        linha = {'motor': chave[0], 'n': chave[1], 'base_ms': mediana_b, 'nova_ms': mediana_n,
+                 'razao': mediana_n / mediana_b, 'p_lenta': None, 'p_rapida': None, 'ic': None}
+
+        if not reps_b or not reps_n or len(reps_b) < 2 or len(reps_n) < 2:
+            linha['status'] = 'sem amostras'
+            linhas.append(linha)
+            continue
+
+        linha['p_lenta'], linha['p_rapida'] = mann_whitney(reps_b, reps_n)
+        linha['ic'] = bootstrap_razao(reps_b, reps_n)
+        if teste == 'mannwhitney':
+            mais_lenta, mais_rapida = linha['p_lenta'] < alfa, linha['p_rapida'] < alfa
+        else:
+            mais_lenta, mais_rapida = linha['ic'][0] > 1, linha['ic'][1] < 1
+
+        if linha['razao'] > 1 + limiar and mais_lenta:
+            linha['status'] = 'REGRESSAO'
+        elif linha['razao'] < 1 - limiar and mais_rapida:
+            linha['status'] = 'MELHORA'
+        else:
+            linha['status'] = 'igual'
+        linhas.append(linha)
+    return linhas
+
+
+def imprimir_comparacao(linhas, rotulo_base, rotulo_nova, limiar=LIMIAR_PADRAO, teste='bootstrap'):
+    """
+    Tabela de diferencas no terminal, no formato do relatorio experimental.
+    """
+    print("=" * 112)
+    print(f"COMPARACAO DE DESEMPENHO - base: {rotulo_base}  |  nova: {rotulo_nova}")
+    print("=" * 112)
+    print(f"{'Motor':<12} {'N Elementos':<14} {'Base (ms)':<11} {'Nova (ms)':<11} "
+          f"{'Diferenca (ms)':<15} {'% Variacao':<11} {'p (MW)':<8} {'IC 95% razao':<17} {'Status':<12}")
+    print("-" * 112)
+
+    for l in linhas:
+        diferenca = l['nova_ms'] - l['base_ms']
+        p = '-' if l['p_lenta'] is None else f"{min(l['p_lenta'], l['p_rapida']):.3f}"
+        ic = '-' if l['ic'] is None else f"{l['ic'][0]:.3f}..{l['ic'][1]:.3f}"
+        variacao = f"{(l['razao'] - 1) * 100:+.1f}%"
+        print(f"{l['motor']:<12} {l['n']:<14,} {l['base_ms']:<11.2f} {l['nova_ms']:<11.2f} "
+              f"{diferenca:<+15.2f} {variacao:<11} {p:<8} {ic:<17} {l['status']:<12}")
+
+    print("=" * 112)
+    regressoes = [l for l in linhas if l['status'] == 'REGRESSAO']
+    melhoras = [l for l in linhas if l['status'] == 'MELHORA']
+    print("\nRESUMO ESTATISTICO:")
+    print(f"- Celulas comparadas: {len(linhas)} (teste: {teste}, limiar: {limiar:.0%})")
+    if linhas:
+        media_geo = math.exp(statistics.fmean(math.log(l['razao']) for l in linhas))
+        print(f"- Media geometrica da razao nova/base: {media_geo:.3f}x")
+    print(f"- Regressoes: {len(regressoes)}  |  Melhoras: {len(melhoras)}")
+    for l in regressoes:
+        print(f"  [REGRESSAO] {l['motor']} N={l['n']:,}: {(l['razao'] - 1) * 100:+.1f}%")
+
+
+def abrir_execucao(caminho, chave=None):
+    """
+    Execucao 'host|python' do arquivo (ou a padrao de escolher_execucao).
+    """
+    host, python = chave.split('|', 1) if chave else (None, None)
+    execucao = escolher_execucao(carregar(caminho), host, python)
+    if execucao is None:
+        raise SystemExit(f"[ERRO] Nenhuma execucao {chave or ''} em {caminho}")
+    return execucao
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara dois conjuntos de resultados e aponta regressoes")
+    parser.add_argument('--base', default=ARQUIVO_PADRAO,
+                        help="resultados.json de referencia (padrao: o do projeto)")
+    parser.add_argument('--nova', default=ARQUIVO_PADRAO,
+                        help="resultados.json a avaliar (padrao: o do projeto)")
+    parser.add_argument('--execucao-base', default=None,
+                        help="chave 'host|python' da execucao de referencia")
+    parser.add_argument('--execucao-nova', default=None,
+                        help="chave 'host|python' da execucao avaliada")
+    parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO,
+                        help="variacao minima para marcar regressao (padrao: 0.05 = 5%%)")
+    parser.add_argument('--alfa', type=float, default=ALFA_PADRAO,
+                        help="nivel de significancia do Mann-Whitney")
+    parser.add_argument('--teste', choices=TESTES, default='bootstrap',
+                        help="teste que confirma a regressao")
+    args = parser.parse_args()
+
+    base = abrir_execucao(args.base, args.execucao_base)
+    nova = abrir_execucao(args.nova, args.execucao_nova)
+    linhas = comparar(base, nova, args.limiar, args.alfa, args.teste)
+    imprimir_comparacao(linhas, f"{base['host']}|{base['python']}", f"{nova['host']}|{nova['python']}",
+                        args.limiar, args.teste)
+
+    if any(l['status'] == 'REGRESSAO' for l in linhas):
+        sys.exit(CODIGO_REGRESSAO)
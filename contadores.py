@@ -0,0 +1,208 @@
+import ctypes
+import fcntl
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+
+# ============================================================================
+#  PROJETO: CONTADORES DE HARDWARE (perf)
+# ============================================================================
+#  Camada opcional que mede, para uma chamada de um motor:
+#    instrucoes, ciclos, falhas de previsao de desvio e falhas de cache
+#  e, a partir delas, IPC (instrucoes / ciclo) e custo por elemento.
+#
+#  Duas fontes, na ordem:
+#  1. perf_event_open(2) via ctypes: contadores do proprio processo, so
+#     em modo usuario (exclude_kernel), ligados apenas durante a chamada.
+#  2. 'perf stat' num subprocesso que repete a chamada k vezes, menos uma
+#     linha de base que so prepara a entrada (funciona com qualquer motor
+#     registrado em motores.py).
+#
+#  Motores multiprocesso (registrados com multiprocesso=True, ex.:
+#  'paralelo'): o perf_event_open abre os contadores so para o proprio
+#  processo. O bit 'inherit' nao resolve: o pool de trabalhadores ja existe
+#  quando os contadores abrem, e contagens herdadas so chegam quando o filho
+#  termina. Para eles so vale o 'perf stat', que segue os filhos ate o fim
+#  do subprocesso (o pool e encerrado no atexit); sem perf, os contadores
+#  ficam indisponiveis (None) em vez de contar so o processo pai.
+#
+#  Sem PMU (maquinas virtuais, containers, perf_event_paranoid alto) ou sem
+#  o binario perf, as funcoes devolvem None e os benchmarks seguem sem os
+#  contadores.
+# ============================================================================
+
+# nome -> (tipo, configuracao) de PERF_TYPE_HARDWARE (linux/perf_event.h)
+PERF_TYPE_HARDWARE = 0
+EVENTOS = {
+    'ciclos': (PERF_TYPE_HARDWARE, 0),          # PERF_COUNT_HW_CPU_CYCLES
+    'instrucoes': (PERF_TYPE_HARDWARE, 1),      # PERF_COUNT_HW_INSTRUCTIONS
+    'falhas_cache': (PERF_TYPE_HARDWARE, 3),    # PERF_COUNT_HW_CACHE_MISSES
+    'falhas_desvio': (PERF_TYPE_HARDWARE, 5),   # PERF_COUNT_HW_BRANCH_MISSES
+}
+CAMPOS = tuple(EVENTOS)
+
+# Nomes dos mesmos eventos no 'perf stat -e'
+EVENTOS_PERF_STAT = {'ciclos': 'cycles', 'instrucoes': 'instructions',
+                     'falhas_cache': 'cache-misses', 'falhas_desvio': 'branch-misses'}
+
+# Numero da chamada de sistema perf_event_open por arquitetura
+SYSCALL_PERF_EVENT_OPEN = {'x86_64': 298, 'aarch64': 241, 'i686': 336, 'i386': 336,
+                           'armv7l': 364, 'ppc64le': 319, 's390x': 331}
+
+# ioctl de controle (linux/perf_event.h)
+PERF_EVENT_IOC_ENABLE = 0x2400
+PERF_EVENT_IOC_DISABLE = 0x2401
+PERF_EVENT_IOC_RESET = 0x2403
+
+# Bits de perf_event_attr.flags
+DESABILITADO = 1 << 0
+EXCLUI_KERNEL = 1 << 5
+EXCLUI_HV = 1 << 6
+
+
+class AtributosEvento(ctypes.Structure):
+    """
+    struct perf_event_attr na versao 0 (PERF_ATTR_SIZE_VER0 = 64 bytes).
+    """
+    _fields_ = [('type', ctypes.c_uint32), ('size', ctypes.c_uint32),
+                ('config', ctypes.c_uint64), ('sample_period', ctypes.c_uint64),
+                ('sample_type', ctypes.c_uint64), ('read_format', ctypes.c_uint64),
+                ('flags', ctypes.c_uint64), ('wakeup_events', ctypes.c_uint32),
+                ('bp_type', ctypes.c_uint32), ('config1', ctypes.c_uint64)]
+
+
+def abrir_eventos():
+    """
+    Abre um descritor perf_event por evento (processo atual, qualquer CPU).
+    Devolve {nome: fd} ou None se o kernel/hardware nao permitir.
+    """
+    numero = SYSCALL_PERF_EVENT_OPEN.get(platform.machine())
+    if numero is None or not sys.platform.startswith('linux'):
+        return None
+    libc = ctypes.CDLL(None, use_errno=True)
+    descritores = {}
+    for nome, (tipo, config) in EVENTOS.items():
+        attr = AtributosEvento(type=tipo, size=ctypes.sizeof(AtributosEvento), config=config,
+                               flags=DESABILITADO | EXCLUI_KERNEL | EXCLUI_HV)
+        fd = libc.syscall(numero, ctypes.byref(attr), 0, -1, -1, 0)
+        if fd < 0:
+            fechar_eventos(descritores)
+            return None
+        descritores[nome] = fd
+    return descritores
+
+
+def fechar_eventos(descritores):
+    """
+    Fecha os descritores abertos por abrir_eventos().
+    """
+    for fd in descritores.values():
+        os.close(fd)
+
+
+def contar(descritores, funcao, dados):
+    """
+    Executa funcao(dados) com os contadores ligados; devolve {nome: contagem}.
+    """
+    for fd in descritores.values():
+        fcntl.ioctl(fd, PERF_EVENT_IOC_RESET, 0)
+    for fd in descritores.values():
+        fcntl.ioctl(fd, PERF_EVENT_IOC_ENABLE, 0)
+    funcao(dados)
+    for fd in descritores.values():
+        fcntl.ioctl(fd, PERF_EVENT_IOC_DISABLE, 0)
+    return {nome: int.from_bytes(os.read(fd, 8), sys.byteorder)
+            for nome, fd in descritores.items()}
+
+
+def perf_stat(codigo):
+    """
+    Roda 'python -c codigo' sob 'perf stat -x,' e devolve {nome: contagem}
+    (None se o perf nao existir ou algum evento nao for suportado).
+    """
+    eventos = ','.join(EVENTOS_PERF_STAT.values())
+    processo = subprocess.run(['perf', 'stat', '-x,', '-e', eventos, sys.executable, '-c', codigo],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+    if processo.returncode != 0:
+        return None
+    por_evento = {}
+    for linha in processo.stderr.splitlines():
+        campos = linha.split(',')
+        if len(campos) >= 3 and campos[0].isdigit():
+            por_evento[campos[2].split(':')[0]] = int(campos[0])
+    contagens = {nome: por_evento.get(evento) for nome, evento in EVENTOS_PERF_STAT.items()}
+    return None if None in contagens.values() else contagens
+
+
+def medir_perf_stat(nome_motor, tipo_entrada, n, repeticoes=5):
+    """
+    Contagens por chamada do motor registrado 'nome_motor' via 'perf stat':
+    (execucao com k chamadas - linha de base sem chamadas) / k.
+    """
+    if shutil.which('perf') is None:
+        return None
+    preparo = (f"from motores import MOTORES, gerar_entrada\n"
+               f"f = MOTORES[{nome_motor!r}]['funcao']\n"
+               f"dados = gerar_entrada({tipo_entrada!r}, {n})\n")
+    completo = perf_stat(preparo + f"for _ in range({repeticoes}): f(dados)\n")
+    base = perf_stat(preparo)
+    if completo is None or base is None:
+        return None
+    return {nome: max(completo[nome] - base[nome], 0) / repeticoes for nome in CAMPOS}
+
+
+def medir_contadores(funcao, entrada=None, preparar=None, repeticoes=3):
+    """
+    Contadores de hardware de uma chamada (mediana de 'repeticoes'), via
+    perf_event_open. Devolve {instrucoes, ciclos, falhas_desvio,
+    falhas_cache, ipc} ou None se os contadores estiverem indisponiveis.
+    """
+    descritores = abrir_eventos()
+    if descritores is None:
+        return None
+    if preparar is None:
+        def preparar():
+            return entrada
+    try:
+        funcao(preparar())                       # Aquecimento (fora da contagem)
+        rodadas = [contar(descritores, funcao, preparar()) for _ in range(repeticoes)]
+    finally:
+        fechar_eventos(descritores)
+    return com_ipc({nome: statistics.median(r[nome] for r in rodadas) for nome in CAMPOS})
+
+
+def com_ipc(contagens):
+    """
+    Acrescenta 'ipc' (instrucoes por ciclo) as contagens.
+    """
+    contagens['ipc'] = contagens['instrucoes'] / contagens['ciclos'] if contagens['ciclos'] else None
+    return contagens
+
+
+def contadores_motor(nome, funcao, tipo_entrada, n, entrada, multiprocesso=False):
+    """
+    Contadores por chamada de um motor registrado: perf_event_open no proprio
+    processo, senao 'perf stat' num subprocesso. None se nenhum funcionar.
+    Motores multiprocesso vao direto ao 'perf stat' (ver cabecalho).
+    """
+    contagens = None if multiprocesso else medir_contadores(funcao, entrada)
+    if contagens is None:
+        contagens = medir_perf_stat(nome, tipo_entrada, n)
+        if contagens is not None:
+            contagens = com_ipc(contagens)
+    return contagens
+
+
+def contadores_disponiveis():
+    """
+    Fonte disponivel: 'perf_event_open', 'perf stat' ou None.
+    """
+    descritores = abrir_eventos()
+    if descritores is not None:
+        fechar_eventos(descritores)
+        return 'perf_event_open'
+    return 'perf stat' if shutil.which('perf') else None
@@ -0,0 +1,208 @@
+import random
+from array import array
+
+import numpy as np
+
+from cache import abrir_cache, fechar_cache, medir_com_cache
+from medicao import medir
+
+# ============================================================================
+#  PROJETO: MATRIZ DE DISTRIBUICOES E TIPOS DE ENTRADA
+# ============================================================================
+#  range(n) e list(range(n)) sao o melhor caso para o interpretador: inteiros
+#  pequenos, ordenados, alocados em sequencia e com paridade alternada
+#  (previsivel). Este modulo gera entradas mais parecidas com dados reais.
+#
+#  Distribuicoes (valores):
+#  - sequencial: 0..n-1 (linha de base; seletividade fixa em 50%).
+#  - aleatoria:  valores uniformes, paridade sorteada com a seletividade
+#                pedida; objetos alocados na ordem da lista.
+#  - ordenada:   os mesmos valores ordenados (a paridade continua aleatoria,
+#                mas os objetos deixam de estar na ordem de alocacao).
+#  - adversaria: paridade aleatoria, magnitudes misturadas (1 e 2 digitos
+#                internos de 30 bits) e lista embaralhada apos a alocacao.
+#
+#  Seletividade: fracao de pares (0.0 = nenhum, 1.0 = todos).
+#  grande=True: soma 2**64 (par) a cada valor — fora do cache de inteiros
+#  pequenos e de qualquer palavra de maquina.
+#
+#  Conteineres: list, tuple, array('q'), ndarray int64 e gerador (um novo
+#  a cada rodada, sobre a lista ja pronta). Combinacoes impossiveis (ex.:
+#  inteiro grande em array('q')) ou motores que nao aceitam o conteiner
+#  aparecem como '-' na matriz.
+# ============================================================================
+
+DISTRIBUICOES = ('sequencial', 'aleatoria', 'ordenada', 'adversaria')
+CONTEINERES = ('list', 'tuple', 'array', 'numpy', 'gerador')
+SELETIVIDADES = (0.0, 0.1, 0.5, 0.9, 1.0)
+
+DESLOCAMENTO_GRANDE = 1 << 64       # Par: preserva a paridade
+LIMITE_PEQUENO = 1 << 29            # 2*base + 1 < 2**30 (um digito interno)
+
+# Casos padrao (linhas da matriz): distribuicoes a 50%, varredura de
+# seletividade na aleatoria e inteiros grandes
+CASOS_PADRAO = ([{'distribuicao': d, 'seletividade': 0.5, 'grande': False} for d in DISTRIBUICOES]
+                + [{'distribuicao': 'aleatoria', 'seletividade': s, 'grande': False}
+                   for s in SELETIVIDADES if s != 0.5]
+                + [{'distribuicao': 'aleatoria', 'seletividade': 0.5, 'grande': True}])
+
+
+def gerar_valores(n, distribuicao='sequencial', seletividade=0.5, grande=False, semente=0):
+    """
+    Lista de N inteiros na distribuicao pedida (deterministica pela semente).
+    """
+    if distribuicao == 'sequencial':
+        valores = list(range(n))
+    elif distribuicao in ('aleatoria', 'ordenada', 'adversaria'):
+        rng = random.Random(semente)
+        # Valor = 2*base + bit: o bit (0 = par) segue a seletividade
+        limite = LIMITE_PEQUENO
+        valores = []
+        for _ in range(n):
+            if distribuicao == 'adversaria':
+                # Metade dos valores passa de 2**30 (dois digitos internos)
+                limite = LIMITE_PEQUENO << (rng.getrandbits(1) * 15)
+            valores.append(2 * rng.randrange(limite) + (rng.random() >= seletividade))
+        if distribuicao == 'ordenada':
+            valores.sort()
+        elif distribuicao == 'adversaria':
+            rng.shuffle(valores)
+    else:
+        raise ValueError(f"distribuicao desconhecida: {distribuicao}")
+
+    if grande:
+        valores = [v + DESLOCAMENTO_GRANDE for v in valores]
+    return valores
+
+
+def preparador(valores, conteiner):
+    """
+    Funcao sem argumentos que devolve a entrada no conteiner pedido (para
+    medir(preparar=...)). A conversao e feita uma unica vez, fora do
+    cronometro; o gerador e recriado a cada rodada (so pode ser lido uma vez).
+    Levanta OverflowError se os valores nao couberem no conteiner.
+    """
+    if conteiner == 'list':
+        dados = valores
+    elif conteiner == 'tuple':
+        dados = tuple(valores)
+    elif conteiner == 'array':
+        dados = array('q', valores)
+    elif conteiner == 'numpy':
+        dados = np.array(valores, dtype=np.int64)
+    elif conteiner == 'gerador':
+        return lambda: (v for v in valores)
+    else:
+        raise ValueError(f"conteiner desconhecido: {conteiner}")
+    return lambda: dados
+
+
+def rotulo_caso(caso):
+    """
+    Nome curto da linha da matriz (ex.: 'aleatoria 10%', 'aleatoria 50% grande').
+    """
+    texto = f"{caso['distribuicao']} {caso['seletividade']:.0%}"
+    return texto + (" grande" if caso['grande'] else "")
+
+
+def aceita(motor, valores, conteiner, amostra=257):
+    """
+    Verifica se o motor roda e passa no oraculo para esse conteiner, numa
+    amostra pequena dos valores (comparada com a lista materializada).
+    Tambem testa 0..amostra-1: com seletividade 0% qualquer saida vazia
+    passaria no oraculo.
+    """
+    for parte in (valores[:amostra], list(range(amostra))):
+        try:
+            saida = motor['funcao'](preparador(parte, conteiner)())
+            if not motor['oraculo'](parte, saida):
+                return False
+        except Exception:
+            # Qualquer falha do motor com esse conteiner vira celula vazia
+            return False
+    return True
+
+
+def medir_matriz(motores, n, casos=CASOS_PADRAO, conteineres=CONTEINERES,
+                 forcar=False, **opcoes):
+    """
+    Mede cada motor em cada (caso, conteiner) com N elementos.
+
+    Devolve {nome_motor: {(rotulo_caso, conteiner): resumo ou None}}; None
+    marca celulas impossiveis ou reprovadas no oraculo.
+    """
+    matriz = {nome: {} for nome in motores}
+    cache = abrir_cache()
+    for caso in casos:
+        rotulo = rotulo_caso(caso)
+        valores = gerar_valores(n, **caso)
+        for conteiner in conteineres:
+            try:
+                preparar = preparador(valores, conteiner)
+            except OverflowError:
+                preparar = None
+            for nome, motor in motores.items():
+                if preparar is None or not aceita(motor, valores, conteiner):
+                    matriz[nome][(rotulo, conteiner)] = None
+                    continue
+                tipo = f"{conteiner}/{rotulo}"
+                resumo, _ = medir_com_cache(
+                    cache, motor['funcao'], n, tipo,
+                    lambda: medir(motor['funcao'], preparar=preparar, **opcoes),
+                    forcar=forcar, opcoes=opcoes, rotulo=nome)
+                matriz[nome][(rotulo, conteiner)] = resumo
+        del valores
+    fechar_cache(cache)
+    return matriz
+
+
+def imprimir_matriz(matriz, n, casos=CASOS_PADRAO, conteineres=CONTEINERES):
+    """
+    Uma tabela por motor: linhas = casos, colunas = conteineres, celula =
+    mediana em ns por elemento.
+    """
+    largura = 26 + 12 * len(conteineres)
+    for nome, celulas in matriz.items():
+        print("\n" + "=" * largura)
+        print(f"MOTOR: {nome}  (ns por elemento, mediana; N={n:,})")
+        print("=" * largura)
+        print(f"{'Caso':<26}" + "".join(f"{c:>12}" for c in conteineres))
+        print("-" * largura)
+        for caso in casos:
+            rotulo = rotulo_caso(caso)
+            linha = f"{rotulo:<26}"
+            for conteiner in conteineres:
+                resumo = celulas[(rotulo, conteiner)]
+                linha += f"{'-':>12}" if resumo is None else f"{resumo['mediana_ms'] * 1e6 / n:>12.1f}"
+            print(linha)
+
+
+def imprimir_vencedor(matriz, motor_a='for', motor_b='lambda',
+                      casos=CASOS_PADRAO, conteineres=CONTEINERES):
+    """
+    Razao motor_b / motor_a por celula: > 1 significa que motor_a venceu
+    (marcado com a inicial do vencedor).
+    """
+    marca_a, marca_b = motor_a[0].upper(), motor_b[0].upper()
+    if motor_a not in matriz or motor_b not in matriz:
+        return
+    largura = 26 + 12 * len(conteineres)
+    print("\n" + "=" * largura)
+    print(f"VENCEDOR: razao {motor_b}/{motor_a} (> 1: '{motor_a}' mais rapido)")
+    print("=" * largura)
+    print(f"{'Caso':<26}" + "".join(f"{c:>12}" for c in conteineres))
+    print("-" * largura)
+    for caso in casos:
+        rotulo = rotulo_caso(caso)
+        linha = f"{rotulo:<26}"
+        for conteiner in conteineres:
+            a = matriz[motor_a][(rotulo, conteiner)]
+            b = matriz[motor_b][(rotulo, conteiner)]
+            if a is None or b is None:
+                linha += f"{'-':>12}"
+            else:
+                razao = b['mediana_ms'] / a['mediana_ms']
+                linha += f"{razao:>11.2f}{marca_a if razao > 1 else marca_b}"
+        print(linha)
+    print("=" * largura)
+    print(f"{marca_a} = '{motor_a}' venceu, {marca_b} = '{motor_b}' venceu")
@@ -0,0 +1,301 @@
+import argparse
+import math
+
+import numpy as np
+
+from cache import abrir_cache, fechar_cache, medir_com_cache
+from capacidade import LIMIAR_QUEBRA, bytes_por_elemento, limites_memoria
+from medicao import medir
+from motores import MOTORES, motores_para
+from resultados import ARQUIVO_PADRAO, carregar, escolher_execucao, salvar_medicoes
+
+# ============================================================================
+#  PROJETO: VARREDURA DA HIERARQUIA DE CACHE (T(n) POR TRECHOS)
+# ============================================================================
+#  analise_completa.py ajusta uma unica reta T(n) = a*n + b para todos os N,
+#  mas o custo por elemento muda quando o conjunto de trabalho sai de L2/L3
+#  ou quando o redimensionamento da lista de saida passa a pedir blocos
+#  grandes ao sistema. Para ver essas quebras:
+#
+#  - Varredura fina em escala log (padrao: 10^3 a 10^8, 20 pontos por
+#    decada). N pequenos sao baratos: mais aquecimento e ate 50 repeticoes;
+#    N grandes param no orcamento por ponto (--tempo-ponto), com no minimo
+#    3. As celulas passam pelo cache de medicoes (cache.py) e vao para a
+#    secao 'hierarquia' de resultados.json: os 100+ pontos nao entram na
+#    secao 'motores' que analise_completa ajusta com uma reta so.
+#  - Regressao por trechos: o T(n) de cada motor e dividido em ate
+#    MAX_SEGMENTOS retas independentes (WLS com peso 1/T^2, ou seja, erro
+#    relativo), com os pontos de quebra achados por programacao dinamica e
+#    o numero de trechos escolhido pelo BIC, entre as divisoes em que toda
+#    quebra muda a inclinacao em pelo menos capacidade.LIMIAR_QUEBRA (as
+#    menores sao ruido de medicao).
+#  - Grafico de ns/elemento vs N (log-log) de todos os motores, com os
+#    trechos ajustados e as quebras (dashboard 'hierarquia' de
+#    relatorios.py). Cada quebra e comparada com o N em que o conjunto de
+#    trabalho estimado passa de L2/L3/RAM (capacidade.py).
+# ============================================================================
+
+INICIO_PADRAO = 10**3
+FIM_PADRAO = 10**8
+POR_DECADA_PADRAO = 20
+TEMPO_PONTO_PADRAO = 2.0
+
+MAX_SEGMENTOS = 5
+MIN_PONTOS_SEGMENTO = 5
+
+# Quebra atribuida a um limite de memoria quando o N cai a menos deste fator
+FATOR_LIMITE = 2.0
+
+# 'paralelo' mede o pool de processos, nao a hierarquia de cache
+EXCLUIDOS_PADRAO = ('paralelo',)
+
+
+def valores_log(inicio=INICIO_PADRAO, fim=FIM_PADRAO, por_decada=POR_DECADA_PADRAO):
+    """
+    N inteiros distintos espacados em escala log, de 'inicio' a 'fim'.
+    """
+    pontos = round(math.log10(fim / inicio) * por_decada) + 1
+    return sorted({int(round(v)) for v in np.geomspace(inicio, fim, pontos)})
+
+
+def opcoes_ponto(n, tempo_ponto=TEMPO_PONTO_PADRAO):
+    """
+    Opcoes de medicao.medir por N: repeticoes baratas nos N pequenos.
+    """
+    if n <= 10**5:
+        return dict(aquecimento=3, min_repeticoes=5, max_repeticoes=50, tempo_max_s=tempo_ponto)
+    return dict(aquecimento=1, min_repeticoes=3, max_repeticoes=15, tempo_max_s=tempo_ponto)
+
+
+def varrer(motores, valores, tempo_ponto=TEMPO_PONTO_PADRAO, forcar=False):
+    """
+    Mede cada motor em cada N (reaproveitando o cache de medicoes).
+    Devolve {(motor, n): resumo}.
+    """
+    medicoes = {}
+    cache = abrir_cache()
+    print(f"Varredura de {len(valores)} valores de N ({valores[0]:,} a {valores[-1]:,}) "
+          f"em {', '.join(motores)}")
+    print("-" * 80)
+    try:
+        for n in valores:
+            entrada = range(n)
+            opcoes = opcoes_ponto(n, tempo_ponto)
+            linha = []
+            for nome, motor in motores.items():
+                resumo, do_cache = medir_com_cache(
+                    cache, motor['funcao'], n, 'range',
+                    lambda: medir(motor['funcao'], entrada=entrada, **opcoes),
+                    forcar=forcar, opcoes=opcoes, rotulo=nome)
+                medicoes[(nome, n)] = resumo
+                linha.append(f"{nome} {resumo['mediana_ms'] * 1e6 / n:.2f}{'*' if do_cache else ''}")
+            print(f"N = {n:<13,} ns/elem: " + '  '.join(linha))
+    finally:
+        fechar_cache(cache)
+    return medicoes
+
+
+# ============================================================================
+#  REGRESSAO POR TRECHOS
+# ============================================================================
+
+def ajustar_trecho(x, y):
+    """
+    Reta WLS (peso 1/y^2) de um trecho: (a, b, rss relativo).
+    """
+    w = 1.0 / np.maximum(y, 1e-12) ** 2
+    X = np.column_stack([x, np.ones_like(x)]) * np.sqrt(w)[:, None]
+    coef, *_ = np.linalg.lstsq(X, y * np.sqrt(w), rcond=None)
+    residuos = (y - (coef[0] * x + coef[1])) * np.sqrt(w)
+    return float(coef[0]), float(coef[1]), float(residuos @ residuos)
+
+
+def ajustar_segmentos(n, tempos_ms, max_segmentos=MAX_SEGMENTOS, min_pontos=MIN_PONTOS_SEGMENTO,
+                      limiar=LIMIAR_QUEBRA):
+    """
+    Regressao linear por trechos de T(n), com as quebras escolhidas por
+    programacao dinamica (menor RSS para cada numero de trechos) e o numero
+    de trechos pelo BIC, so entre as divisoes em que cada quebra muda a
+    inclinacao em mais de 'limiar'. Devolve {'segmentos': [{'n_inicio', 'n_fim', 'a',
+    'b', 'pontos'}], 'quebras': [N], 'bic'}.
+    """
+    ordem = np.argsort(n)
+    x = np.asarray(n, dtype=float)[ordem]
+    y = np.asarray(tempos_ms, dtype=float)[ordem]
+    m = x.size
+    max_segmentos = max(1, min(max_segmentos, m // min_pontos))
+
+    # custo[i][j]: RSS do trecho com os pontos i..j-1
+    custo = np.full((m + 1, m + 1), np.inf)
+    for i in range(m):
+        for j in range(i + min_pontos, m + 1):
+            custo[i, j] = ajustar_trecho(x[i:j], y[i:j])[2]
+
+    # melhor[k, j]: menor RSS dos pontos 0..j-1 em k trechos; corte guarda o inicio do ultimo
+    melhor = np.full((max_segmentos + 1, m + 1), np.inf)
+    corte = np.zeros((max_segmentos + 1, m + 1), dtype=int)
+    melhor[0, 0] = 0.0
+    for k in range(1, max_segmentos + 1):
+        for j in range(k * min_pontos, m + 1):
+            candidatos = melhor[k - 1, :j] + custo[:j, j]
+            corte[k, j] = int(np.argmin(candidatos))
+            melhor[k, j] = candidatos[corte[k, j]]
+
+    def trechos(k):
+        limites, j = [], m
+        for nivel in range(k, 0, -1):
+            i = corte[nivel, j]
+            limites.append((i, j))
+            j = i
+        segmentos = []
+        for i, j in reversed(limites):
+            a, b, _ = ajustar_trecho(x[i:j], y[i:j])
+            segmentos.append({'n_inicio': int(x[i]), 'n_fim': int(x[j - 1]), 'a': a, 'b': b,
+                              'pontos': j - i})
+        return segmentos
+
+    # BIC: 2 parametros por trecho + 1 por quebra
+    def bic(k):
+        return m * math.log(max(melhor[k, m], 1e-300) / m) + (3 * k - 1) * math.log(m)
+
+    def relevante(segmentos):
+        return all(s['a'] > 0 and abs(p['a'] / s['a'] - 1) > limiar for s, p in zip(segmentos, segmentos[1:]))
+
+    candidatos = {k: trechos(k) for k in range(1, max_segmentos + 1) if np.isfinite(melhor[k, m])}
+    k = min((k for k, segmentos in candidatos.items() if k == 1 or relevante(segmentos)), key=bic)
+    segmentos = candidatos[k]
+    # Quebra entre dois trechos: media geometrica dos N vizinhos
+    quebras = [int(round(math.sqrt(s['n_fim'] * p['n_inicio']))) for s, p in zip(segmentos, segmentos[1:])]
+    return {'segmentos': segmentos, 'quebras': quebras, 'bic': bic(k)}
+
+
+def limite_proximo(n_quebra, bytes_elem, limites):
+    """
+    Limite de memoria (L2, L3, RAM) cujo N de transbordo fica a menos de
+    FATOR_LIMITE da quebra, ou None.
+    """
+    for nivel, tamanho in limites.items():
+        n_limite = tamanho / bytes_elem if bytes_elem > 0 else math.inf
+        if n_limite / FATOR_LIMITE <= n_quebra <= n_limite * FATOR_LIMITE:
+            return nivel
+    return None
+
+
+# ============================================================================
+#  DADOS, TABELA E DASHBOARD
+# ============================================================================
+
+def carregar_dados(caminho=ARQUIVO_PADRAO):
+    """
+    Por motor com pontos suficientes: N, ns/elemento e o ajuste por trechos
+    (listas e numeros, serializavel para os relatorios).
+    """
+    execucao = escolher_execucao(carregar(caminho))
+    limites = limites_memoria()
+    dados = {}
+    for motor, serie in (execucao.get('hierarquia', {}) if execucao else {}).items():
+        if len(serie['n']) < 2 * MIN_PONTOS_SEGMENTO:
+            continue
+        trechos = ajustar_segmentos(serie['n'], serie['mediana_ms'])
+        bytes_elem, _ = bytes_por_elemento(serie)
+        dados[motor] = {'n': serie['n'],
+                        'ns_elem': [t * 1e6 / n for n, t in zip(serie['n'], serie['mediana_ms'])],
+                        'segmentos': trechos['segmentos'], 'quebras': trechos['quebras'],
+                        'limites': [limite_proximo(q, bytes_elem, limites) for q in trechos['quebras']]}
+    return dados
+
+
+def imprimir_segmentos(dados):
+    """
+    Trechos de cada motor: faixa de N, ns/elemento marginal e custo fixo,
+    e as quebras com a razao entre as inclinacoes.
+    """
+    print("=" * 92)
+    print("T(n) POR TRECHOS (ns/elem = inclinacao do trecho; quebras escolhidas pelo BIC)")
+    print("=" * 92)
+    print(f"{'Motor':<13} {'N inicial':<14} {'N final':<14} {'Pontos':<8} {'ns/elem':<10} "
+          f"{'Fixo (ms)':<11} Quebra")
+    print("-" * 92)
+    for motor, d in dados.items():
+        anterior = None
+        for i, s in enumerate(d['segmentos']):
+            quebra = ''
+            if anterior is not None:
+                limite = d['limites'][i - 1]
+                quebra = (f"N ~ {d['quebras'][i - 1]:,}: {s['a'] / anterior['a']:.2f}x"
+                          + (f" (perto de {limite})" if limite else ''))
+            print(f"{motor if i == 0 else '':<13} {s['n_inicio']:<14,} {s['n_fim']:<14,} {s['pontos']:<8} "
+                  f"{s['a'] * 1e6:<10.2f} {s['b']:<11.3f} {quebra}")
+            anterior = s
+    print("=" * 92)
+
+
+def figura_hierarquia(dados):
+    """
+    ns/elemento vs N (log-log) de todos os motores, com os trechos
+    ajustados (linhas) e as quebras (verticais tracejadas).
+    """
+    if not dados:
+        return None
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 7))
+    for motor, d in dados.items():
+        pontos = ax.plot(d['n'], d['ns_elem'], 'o', markersize=3, alpha=0.6, label=motor)[0]
+        cor = pontos.get_color()
+        for s in d['segmentos']:
+            n = np.geomspace(s['n_inicio'], s['n_fim'], 50)
+            ax.plot(n, (s['a'] * n + s['b']) * 1e6 / n, '-', color=cor, linewidth=2)
+        for quebra, limite in zip(d['quebras'], d['limites']):
+            ax.axvline(quebra, color=cor, linestyle='--', alpha=0.5)
+            if limite:
+                ax.text(quebra, 0.98, limite, transform=ax.get_xaxis_transform(), color=cor,
+                        fontsize=8, rotation=90, va='top', ha='right')
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Tamanho da entrada (N)')
+    ax.set_ylabel('Tempo por elemento (ns)')
+    ax.set_title('Custo por elemento vs N: trechos lineares e quebras', fontweight='bold')
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+# Dashboards (dados brutos -> figura), usados por relatorios.py
+DASHBOARDS = {'hierarquia': figura_hierarquia}
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura log de N e regressao de T(n) por trechos")
+    parser.add_argument('--inicio', type=float, default=INICIO_PADRAO, help="menor N (padrao: 1e3)")
+    parser.add_argument('--fim', type=float, default=FIM_PADRAO, help="maior N (padrao: 1e8)")
+    parser.add_argument('--por-decada', type=int, default=POR_DECADA_PADRAO,
+                        help="pontos por decada de N")
+    parser.add_argument('--tempo-ponto', type=float, default=TEMPO_PONTO_PADRAO,
+                        help="orcamento de tempo medido por (motor, N) em segundos")
+    parser.add_argument('--motores', default=None,
+                        help="motores separados por virgula (padrao: todos para range, menos paralelo)")
+    parser.add_argument('--forcar', '--force', action='store_true',
+                        help="ignora o cache e mede todas as celulas novamente")
+    parser.add_argument('--so-ajuste', action='store_true',
+                        help="nao mede: so ajusta os trechos de resultados.json")
+    args = parser.parse_args()
+
+    if not args.so_ajuste:
+        nomes = (args.motores.split(',') if args.motores
+                 else [nome for nome in motores_para('range') if nome not in EXCLUIDOS_PADRAO])
+        desconhecidos = [nome for nome in nomes if nome not in MOTORES]
+        if desconhecidos:
+            parser.error(f"motores nao registrados: {', '.join(desconhecidos)}")
+        medicoes = varrer({nome: MOTORES[nome] for nome in nomes},
+                          valores_log(int(args.inicio), int(args.fim), args.por_decada),
+                          args.tempo_ponto, args.forcar)
+        chave = salvar_medicoes(medicoes, secao='hierarquia')
+        print(f"\nResultados gravados em resultados.json (execucao '{chave}')")
+
+    imprimir_segmentos(carregar_dados())
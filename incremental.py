@@ -0,0 +1,195 @@
+import time
+from array import array
+from bisect import bisect_left
+
+from medicao import resumir
+from motores import numpares
+from predicados import funcao_predicado
+
+# ============================================================================
+#  PROJETO: FILTRO INCREMENTAL SOBRE DADOS SO-ACRESCIMO
+# ============================================================================
+#  numpares refaz a varredura inteira a cada chamada. Quando o mesmo
+#  conjunto de dados so cresce (e e filtrado de novo a cada consulta), o
+#  estado abaixo guarda o que ja foi visto:
+#
+#  - cursor:    quantos elementos de 'dados' ja foram testados;
+#  - posicoes:  array('q') com as posicoes que passaram no predicado;
+#  - valores:   os valores correspondentes (a resposta pronta);
+#  - removidos: bitmap (bytearray, 1 bit por posicao) das posicoes
+#               invalidadas por remover().
+#
+#  consultar() testa so os elementos acrescentados desde a consulta
+#  anterior e depois aplica as remocoes pendentes: poucas sao tiradas do
+#  indice por busca binaria (posicoes esta sempre em ordem); muitas, numa
+#  passada unica pelo bitmap. 'dados' continua so-acrescimo: remover marca a
+#  posicao, nao apaga o elemento. Se 'dados' ficar menor que o cursor, o
+#  indice e refeito do zero.
+#
+#  benchmark_pares.py --incremental compara consultas repetidas com
+#  numpares (varredura completa) e com o filtro incremental (contar(), sem
+#  copiar a resposta), em varias taxas de acrescimo por consulta.
+# ============================================================================
+
+PREDICADO_PAR = {'tipo': 'modulo', 'k': 2, 'resto': 0}
+TAXAS_PADRAO = (10, 1_000, 100_000)
+CONSULTAS_PADRAO = 20
+
+# Acima de 1 remocao pendente para cada FRACAO_RECONSTRUCAO posicoes no
+# indice, reconstruir pelo bitmap sai mais barato que apagar uma a uma
+FRACAO_RECONSTRUCAO = 64
+
+
+def criar_filtro(dados, predicado=PREDICADO_PAR):
+    """
+    Estado do filtro incremental sobre a lista 'dados' (ainda nao varrida).
+    """
+    return {'dados': dados, 'teste': funcao_predicado(predicado), 'cursor': 0,
+            'posicoes': array('q'), 'valores': [], 'removidos': bytearray(), 'pendentes': []}
+
+
+def atualizar(filtro):
+    """
+    Testa os elementos acrescentados desde o ultimo cursor e estende o
+    indice. Devolve quantos elementos novos passaram.
+    """
+    dados, cursor = filtro['dados'], filtro['cursor']
+    if len(dados) < cursor:
+        # 'dados' encolheu: o indice nao vale mais, recomeca do zero
+        filtro.update(cursor=0, posicoes=array('q'), valores=[], removidos=bytearray(), pendentes=[])
+        cursor = 0
+    teste = filtro['teste']
+    # Indexa so o trecho novo (islice andaria desde o inicio a cada consulta)
+    novas = [p for p in range(cursor, len(dados)) if teste(dados[p])]
+    if len(filtro['removidos']) * 8 > cursor:
+        # Posicoes removidas antes de existirem (ja fora de 'pendentes')
+        novas = [p for p in novas if not removido(filtro, p)]
+    filtro['posicoes'].extend(novas)
+    filtro['valores'].extend([dados[p] for p in novas])
+    filtro['cursor'] = len(dados)
+    return len(novas)
+
+
+def remover(filtro, posicao):
+    """
+    Invalida a posicao: ela some da proxima consulta (os dados nao mudam).
+    """
+    removidos = filtro['removidos']
+    byte, bit = divmod(posicao, 8)
+    if byte >= len(removidos):
+        removidos.extend(bytes(byte + 1 - len(removidos)))
+    if not removidos[byte] >> bit & 1:
+        removidos[byte] |= 1 << bit
+        filtro['pendentes'].append(posicao)
+
+
+def removido(filtro, posicao):
+    """
+    True se a posicao foi invalidada por remover().
+    """
+    byte, bit = divmod(posicao, 8)
+    removidos = filtro['removidos']
+    return byte < len(removidos) and bool(removidos[byte] >> bit & 1)
+
+
+def compactar(filtro):
+    """
+    Tira do indice as posicoes invalidadas desde a ultima compactacao.
+    """
+    pendentes, posicoes, valores = filtro['pendentes'], filtro['posicoes'], filtro['valores']
+    if not pendentes:
+        return
+    if len(pendentes) * FRACAO_RECONSTRUCAO <= len(posicoes):
+        for posicao in pendentes:
+            i = bisect_left(posicoes, posicao)
+            if i < len(posicoes) and posicoes[i] == posicao:
+                del posicoes[i]
+                del valores[i]
+    else:
+        manter = [i for i, p in enumerate(posicoes) if not removido(filtro, p)]
+        filtro['posicoes'] = array('q', [posicoes[i] for i in manter])
+        filtro['valores'] = [valores[i] for i in manter]
+    filtro['pendentes'] = []
+
+
+def consultar(filtro):
+    """
+    Valores que passam no predicado, em ordem, sem as posicoes removidas:
+    o mesmo que filtrar 'dados' do zero, processando so o que e novo.
+    """
+    atualizar(filtro)
+    compactar(filtro)
+    return list(filtro['valores'])
+
+
+def contar(filtro):
+    """
+    Quantos valores passam (sem copiar a lista).
+    """
+    atualizar(filtro)
+    compactar(filtro)
+    return len(filtro['posicoes'])
+
+
+# ============================================================================
+#  COMPARACAO: VARREDURA COMPLETA vs INCREMENTAL
+# ============================================================================
+
+def simular(n_inicial, taxa, consultas=CONSULTAS_PADRAO, remocoes=0):
+    """
+    'consultas' rodadas de: acrescenta 'taxa' elementos, remove 'remocoes'
+    posicoes e consulta. Cronometra so a consulta, com numpares (sobre os
+    dados sem as posicoes removidas) e com contar() do filtro incremental,
+    que nao copia a resposta. A conferencia com numpares fica fora do
+    cronometro. Devolve (resumo_varredura, resumo_incremental, resultados_iguais).
+    """
+    dados = list(range(n_inicial))
+    removidas = set()
+    filtro = criar_filtro(dados)
+    consultar(filtro)                       # Indice inicial (fora da comparacao)
+
+    tempos_varredura, tempos_incremental = [], []
+    iguais = True
+    for rodada in range(consultas):
+        inicio = len(dados)
+        dados.extend(range(inicio, inicio + taxa))
+        for j in range(remocoes):
+            posicao = (rodada * 7919 + j * 104729) % len(dados)
+            removidas.add(posicao)
+            remover(filtro, posicao)
+
+        # A varredura completa filtra os dados vivos (montados fora do cronometro)
+        vivos = [v for p, v in enumerate(dados) if p not in removidas] if removidas else dados
+
+        t0 = time.perf_counter_ns()
+        completo = numpares(vivos)
+        t1 = time.perf_counter_ns()
+        total = contar(filtro)
+        t2 = time.perf_counter_ns()
+        tempos_varredura.append(t1 - t0)
+        tempos_incremental.append(t2 - t1)
+        iguais = iguais and total == len(completo) and completo == filtro['valores']
+    return resumir(tempos_varredura), resumir(tempos_incremental), iguais
+
+
+def imprimir_incremental(n_inicial, taxas=TAXAS_PADRAO, consultas=CONSULTAS_PADRAO, remocoes=0):
+    """
+    Tabela por taxa de acrescimo: mediana por consulta da varredura completa
+    (numpares) e do filtro incremental (contar), e o speedup.
+    """
+    print("=" * 88)
+    print(f"FILTRO INCREMENTAL: N inicial = {n_inicial:,}, {consultas} consultas por taxa, "
+          f"{remocoes} remocoes por consulta")
+    print("=" * 88)
+    print(f"{'Acrescimos/consulta':<21} {'numpares (ms)':<15} {'Incremental (ms)':<18} "
+          f"{'Speedup':<10} {'Resultados':<10}")
+    print("-" * 88)
+    linhas = {}
+    for taxa in taxas:
+        varredura, incremental, iguais = simular(n_inicial, taxa, consultas, remocoes)
+        linhas[taxa] = (varredura, incremental)
+        print(f"{taxa:<21,} {varredura['mediana_ms']:<15.3f} {incremental['mediana_ms']:<18.3f} "
+              f"{varredura['mediana_ms'] / incremental['mediana_ms']:<10.1f} "
+              f"{'[OK]' if iguais else '[ERRO]':<10}")
+    print("=" * 88)
+    return linhas
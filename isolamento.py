@@ -0,0 +1,125 @@
+import gc
+import os
+import resource
+import statistics
+
+# ============================================================================
+#  PROJETO: ISOLAMENTO DE RUIDO NAS MEDICOES
+# ============================================================================
+#  Ferramentas para o modo isolado dos benchmarks:
+#
+#  - fixar_cpu(): prende o processo a um nucleo (os.sched_setaffinity),
+#    evitando migracoes entre nucleos no meio de uma amostra.
+#  - estado_cpu(): governador e frequencia do nucleo lidos de
+#    /sys/devices/system/cpu/cpuN/cpufreq (None quando indisponivel,
+#    ex.: maquinas virtuais e containers).
+#  - leitura_interferencia(): contadores lidos antes e depois de cada
+#    amostra — trocas de contexto (getrusage), coletas do GC e frequencia.
+#  - classificar_amostras(): marca cada amostra com as interferencias vistas
+#    e como 'ruidosa' quando, alem de sofrer interferencia, ela e um outlier
+#    (acima de mediana + 3 * MAD normalizado). Amostras ruidosas ficam
+#    registradas, mas saem do ajuste de T(n) (ver resultados.py).
+# ============================================================================
+
+CPUFREQ = '/sys/devices/system/cpu/cpu{}/cpufreq/{}'
+
+# Outlier: acima de mediana + LIMITE_MAD * 1.4826 * MAD (ou de mediana *
+# (1 + TOLERANCIA_SEM_MAD) quando as amostras empatam)
+LIMITE_MAD = 3.0
+TOLERANCIA_SEM_MAD = 0.05
+
+
+def ler_sys(caminho):
+    """
+    Conteudo de um arquivo de /sys sem espacos, ou None se nao existir.
+    """
+    try:
+        with open(caminho, encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def nucleo_atual():
+    """
+    Nucleo em que o processo esta preso (o menor da afinidade atual).
+    """
+    return min(os.sched_getaffinity(0))
+
+
+def fixar_cpu(nucleo=None):
+    """
+    Prende o processo ao 'nucleo' (padrao: o ultimo permitido, em geral o
+    menos disputado pelo sistema). Devolve a afinidade anterior.
+    """
+    anterior = os.sched_getaffinity(0)
+    if nucleo is None:
+        nucleo = max(anterior)
+    os.sched_setaffinity(0, {nucleo})
+    return anterior
+
+
+def restaurar_cpu(anterior):
+    """
+    Devolve o processo a afinidade de antes de fixar_cpu().
+    """
+    os.sched_setaffinity(0, anterior)
+
+
+def frequencia_khz(nucleo):
+    """
+    Frequencia atual do nucleo em kHz (scaling_cur_freq), ou None.
+    """
+    valor = ler_sys(CPUFREQ.format(nucleo, 'scaling_cur_freq'))
+    return int(valor) if valor and valor.isdigit() else None
+
+
+def estado_cpu(nucleo=None):
+    """
+    Governador, frequencia atual/minima/maxima (kHz) e afinidade do processo.
+    """
+    nucleo = nucleo_atual() if nucleo is None else nucleo
+    estado = {'nucleo': nucleo, 'afinidade': sorted(os.sched_getaffinity(0)),
+              'governador': ler_sys(CPUFREQ.format(nucleo, 'scaling_governor'))}
+    for campo, arquivo in (('freq_khz', 'scaling_cur_freq'), ('freq_min_khz', 'cpuinfo_min_freq'),
+                           ('freq_max_khz', 'cpuinfo_max_freq')):
+        valor = ler_sys(CPUFREQ.format(nucleo, arquivo))
+        estado[campo] = int(valor) if valor and valor.isdigit() else None
+    return estado
+
+
+def leitura_interferencia(nucleo=None):
+    """
+    Contadores acumulados do processo: (trocas voluntarias, involuntarias,
+    coletas do GC, frequencia em kHz ou None).
+    """
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    coletas = sum(geracao['collections'] for geracao in gc.get_stats())
+    freq = frequencia_khz(nucleo) if nucleo is not None else None
+    return uso.ru_nvcsw, uso.ru_nivcsw, coletas, freq
+
+
+def classificar_amostras(amostras_ns, leituras):
+    """
+    Combina as amostras com as leituras (antes, depois) de cada uma.
+    Devolve uma lista de dicionarios com trocas de contexto, coletas do GC,
+    variacao de frequencia, 'outlier' e 'ruidosa'.
+    """
+    mediana = statistics.median(amostras_ns)
+    mad = statistics.median(abs(a - mediana) for a in amostras_ns) * 1.4826
+    limite = mediana + LIMITE_MAD * mad if mad > 0 else mediana * (1 + TOLERANCIA_SEM_MAD)
+
+    flags = []
+    for amostra, (antes, depois) in zip(amostras_ns, leituras):
+        qualidade = {
+            'trocas_voluntarias': depois[0] - antes[0],
+            'trocas_involuntarias': depois[1] - antes[1],
+            'coletas_gc': depois[2] - antes[2],
+            'freq_mudou': antes[3] is not None and antes[3] != depois[3],
+            'outlier': amostra > limite,
+        }
+        interferencia = (qualidade['trocas_voluntarias'] or qualidade['trocas_involuntarias']
+                         or qualidade['coletas_gc'] or qualidade['freq_mudou'])
+        qualidade['ruidosa'] = bool(interferencia) and qualidade['outlier']
+        flags.append(qualidade)
+    return flags
@@ -0,0 +1,234 @@
+import gc
+import math
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from isolamento import classificar_amostras, leitura_interferencia, nucleo_atual
+
+# ============================================================================
+#  PROJETO: HARNESS DE MEDICAO DE TEMPO
+# ============================================================================
+#  Modulo reutilizavel para cronometrar as funcoes do benchmark.
+#
+#  Regras da medicao:
+#  1. Relogio de alta resolucao (time.perf_counter_ns), nunca time.time().
+#  2. Preparacao dos dados (e qualquer pausa) fica FORA da regiao medida.
+#  3. Rodadas de aquecimento descartadas antes das amostras.
+#  4. Repete cada caso ate atingir a confianca relativa desejada
+#     (meia-largura do IC 95% / media), respeitando limites de rodadas e tempo.
+#
+#  Saida: dicionario com min, mediana, p95 e desvio padrao (em ms),
+#  alem das amostras brutas em nanossegundos.
+#
+#  Com memoria=True, uma rodada extra (fora das amostras de tempo) mede:
+#  pico de memoria rastreada (tracemalloc), delta de RSS e blocos retidos
+#  pelo resultado (saldo de sys.getallocatedblocks: alocados menos liberados
+#  durante a chamada, nao o total de alocacoes).
+#
+#  Modo isolado (ver isolamento.py): gc_modo='desligar' suspende o GC
+#  durante cada amostra e gc_modo='coletar' roda gc.collect() antes dela;
+#  qualidade=True marca cada amostra com trocas de contexto, coletas do GC,
+#  mudanca de frequencia e se e um outlier ruidoso (chave 'qualidade').
+# ============================================================================
+
+# Quantil da normal padrao para IC de 95% (bicaudal)
+Z_95 = 1.96
+
+
+def percentil(valores, p):
+    """
+    Percentil 'p' (0-100) com interpolacao linear entre vizinhos.
+    """
+    ordenados = sorted(valores)
+    if not ordenados:
+        raise ValueError("percentil de uma sequencia vazia")
+    pos = (len(ordenados) - 1) * p / 100.0
+    baixo = math.floor(pos)
+    alto = math.ceil(pos)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (pos - baixo)
+
+
+def resumir(amostras_ns):
+    """
+    Converte as amostras brutas (ns) nas estatisticas do relatorio (ms).
+    """
+    ms = [a / 1e6 for a in amostras_ns]
+    return {
+        'min_ms': min(ms),
+        'mediana_ms': statistics.median(ms),
+        'p95_ms': percentil(ms, 95),
+        'desvio_ms': statistics.stdev(ms) if len(ms) > 1 else 0.0,
+        'media_ms': statistics.fmean(ms),
+        'repeticoes': len(ms),
+        'amostras_ns': list(amostras_ns),
+    }
+
+
+def confianca_atual(amostras_ns):
+    """
+    Meia-largura relativa do IC 95% da media: Z * s / (sqrt(k) * media).
+    """
+    if len(amostras_ns) < 2:
+        return math.inf
+    media = statistics.fmean(amostras_ns)
+    if media == 0:
+        return 0.0
+    return Z_95 * statistics.stdev(amostras_ns) / (math.sqrt(len(amostras_ns)) * media)
+
+
+def rss_atual_bytes():
+    """
+    Memoria residente atual do processo (/proc/self/statm; fora do Linux,
+    cai no pico ru_maxrss).
+    """
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def medir_memoria(funcao, entrada=None, preparar=None):
+    """
+    Perfil de memoria de uma chamada de 'funcao', em duas rodadas:
+
+    1. Sem rastreamento: delta de RSS e de blocos pymalloc com o resultado
+       ainda vivo — o que a chamada deixa na memoria. 'blocos_retidos' e o
+       saldo (alocados menos liberados): temporarios ja liberados nao contam.
+    2. Com tracemalloc: pico de bytes alocados durante a chamada (inclui
+       temporarios, como a lista intermediaria de filter()).
+
+    A memoria alocada em outros processos (motor paralelo) nao e vista aqui.
+    """
+    if preparar is None:
+        def preparar():
+            return entrada
+
+    # --- Rodada 1: RSS e blocos retidos ---
+    dados = preparar()
+    gc.collect()
+    rss_antes = rss_atual_bytes()
+    blocos_antes = sys.getallocatedblocks()
+    resultado = funcao(dados)
+    blocos = sys.getallocatedblocks() - blocos_antes
+    rss_delta = rss_atual_bytes() - rss_antes
+    del resultado
+
+    # --- Rodada 2: pico rastreado ---
+    gc.collect()
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    resultado = funcao(dados)
+    retido, pico = tracemalloc.get_traced_memory()
+    if not ja_rastreando:
+        tracemalloc.stop()
+    del resultado
+
+    return {'pico_bytes': pico - base, 'retido_bytes': retido - base,
+            'rss_delta_bytes': rss_delta, 'blocos_retidos': blocos}
+
+
+def medir(funcao, entrada=None, preparar=None, aquecimento=2, min_repeticoes=5,
+          max_repeticoes=50, confianca_relativa=0.02, tempo_max_s=30.0,
+          guardar_resultado=False, memoria=False, gc_modo=None, qualidade=False):
+    """
+    Mede 'funcao(entrada)' repetidas vezes e devolve o resumo estatistico.
+
+    - entrada: dados fixos reutilizados em todas as rodadas.
+    - preparar: alternativa a 'entrada'; funcao sem argumentos chamada antes de
+      cada rodada (fora do cronometro) para gerar dados novos.
+    - aquecimento: rodadas iniciais executadas e descartadas.
+    - confianca_relativa: para de repetir quando o IC 95% da media fica
+      dentro de +-confianca_relativa (ex.: 0.02 = 2%).
+    - tempo_max_s: orcamento de tempo medido; ao estourar, encerra com as
+      amostras ja coletadas (desde que haja ao menos 'min_repeticoes').
+    - guardar_resultado: inclui o retorno da ultima rodada na chave 'resultado'.
+    - memoria: acrescenta o perfil de medir_memoria() (rodada extra, fora
+      das amostras de tempo).
+    - gc_modo: None (GC como esta), 'desligar' (gc.disable() durante cada
+      amostra) ou 'coletar' (gc.collect() antes de cada amostra).
+    - qualidade: acrescenta 'qualidade', uma lista (alinhada com as amostras)
+      de marcas de interferencia de isolamento.classificar_amostras().
+    """
+    if gc_modo not in (None, 'desligar', 'coletar'):
+        raise ValueError(f"gc_modo desconhecido: {gc_modo}")
+    if preparar is None:
+        def preparar():
+            return entrada
+
+    relogio = time.perf_counter_ns
+
+    # --- Aquecimento (descartado) ---
+    for _ in range(aquecimento):
+        dados = preparar()
+        funcao(dados)
+
+    # --- Amostragem ---
+    amostras = []
+    leituras = []
+    nucleo = nucleo_atual() if qualidade else None
+    gc_ligado = gc.isenabled()
+    gasto_ns = 0
+    resultado = None
+    while len(amostras) < max_repeticoes:
+        dados = preparar()               # Fora da regiao medida
+        if gc_modo == 'coletar':
+            gc.collect()
+        elif gc_modo == 'desligar':
+            gc.disable()
+        try:
+            if qualidade:
+                antes = leitura_interferencia(nucleo)
+            t0 = relogio()
+            resultado = funcao(dados)
+            t1 = relogio()
+            if qualidade:
+                leituras.append((antes, leitura_interferencia(nucleo)))
+        finally:
+            # Um motor que levanta excecao nao pode deixar o GC desligado
+            if gc_modo == 'desligar' and gc_ligado:
+                gc.enable()
+        amostras.append(t1 - t0)
+        gasto_ns += t1 - t0
+        if not guardar_resultado:
+            resultado = None             # Libera a memoria antes da proxima rodada
+
+        if len(amostras) >= min_repeticoes:
+            if confianca_atual(amostras) <= confianca_relativa:
+                break
+            if tempo_max_s is not None and gasto_ns >= tempo_max_s * 1e9:
+                break
+
+    resumo = resumir(amostras)
+    resumo['confianca'] = confianca_atual(amostras)
+    if qualidade:
+        resumo['qualidade'] = classificar_amostras(amostras, leituras)
+    if memoria:
+        resumo.update(medir_memoria(funcao, preparar=preparar))
+    if guardar_resultado:
+        resumo['resultado'] = resultado
+    return resumo
+
+
+def medir_casos(motores, valores, preparar_por_n, **opcoes):
+    """
+    Mede cada par (motor, N) e devolve {(nome_motor, n): resumo}.
+
+    - motores: dicionario {nome: funcao}.
+    - valores: tamanhos de entrada N.
+    - preparar_por_n: funcao n -> dados de entrada (executada fora do cronometro).
+    """
+    resultados = {}
+    for n in valores:
+        dados = preparar_por_n(n)
+        for nome, funcao in motores.items():
+            resultados[(nome, n)] = medir(funcao, entrada=dados, **opcoes)
+        del dados
+    return resultados
@@ -0,0 +1,342 @@
+import itertools
+import operator
+from collections import deque
+
+import numpy as np
+
+from medicao import medir, medir_memoria
+from motores import MOTORES, executor_padrao, numpares
+from paralelo import numparesP
+from predicados import congruencia
+
+# ============================================================================
+#  PROJETO: MODOS DE RESULTADO (SEM MATERIALIZAR A LISTA)
+# ============================================================================
+#  Os motores de motores.py sempre devolvem a lista (ou o array) de pares,
+#  mas boa parte dos chamadores so usa len(resultado). Cada motor ganha aqui
+#  variantes por modo de resultado:
+#
+#  - lista:      o motor original (referencia).
+#  - contagem:   numero de pares.
+#  - soma:       soma dos pares.
+#  - primeiros:  os k primeiros pares (para no k-esimo).
+#  - iterador:   os pares sob demanda (memoria constante).
+#
+#  Sempre que possivel, sem construir a lista de saida: forma fechada para
+#  range (fatia aritmetica de predicados.congruencia: contagem = len, soma =
+#  progressao aritmetica), np.count_nonzero/np.sum(where=) em arrays,
+#  acumuladores no laco 'for', map/compress em C para a contagem.
+#  Modos sem variante propria caem em generico(), que usa a lista do motor.
+#
+#  benchmark_completo.py --modos mede tempo e pico de memoria de cada
+#  (motor, modo) e compara com o modo lista.
+# ============================================================================
+
+MODOS = ('lista', 'contagem', 'soma', 'primeiros', 'iterador')
+K_PADRAO = 1000
+
+# Bloco do iterador NumPy (elementos filtrados por vez)
+BLOCO_ITERADOR = 1 << 16
+
+# Amostra da validacao: mais de K_PADRAO pares (exercita o corte dos
+# modos 'primeiros') e mais de um bloco do iterador NumPy
+TAMANHO_VALIDACAO = 2 * max(2 * K_PADRAO, BLOCO_ITERADOR) + 1
+
+
+def pares_range(r):
+    """
+    Os pares de um range como fatia do proprio range (sem materializar).
+    """
+    return congruencia(r, 2, 0)
+
+
+def soma_range(r):
+    """
+    Soma de um range em forma fechada (progressao aritmetica).
+    """
+    return len(r) * (r[0] + r[-1]) // 2 if r else 0
+
+
+def generico(nome, modo):
+    """
+    Modo derivado da lista do motor (materializa a saida inteira).
+    """
+    funcao = MOTORES[nome]['funcao']
+    if modo == 'contagem':
+        return lambda l: len(funcao(l))
+    if modo == 'soma':
+        return lambda l: int(sum(funcao(l)))
+    if modo == 'primeiros':
+        return lambda l, k=K_PADRAO: list(funcao(l)[:k])
+    if modo == 'iterador':
+        return lambda l: iter(funcao(l))
+    return funcao
+
+
+# --- for: acumuladores no proprio laco ---
+
+def contar_for(l):
+    """
+    Laco classico contando, sem lista.
+    """
+    total = 0
+    for i in l:
+        if i % 2 == 0:
+            total += 1
+    return total
+
+
+def somar_for(l):
+    """
+    Laco classico acumulando a soma, sem lista.
+    """
+    total = 0
+    for i in l:
+        if i % 2 == 0:
+            total += i
+    return total
+
+
+def primeiros_for(l, k=K_PADRAO):
+    """
+    Laco classico que para no k-esimo par.
+    """
+    pares = []
+    if k <= 0:
+        return pares
+    for i in l:
+        if i % 2 == 0:
+            pares.append(i)
+            if len(pares) == k:
+                break
+    return pares
+
+
+def iterar_for(l):
+    """
+    Laco classico como gerador.
+    """
+    for i in l:
+        if i % 2 == 0:
+            yield i
+
+
+# --- lambda: o mesmo filter, consumido sem list() ---
+
+def contar_lambda(l):
+    return sum(1 for _ in filter(lambda valor: valor % 2 == 0, l))
+
+
+def somar_lambda(l):
+    return sum(filter(lambda valor: valor % 2 == 0, l))
+
+
+def primeiros_lambda(l, k=K_PADRAO):
+    return list(itertools.islice(filter(lambda valor: valor % 2 == 0, l), k))
+
+
+def iterar_lambda(l):
+    return filter(lambda valor: valor % 2 == 0, l)
+
+
+# --- numpy: forma fechada no range, reducoes vetorizadas no array ---
+
+def contar_numpy(l):
+    if isinstance(l, range):
+        return len(pares_range(l))
+    dados = np.asarray(l, dtype=np.int64)
+    return int(np.count_nonzero((dados & 1) == 0))
+
+
+def somar_numpy(l):
+    if isinstance(l, range):
+        return soma_range(pares_range(l))
+    dados = np.asarray(l, dtype=np.int64)
+    return int(np.sum(dados, where=(dados & 1) == 0))
+
+
+def primeiros_numpy(l, k=K_PADRAO):
+    if isinstance(l, range):
+        return list(pares_range(l)[:k])
+    dados = np.asarray(l, dtype=np.int64)
+    saida = []
+    for inicio in range(0, len(dados), BLOCO_ITERADOR):
+        bloco = dados[inicio:inicio + BLOCO_ITERADOR]
+        saida.extend(bloco[(bloco & 1) == 0][:k - len(saida)].tolist())
+        if len(saida) >= k:
+            break
+    return saida
+
+
+def blocos_numpy(dados):
+    for inicio in range(0, len(dados), BLOCO_ITERADOR):
+        bloco = dados[inicio:inicio + BLOCO_ITERADOR]
+        yield from bloco[(bloco & 1) == 0].tolist()
+
+
+def iterar_numpy(l):
+    if isinstance(l, range):
+        return iter(pares_range(l))
+    return blocos_numpy(np.asarray(l, dtype=np.int64))
+
+
+# --- compreensao: expressao geradora no lugar da lista ---
+
+def contar_compreensao(l):
+    return sum(1 for i in l if i % 2 == 0)
+
+
+def somar_compreensao(l):
+    return sum(i for i in l if i % 2 == 0)
+
+
+def primeiros_compreensao(l, k=K_PADRAO):
+    return list(itertools.islice((i for i in l if i % 2 == 0), k))
+
+
+def iterar_compreensao(l):
+    return (i for i in l if i % 2 == 0)
+
+
+# --- compress: seletores em C; a contagem soma os proprios seletores ---
+
+def seletores(l):
+    return map(operator.not_, map((2).__rmod__, l))
+
+
+def contar_compress(l):
+    return sum(seletores(l))
+
+
+def somar_compress(l):
+    return sum(itertools.compress(l, seletores(l)))
+
+
+def primeiros_compress(l, k=K_PADRAO):
+    return list(itertools.islice(itertools.compress(l, seletores(l)), k))
+
+
+def iterar_compress(l):
+    return itertools.compress(l, seletores(l))
+
+
+# --- fatiamento (so range): tudo em forma fechada ---
+
+def contar_fatiamento(l):
+    return len(pares_range(l))
+
+
+def somar_fatiamento(l):
+    return soma_range(pares_range(l))
+
+
+def primeiros_fatiamento(l, k=K_PADRAO):
+    return list(pares_range(l)[:k])
+
+
+def iterar_fatiamento(l):
+    return iter(pares_range(l))
+
+
+# --- paralelo: os trabalhadores so devolvem a contagem ---
+
+def contar_paralelo(l):
+    return numparesP(l, executor_padrao(), contar=True)
+
+
+# motor -> {modo: funcao}; o que faltar vem de generico()
+VARIANTES = {
+    'for': {'contagem': contar_for, 'soma': somar_for, 'primeiros': primeiros_for,
+            'iterador': iterar_for},
+    'lambda': {'contagem': contar_lambda, 'soma': somar_lambda, 'primeiros': primeiros_lambda,
+               'iterador': iterar_lambda},
+    'numpy': {'contagem': contar_numpy, 'soma': somar_numpy, 'primeiros': primeiros_numpy,
+              'iterador': iterar_numpy},
+    'compreensao': {'contagem': contar_compreensao, 'soma': somar_compreensao,
+                    'primeiros': primeiros_compreensao, 'iterador': iterar_compreensao},
+    'compress': {'contagem': contar_compress, 'soma': somar_compress,
+                 'primeiros': primeiros_compress, 'iterador': iterar_compress},
+    'fatiamento': {'contagem': contar_fatiamento, 'soma': somar_fatiamento,
+                   'primeiros': primeiros_fatiamento, 'iterador': iterar_fatiamento},
+    'paralelo': {'contagem': contar_paralelo},
+}
+
+
+def funcao_modo(nome, modo):
+    """
+    Funcao do motor 'nome' no modo pedido (variante propria ou generica).
+    """
+    if modo not in MODOS:
+        raise ValueError(f"modo desconhecido: {modo}")
+    return VARIANTES.get(nome, {}).get(modo) or generico(nome, modo)
+
+
+def esperado(entrada, modo, k=K_PADRAO):
+    """
+    Resultado de referencia do modo, a partir de numpares.
+    """
+    pares = numpares(entrada)
+    return {'lista': pares, 'contagem': len(pares), 'soma': sum(pares),
+            'primeiros': pares[:k], 'iterador': pares}[modo]
+
+
+def executor_modo(nome, modo):
+    """
+    Funcao de uma entrada para o cronometro: o iterador e consumido por
+    inteiro (deque de tamanho 0, sem guardar nada).
+    """
+    funcao = funcao_modo(nome, modo)
+    if modo == 'iterador':
+        return lambda l: deque(funcao(l), maxlen=0)
+    return funcao
+
+
+def medir_modos(motores, n, tipo_entrada='range', modos=MODOS, **opcoes):
+    """
+    Valida e mede cada (motor, modo) em N elementos: tempo (medicao.medir) e
+    pico de memoria (medicao.medir_memoria). Devolve {(motor, modo): resumo
+    com 'pico_bytes' e 'variante' (True se nao for generico), ou None se o
+    modo devolveu um resultado errado}.
+    """
+    entrada = range(n) if tipo_entrada == 'range' else list(range(n))
+    amostra = range(TAMANHO_VALIDACAO) if tipo_entrada == 'range' else list(range(TAMANHO_VALIDACAO))
+    resultados = {}
+    for nome in motores:
+        for modo in modos:
+            saida = funcao_modo(nome, modo)(amostra)
+            if modo in ('lista', 'iterador', 'primeiros'):
+                saida = [int(v) for v in saida]
+            if saida != esperado(amostra, modo):
+                resultados[(nome, modo)] = None
+                continue
+            funcao = executor_modo(nome, modo)
+            resumo = medir(funcao, entrada=entrada, **opcoes)
+            resumo.update(medir_memoria(funcao, entrada=entrada))
+            resumo['variante'] = modo == 'lista' or modo in VARIANTES.get(nome, {})
+            resultados[(nome, modo)] = resumo
+    return resultados
+
+
+def imprimir_modos(resultados, n):
+    """
+    Tempo e pico de memoria de cada modo, e a razao contra o modo lista do
+    mesmo motor. '~' marca modos derivados da lista (generico).
+    """
+    print("=" * 96)
+    print(f"MODOS DE RESULTADO (N={n:,}; razoes contra o modo 'lista' do mesmo motor; ~ = generico)")
+    print("=" * 96)
+    print(f"{'Motor':<13} {'Modo':<11} {'Mediana (ms)':<13} {'Tempo/lista':<12} "
+          f"{'Pico (KiB)':<13} {'Memoria/lista':<14}")
+    print("-" * 96)
+    for (nome, modo), resumo in resultados.items():
+        if resumo is None:
+            print(f"{nome:<13} {modo:<11} [ERRO] resultado diferente da referencia")
+            continue
+        lista = resultados.get((nome, 'lista'))
+        razao_t = f"{resumo['mediana_ms'] / lista['mediana_ms']:.2f}x" if lista else '-'
+        razao_m = (f"{resumo['pico_bytes'] / lista['pico_bytes']:.4f}x"
+                   if lista and lista['pico_bytes'] else '-')
+        rotulo = modo + ('' if resumo['variante'] else '~')
+        print(f"{nome:<13} {rotulo:<11} {resumo['mediana_ms']:<13.2f} {razao_t:<12} "
+              f"{resumo['pico_bytes'] / 1024:<13.1f} {razao_m:<14}")
+    print("=" * 96)
@@ -0,0 +1,207 @@
+import atexit
+import itertools
+import operator
+
+import numpy as np
+
+from paralelo import criar_executor, numparesP
+
+# ============================================================================
+#  PROJETO: REGISTRO DE MOTORES DE FILTRAGEM
+# ============================================================================
+#  Cada estrategia de filtragem de pares e registrada com o decorador
+#  @registrar, declarando:
+#  - nome: chave usada nos relatorios e no resultados.json;
+#  - entradas: tipos de entrada suportados ('range', 'list');
+#  - oraculo: funcao (entrada, saida) -> bool que valida a saida. O padrao
+#    compara com a referencia numpares;
+#  - multiprocesso: o trabalho roda em outros processos (ver contadores.py:
+#    os contadores do proprio processo nao o enxergam);
+#  - construcao_range: com entrada range, a resposta e construida pela
+#    progressao aritmetica (passo 2) sem ler nem testar dado algum — o tempo
+#    e de alocacao, nao de filtragem. As tabelas marcam esses motores, e
+#    'numpy_mascara' mede o NumPy filtrando um array materializado.
+#
+#  Os benchmarks descobrem todos os motores registrados, validam cada um
+#  contra a referencia e medem em toda a varredura de N — basta registrar
+#  uma nova funcao para que ela entre na comparacao.
+# ============================================================================
+
+# nome -> {'nome', 'funcao', 'entradas', 'oraculo', 'descricao', 'multiprocesso',
+#         'construcao_range'}
+MOTORES = {}
+
+TIPOS_ENTRADA = ('range', 'list')
+
+
+def oraculo_referencia(entrada, saida):
+    """
+    Oraculo padrao: mesma sequencia de pares que numpares (a referencia).
+    """
+    return list(saida) == numpares(entrada)
+
+
+def registrar(nome, entradas=TIPOS_ENTRADA, oraculo=oraculo_referencia, descricao='',
+              multiprocesso=False, construcao_range=False):
+    """
+    Decorador que registra um motor de filtragem no MOTORES.
+    """
+    def decorador(funcao):
+        if nome in MOTORES:
+            raise ValueError(f"motor ja registrado: {nome}")
+        MOTORES[nome] = {'nome': nome, 'funcao': funcao, 'entradas': tuple(entradas),
+                         'oraculo': oraculo, 'multiprocesso': multiprocesso,
+                         'construcao_range': construcao_range,
+                         'descricao': descricao or (funcao.__doc__ or '').strip().splitlines()[0]}
+        return funcao
+    return decorador
+
+
+def gerar_entrada(tipo, n):
+    """
+    Constroi a entrada 0..n-1 no tipo pedido.
+    """
+    if tipo == 'range':
+        return range(n)
+    if tipo == 'list':
+        return list(range(n))
+    raise ValueError(f"tipo de entrada desconhecido: {tipo}")
+
+
+def motores_para(tipo):
+    """
+    Motores registrados que aceitam o tipo de entrada 'tipo' (na ordem de registro).
+    """
+    return {nome: m for nome, m in MOTORES.items() if tipo in m['entradas']}
+
+
+def validar(nome, entrada):
+    """
+    Executa o motor sobre 'entrada' e aplica o seu oraculo.
+    """
+    motor = MOTORES[nome]
+    return motor['oraculo'](entrada, motor['funcao'](entrada))
+
+
+def validar_todos(n=1_001):
+    """
+    Valida todos os motores em todos os tipos de entrada que declaram.
+    Devolve {(nome, tipo): bool}. O N impar cobre a borda final da fatia.
+    """
+    return {(nome, tipo): validar(nome, gerar_entrada(tipo, n))
+            for nome, motor in MOTORES.items() for tipo in motor['entradas']}
+
+
+# ============================================================================
+#  MOTORES REGISTRADOS
+# ============================================================================
+
+@registrar('for')
+def numpares(l):
+    """
+    Logica 1: Abordagem Imperativa (Classica)
+    Percorre a lista item a item e verifica a condicao. Referencia dos oraculos.
+    """
+    pares = []                  # Inicializa lista vazia
+
+    # --- Processamento do Loop ---
+    for i in l:
+        if i % 2 == 0:          # Criterio: Verifica se e par
+            pares.append(i)     # Acao: Adiciona a lista final
+
+    return pares
+
+
+@registrar('lambda')
+def numparesL(l):
+    """
+    Logica 2: Abordagem Funcional (Pythonic)
+    Utiliza filter() e lambda; overhead de uma chamada de funcao por item.
+    """
+    # filter gera o iterador, list materializa os dados na memoria
+    return list(filter(lambda valor: valor % 2 == 0, l))
+
+
+@registrar('numpy', construcao_range=True)
+def numparesN(l):
+    """
+    Logica 3: Abordagem Vetorizada (NumPy)
+    Filtra sobre um buffer contiguo int64, sem laco no interpretador.
+    Range conhecido vira progressao aritmetica; o resto usa mascara booleana.
+    """
+    if isinstance(l, range):
+        # O primeiro par define a progressao (passo 2*step), equivalente a
+        # uma visao com stride 2 sobre np.arange(...)
+        desloc = 0 if l.start % 2 == 0 else 1
+        if l.step % 2 == 0:
+            # Passo par: todos os elementos tem a paridade do inicio
+            if desloc == 0:
+                return np.arange(l.start, l.stop, l.step, dtype=np.int64)
+            return np.empty(0, dtype=np.int64)
+        return np.arange(l.start + desloc * l.step, l.stop, 2 * l.step, dtype=np.int64)
+
+    # Caso geral: mascara booleana sobre o buffer contiguo
+    dados = np.asarray(l, dtype=np.int64)
+    return dados[dados % 2 == 0]
+
+
+@registrar('numpy_mascara', entradas=('range',))
+def numparesNM(l):
+    """
+    Logica 3b: NumPy com mascara booleana sobre o range materializado
+    (np.arange + teste de paridade): a filtragem de verdade, sem o atalho
+    da progressao aritmetica. O np.arange em C e a parte barata; o custo
+    medido e o de ler, testar e compactar cada elemento.
+    """
+    dados = np.arange(l.start, l.stop, l.step, dtype=np.int64)
+    return dados[dados % 2 == 0]
+
+
+@registrar('compreensao')
+def numparesLC(l):
+    """
+    Logica 4: List comprehension (laco compilado num unico bytecode de lista).
+    """
+    return [i for i in l if i % 2 == 0]
+
+
+@registrar('compress')
+def numparesI(l):
+    """
+    Logica 5: itertools.compress com seletores calculados em C (map + operator).
+    """
+    # Seletor: not (i % 2), sem lambda — (2).__rmod__(i) == i % 2
+    return list(itertools.compress(l, map(operator.not_, map((2).__rmod__, l))))
+
+
+@registrar('fatiamento', entradas=('range',), construcao_range=True)
+def numparesF(l):
+    """
+    Logica 6: Fatiamento com passo sobre um range (aritmetica, sem teste por item).
+    """
+    if l.step % 2 == 0:
+        return list(l) if l.start % 2 == 0 else []
+    # Pula o primeiro elemento se for impar e pega um a cada dois
+    return list(l[l.start % 2::2])
+
+
+# --- Pool de processos do motor paralelo (criado sob demanda) ---
+_executor = None
+
+def executor_padrao():
+    """
+    Pool compartilhado pelo motor 'paralelo', encerrado ao sair do programa.
+    """
+    global _executor
+    if _executor is None:
+        _executor = criar_executor()
+        atexit.register(_executor.shutdown)
+    return _executor
+
+
+@registrar('paralelo', multiprocesso=True)
+def numparesParalelo(l):
+    """
+    Logica 7: Abordagem Paralela (processos; ver paralelo.py).
+    """
+    return numparesP(l, executor_padrao())
@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+
+from medicao import medir, medir_memoria, resumir
+from motores import MOTORES, gerar_entrada, motores_para
+from resultados import salvar_medicoes
+
+# ============================================================================
+#  PROJETO: ORQUESTRADOR DE BENCHMARKS EM SUBPROCESSOS ISOLADOS
+# ============================================================================
+#  Em benchmark_completo.py todos os motores rodam no mesmo interpretador:
+#  o heap deixado pela lambda com 50 milhoes de itens pesa na medicao
+#  seguinte. Aqui cada celula (motor, N, repeticao) roda num processo novo:
+#
+#  - Filho: 'python orquestrador.py --celula JSON' gera a entrada, faz 1
+#    aquecimento e 1 amostra cronometrada (medicao.medir) e escreve uma
+#    linha JSON no stdout. A repeticao 0 tambem mede o perfil de memoria,
+#    depois da amostra.
+#  - Pai (asyncio): no maximo --paralelos filhos ao mesmo tempo, cada um
+#    preso a um nucleo livre diferente (sched_setaffinity antes do exec) e
+#    com RLIMIT_AS = --memoria-max. As celulas mais caras (maior N) saem
+#    primeiro, para a matriz terminar mais cedo.
+#  - Tempo limite por celula (--tempo-max): o filho e morto e a celula
+#    fica registrada como 'tempo esgotado'; estouro de memoria vira
+#    'memoria'. As demais celulas seguem.
+#  - Diario (orquestrador_diario.jsonl): uma linha por celula concluida.
+#    Com --retomar, uma execucao interrompida continua de onde parou (as
+#    celulas que falharam sao refeitas).
+#
+#  No final, as repeticoes de cada (motor, N) viram um resumo de
+#  medicao.resumir e sao gravadas em resultados.json. Com mais de um filho
+#  simultaneo, os processos ainda disputam cache L3 e memoria:
+#  --paralelos 1 da os numeros mais limpos.
+# ============================================================================
+
+DIARIO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'orquestrador_diario.jsonl')
+VALORES_PADRAO = (10**5, 10**6, 5*10**6, 10**7, 5*10**7)
+REPETICOES_PADRAO = 5
+TEMPO_MAX_PADRAO = 300.0
+MEMORIA_MAX_PADRAO = 8 * 1024**3
+
+# Campos de medicao.medir_memoria devolvidos pela repeticao 0
+CAMPOS_MEMORIA_CELULA = ('pico_bytes', 'retido_bytes', 'rss_delta_bytes', 'blocos_retidos')
+
+# 'paralelo' abre o proprio pool de processos: preso a um nucleo, nao faz sentido
+EXCLUIDOS_PADRAO = ('paralelo',)
+
+
+# ============================================================================
+#  FILHO: UMA CELULA POR PROCESSO
+# ============================================================================
+
+def executar_celula(celula):
+    """
+    Mede uma repeticao de (motor, N) no processo atual. Devolve o
+    dicionario escrito no stdout do filho.
+    """
+    motor = MOTORES[celula['motor']]
+    entrada = gerar_entrada(celula['entrada'], celula['n'])
+    try:
+        resumo = medir(motor['funcao'], entrada=entrada, aquecimento=1, min_repeticoes=1,
+                       max_repeticoes=1, guardar_resultado=True)
+        linha = dict(celula, status='ok', amostra_ns=resumo['amostras_ns'][0],
+                     tamanho_resultado=len(resumo.pop('resultado')))
+        if celula.get('memoria'):
+            linha.update(medir_memoria(motor['funcao'], entrada=entrada))
+    except MemoryError:
+        linha = dict(celula, status='memoria')
+    return linha
+
+
+# ============================================================================
+#  PAI: AGENDAMENTO ASSINCRONO
+# ============================================================================
+
+def chave_celula(celula):
+    """
+    Identificador da celula no diario.
+    """
+    return f"{celula['motor']}|{celula['entrada']}|{celula['n']}|{celula['repeticao']}"
+
+
+def ler_diario(caminho):
+    """
+    Celulas ja concluidas no diario: {chave: linha}. Linhas truncadas (o
+    processo morreu no meio da escrita) sao ignoradas.
+    """
+    concluidas = {}
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            for texto in f:
+                try:
+                    linha = json.loads(texto)
+                except json.JSONDecodeError:
+                    continue
+                concluidas[chave_celula(linha)] = linha
+    return concluidas
+
+
+def limitar_filho(nucleo, memoria_max):
+    """
+    preexec_fn do filho: prende ao nucleo e limita o espaco de enderecos.
+    """
+    def preparar():
+        if nucleo is not None:
+            os.sched_setaffinity(0, {nucleo})
+        if memoria_max:
+            resource.setrlimit(resource.RLIMIT_AS, (memoria_max, memoria_max))
+    return preparar
+
+
+async def rodar_filho(celula, nucleo, tempo_max, memoria_max):
+    """
+    Roda uma celula num subprocesso e le a linha JSON do seu stdout.
+    """
+    processo = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), '--celula', json.dumps(celula),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        preexec_fn=limitar_filho(nucleo, memoria_max))
+    try:
+        saida, erro = await asyncio.wait_for(processo.communicate(), tempo_max)
+    except asyncio.TimeoutError:
+        processo.kill()
+        await processo.wait()
+        return dict(celula, status='tempo esgotado')
+
+    for texto in reversed(saida.decode('utf-8').splitlines()):
+        if texto.startswith('{'):
+            return json.loads(texto)
+    status = 'memoria' if b'MemoryError' in erro else f"falhou ({processo.returncode})"
+    return dict(celula, status=status, erro=erro.decode('utf-8', 'replace')[-500:])
+
+
+async def orquestrar(celulas, paralelos, tempo_max, memoria_max, diario):
+    """
+    Executa as celulas com no maximo 'paralelos' filhos, cada um num nucleo
+    livre, gravando cada resultado no diario assim que chega.
+    """
+    nucleos = asyncio.Queue()
+    afinidade = sorted(os.sched_getaffinity(0))
+    for i in range(paralelos):
+        nucleos.put_nowait(afinidade[i % len(afinidade)] if paralelos <= len(afinidade) else None)
+
+    total, feitas = len(celulas), 0
+    inicio = time.perf_counter()
+
+    async def tarefa(celula):
+        nonlocal feitas
+        nucleo = await nucleos.get()
+        try:
+            linha = await rodar_filho(celula, nucleo, tempo_max, memoria_max)
+        finally:
+            nucleos.put_nowait(nucleo)
+        diario.write(json.dumps(linha) + '\n')
+        diario.flush()
+        feitas += 1
+        tempo = f"{linha['amostra_ns'] / 1e6:10.1f} ms" if linha['status'] == 'ok' else linha['status']
+        print(f"[{feitas}/{total}] {celula['motor']:<12} N={celula['n']:<12,} "
+              f"rep {celula['repeticao']} (nucleo {nucleo}): {tempo}")
+        return linha
+
+    linhas = await asyncio.gather(*(tarefa(c) for c in celulas))
+    print(f"Matriz concluida em {time.perf_counter() - inicio:.1f} s")
+    return linhas
+
+
+def montar_celulas(nomes, valores, repeticoes, tipo_entrada='range', memoria=True):
+    """
+    Todas as celulas (motor, N, repeticao), as de maior N primeiro.
+    """
+    celulas = [{'motor': nome, 'n': n, 'entrada': tipo_entrada, 'repeticao': r,
+                'memoria': memoria and r == 0}
+               for n in valores for nome in nomes for r in range(repeticoes)]
+    return sorted(celulas, key=lambda c: (-c['n'], c['repeticao'], c['motor']))
+
+
+def agregar(linhas):
+    """
+    Junta as repeticoes bem-sucedidas de cada (motor, N) num resumo no
+    formato de medicao.py. Devolve (medicoes, falhas).
+    """
+    por_celula, falhas = {}, []
+    for linha in linhas:
+        if linha['status'] != 'ok':
+            falhas.append(linha)
+            continue
+        por_celula.setdefault((linha['motor'], linha['n']), []).append(linha)
+
+    medicoes = {}
+    for chave, reps in por_celula.items():
+        reps.sort(key=lambda l: l['repeticao'])
+        resumo = resumir([l['amostra_ns'] for l in reps])
+        resumo['tamanho_resultado'] = reps[0]['tamanho_resultado']
+        for l in reps:
+            resumo.update({campo: l[campo] for campo in CAMPOS_MEMORIA_CELULA if campo in l})
+        medicoes[chave] = resumo
+    return medicoes, falhas
+
+
+def executar(nomes, valores, repeticoes, paralelos, tempo_max, memoria_max,
+             caminho_diario=DIARIO_PADRAO, retomar=False):
+    """
+    Roda (ou retoma) a matriz inteira e devolve (medicoes, falhas, novas):
+    'novas' agrega so as celulas medidas agora (fora as ja no diario).
+    """
+    celulas = montar_celulas(nomes, valores, repeticoes)
+    # Celulas que falharam (tempo, memoria) sao refeitas ao retomar
+    concluidas = ({chave: linha for chave, linha in ler_diario(caminho_diario).items()
+                   if linha['status'] == 'ok'} if retomar else {})
+    pendentes = [c for c in celulas if chave_celula(c) not in concluidas]
+    print(f"{len(celulas)} celulas ({len(celulas) - len(pendentes)} ja no diario), "
+          f"{paralelos} filho(s) simultaneo(s), tempo max {tempo_max:.0f} s, "
+          f"memoria max {memoria_max / 1024**3:.1f} GiB")
+
+    # Reescreve o diario so com as linhas validas (descarta uma linha truncada)
+    with open(caminho_diario, 'w', encoding='utf-8') as diario:
+        for linha in concluidas.values():
+            diario.write(json.dumps(linha) + '\n')
+        novas = asyncio.run(orquestrar(pendentes, paralelos, tempo_max, memoria_max, diario))
+
+    chaves = {chave_celula(c) for c in celulas}
+    anteriores = [linha for chave, linha in concluidas.items() if chave in chaves]
+    medicoes, falhas = agregar(anteriores + novas)
+    return medicoes, falhas, agregar(novas)[0]
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Matriz de benchmarks com uma celula por subprocesso")
+    parser.add_argument('--celula', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--motores', default=None,
+                        help="motores separados por virgula (padrao: todos para range, menos paralelo)")
+    parser.add_argument('--valores', default=','.join(map(str, VALORES_PADRAO)),
+                        help="valores de N separados por virgula")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO,
+                        help="repeticoes (subprocessos) por celula (motor, N)")
+    parser.add_argument('--paralelos', type=int, default=len(os.sched_getaffinity(0)),
+                        help="filhos simultaneos, um por nucleo (padrao: nucleos disponiveis)")
+    parser.add_argument('--tempo-max', type=float, default=TEMPO_MAX_PADRAO,
+                        help="tempo limite de cada subprocesso em segundos")
+    parser.add_argument('--memoria-max', type=float, default=MEMORIA_MAX_PADRAO / 1024**3,
+                        help="limite de espaco de enderecos de cada filho em GiB (0 = sem limite)")
+    parser.add_argument('--diario', default=DIARIO_PADRAO, help="arquivo do diario de celulas")
+    parser.add_argument('--retomar', '--resume', action='store_true',
+                        help="pula as celulas ja concluidas no diario")
+    args = parser.parse_args()
+
+    if args.celula is not None:
+        print(json.dumps(executar_celula(json.loads(args.celula))), flush=True)
+        sys.exit(0)
+
+    nomes = (args.motores.split(',') if args.motores
+             else [nome for nome in motores_para('range') if nome not in EXCLUIDOS_PADRAO])
+    desconhecidos = [nome for nome in nomes if nome not in MOTORES]
+    if desconhecidos:
+        parser.error(f"motores nao registrados: {', '.join(desconhecidos)}")
+    valores = [int(v) for v in args.valores.split(',')]
+
+    medicoes, falhas, novas = executar(nomes, valores, args.repeticoes, max(args.paralelos, 1),
+                                args.tempo_max, int(args.memoria_max * 1024**3),
+                                args.diario, args.retomar)
+    for linha in falhas:
+        print(f"[ERRO] {linha['motor']} N={linha['n']:,} rep {linha['repeticao']}: {linha['status']}")
+    if medicoes:
+        # O historico colunar so recebe as repeticoes medidas nesta rodada
+        chave = salvar_medicoes(medicoes, tipo_entrada='range', historico=novas)
+        print(f"\nResultados gravados em resultados.json (execucao '{chave}')")
@@ -0,0 +1,256 @@
+import mmap
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from medicao import medir
+
+# ============================================================================
+#  PROJETO: FILTRO PARALELO (MULTIPLOS NUCLEOS)
+# ============================================================================
+#  Divide a entrada em fatias e distribui entre processos trabalhadores
+#  (ProcessPoolExecutor). Cada fatia roda o mesmo laco 'for' de numpares.
+#
+#  - Entrada range: cada trabalhador recebe apenas (inicio, fim, passo);
+#    nenhuma lista e serializada.
+#  - Outras entradas: a fatia e serializada (pickle) para o trabalhador.
+#  - contar=True: cada fatia devolve so a contagem, sem juntar listas.
+#
+#  Entrada compartilhada (zero-copia):
+#  - O conjunto de dados vive num bloco int64 em multiprocessing.shared_memory
+#    ou num arquivo mapeado (mmap). Os trabalhadores se anexam pelo nome e
+#    percorrem a sua fatia via memoryview, sem copiar nem serializar dados.
+#  - O custo de preparo (alocacao + preenchimento, anexacao) e medido
+#    separado do custo de filtragem.
+#
+#  Varreduras de escalabilidade:
+#  - Forte: N fixo, 1..os.cpu_count() trabalhadores (speedup = T1 / Tp).
+#  - Fraca: N proporcional ao numero de trabalhadores (eficiencia = T1 / Tp).
+# ============================================================================
+
+def filtrar_intervalo(inicio, fim, passo, contar=False):
+    """
+    Trabalhador para range: reconstroi a fatia a partir dos limites.
+    """
+    if contar:
+        total = 0
+        for i in range(inicio, fim, passo):
+            if i % 2 == 0:
+                total += 1
+        return total
+    pares = []
+    for i in range(inicio, fim, passo):
+        if i % 2 == 0:
+            pares.append(i)
+    return pares
+
+def filtrar_fatia(fatia, contar=False):
+    """
+    Trabalhador para listas: recebe a fatia ja serializada.
+    """
+    if contar:
+        return sum(1 for i in fatia if i % 2 == 0)
+    pares = []
+    for i in fatia:
+        if i % 2 == 0:
+            pares.append(i)
+    return pares
+
+def dividir_range(r, partes):
+    """
+    Divide um range em ate 'partes' sub-ranges contiguos, como tuplas
+    (inicio, fim, passo) que preservam a ordem original.
+    """
+    tamanho = len(r)
+    partes = max(1, min(partes, tamanho))
+    limites = []
+    for k in range(partes):
+        a = k * tamanho // partes
+        b = (k + 1) * tamanho // partes
+        sub = r[a:b]
+        limites.append((sub.start, sub.stop, sub.step))
+    return limites
+
+def criar_executor(trabalhadores=None):
+    """
+    Pool de processos reutilizavel (a criacao fica fora da regiao medida).
+    """
+    return ProcessPoolExecutor(max_workers=trabalhadores or os.cpu_count())
+
+def numparesP(l, executor, trabalhadores=None, contar=False):
+    """
+    Logica 4: Abordagem Paralela (processos)
+    Filtra as fatias em paralelo e junta os resultados na ordem original.
+    Com contar=True devolve apenas o total de pares.
+    """
+    if len(l) == 0:
+        return 0 if contar else []
+    trabalhadores = trabalhadores or os.cpu_count()
+    if isinstance(l, range):
+        futuros = [executor.submit(filtrar_intervalo, a, b, p, contar)
+                   for a, b, p in dividir_range(l, trabalhadores)]
+    else:
+        passo = -(-len(l) // trabalhadores)
+        futuros = [executor.submit(filtrar_fatia, l[k:k + passo], contar)
+                   for k in range(0, len(l), passo)]
+
+    if contar:
+        return sum(f.result() for f in futuros)
+    pares = []
+    for f in futuros:
+        pares.extend(f.result())   # Junta na ordem das fatias
+    return pares
+
+def varrer_escalabilidade(n_base, modo='forte', max_trabalhadores=None, contar=False, **opcoes):
+    """
+    Mede numparesP para 1..max_trabalhadores processos.
+
+    - modo='forte': N = n_base fixo.
+    - modo='fraca': N = n_base * trabalhadores (carga constante por processo).
+
+    Devolve lista de dicionarios com trabalhadores, n, mediana_ms,
+    speedup e eficiencia (relativos a execucao com 1 trabalhador).
+    """
+    max_trabalhadores = max_trabalhadores or os.cpu_count()
+    linhas = []
+    base = None
+    for p in range(1, max_trabalhadores + 1):
+        n = n_base if modo == 'forte' else n_base * p
+        with criar_executor(p) as executor:
+            resumo = medir(lambda dados: numparesP(dados, executor, p, contar),
+                           entrada=range(n), **opcoes)
+        t = resumo['mediana_ms']
+        if base is None:
+            base = t
+        # Forte: speedup = T1/Tp. Fraca: o ideal e tempo constante, entao
+        # o speedup equivalente e p * T1/Tp.
+        speedup = base / t if modo == 'forte' else p * base / t
+        linhas.append({'trabalhadores': p, 'n': n, 'mediana_ms': t,
+                       'speedup': speedup, 'eficiencia': speedup / p,
+                       'resumo': resumo})
+    return linhas
+
+# ============================================================================
+#  ENTRADA COMPARTILHADA (shared_memory / mmap)
+# ============================================================================
+
+# Bloco usado para preencher o buffer sem criar um array temporario de N itens
+TAMANHO_PREENCHIMENTO = 1 << 20
+
+# Anexos abertos em cada processo trabalhador: nome -> (objeto, memoryview)
+_anexos = {}
+
+def criar_entrada_compartilhada(n, tipo='shm', diretorio=None):
+    """
+    Aloca N inteiros int64 (0..n-1) fora do heap do Python.
+
+    - tipo='shm': bloco em multiprocessing.shared_memory.
+    - tipo='mmap': arquivo temporario mapeado em memoria (em 'diretorio').
+
+    Devolve (descritor, recurso). O descritor e um dicionario pequeno e
+    serializavel, que os trabalhadores usam para se anexar.
+    """
+    tamanho = max(n, 1) * 8
+    if tipo == 'shm':
+        recurso = shared_memory.SharedMemory(create=True, size=tamanho)
+        dados = np.ndarray((n,), dtype=np.int64, buffer=recurso.buf)
+        nome = recurso.name
+    elif tipo == 'mmap':
+        descritor_arq, nome = tempfile.mkstemp(suffix='.int64', dir=diretorio)
+        os.close(descritor_arq)
+        dados = np.memmap(nome, dtype=np.int64, mode='w+', shape=(max(n, 1),))
+        recurso = dados
+    else:
+        raise ValueError(f"tipo de entrada compartilhada desconhecido: {tipo}")
+
+    # Preenche em blocos (sem array temporario do tamanho de N)
+    for inicio in range(0, n, TAMANHO_PREENCHIMENTO):
+        fim = min(inicio + TAMANHO_PREENCHIMENTO, n)
+        dados[inicio:fim] = np.arange(inicio, fim, dtype=np.int64)
+    if tipo == 'mmap':
+        dados.flush()
+    del dados
+    return {'tipo': tipo, 'nome': nome, 'n': n}, recurso
+
+def liberar_entrada_compartilhada(descritor, recurso):
+    """
+    Fecha e remove o bloco compartilhado (ou o arquivo mapeado).
+    """
+    if descritor['tipo'] == 'shm':
+        recurso.close()
+        recurso.unlink()
+    else:
+        recurso._mmap.close()
+        os.remove(descritor['nome'])
+
+def anexar(descritor):
+    """
+    Anexa o processo atual ao buffer pelo nome (uma vez por processo) e
+    devolve uma memoryview de int64 sobre ele.
+    """
+    nome = descritor['nome']
+    if nome not in _anexos:
+        if descritor['tipo'] == 'shm':
+            # Trabalhadores do pool compartilham o resource_tracker do pai;
+            # quem cria o bloco e o responsavel por remove-lo (unlink)
+            objeto = shared_memory.SharedMemory(name=nome)
+            visao = objeto.buf.cast('q')
+        else:
+            with open(nome, 'rb') as arquivo:
+                objeto = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            visao = memoryview(objeto).cast('q')
+        _anexos[nome] = (objeto, visao[:descritor['n']])
+    return _anexos[nome][1]
+
+def filtrar_compartilhado(descritor, inicio, fim, contar=False):
+    """
+    Trabalhador zero-copia: percorre dados[inicio:fim] direto no buffer.
+    Devolve (resultado, ns gastos anexando, pid, pico RSS em KiB).
+    """
+    t0 = time.perf_counter_ns()
+    dados = anexar(descritor)
+    anexo_ns = time.perf_counter_ns() - t0
+
+    fatia = dados[inicio:fim]   # memoryview: fatia sem copia
+    if contar:
+        resultado = 0
+        for i in fatia:
+            if i % 2 == 0:
+                resultado += 1
+    else:
+        resultado = []
+        for i in fatia:
+            if i % 2 == 0:
+                resultado.append(i)
+    pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return resultado, anexo_ns, os.getpid(), pico_kb
+
+def numparesC(descritor, executor, trabalhadores=None, contar=False, estatisticas=None):
+    """
+    Logica 5: Abordagem Paralela sobre entrada compartilhada (zero-copia).
+    Cada trabalhador recebe so o descritor e os limites da sua fatia.
+
+    Se 'estatisticas' for um dicionario, acumula nele 'anexo_ns' (tempo
+    total de anexacao) e 'pico_kb' ({pid: pico RSS} de cada trabalhador).
+    """
+    trabalhadores = trabalhadores or os.cpu_count()
+    futuros = [executor.submit(filtrar_compartilhado, descritor, a, b, contar)
+               for a, b, _ in dividir_range(range(descritor['n']), trabalhadores)]
+
+    total = 0 if contar else []
+    for f in futuros:
+        resultado, anexo_ns, pid, pico_kb = f.result()
+        if contar:
+            total += resultado
+        else:
+            total.extend(resultado)
+        if estatisticas is not None:
+            estatisticas['anexo_ns'] = estatisticas.get('anexo_ns', 0) + anexo_ns
+            picos = estatisticas.setdefault('pico_kb', {})
+            picos[pid] = max(picos.get(pid, 0), pico_kb)
+    return total
@@ -0,0 +1,211 @@
+import argparse
+import os
+import struct
+import sys
+from collections import Counter
+
+from motores import MOTORES, gerar_entrada
+
+# ============================================================================
+#  PROJETO: PERFIL DO INTERPRETADOR POR ELEMENTO
+# ============================================================================
+#  Alem do tempo de parede, mostra o que o interpretador faz por elemento em
+#  cada motor (por padrao numpares vs numparesL), num N de amostra:
+#
+#  - chamadas: eventos 'call' (funcoes Python) e 'c_call' (funcoes e metodos
+#    embutidos, ex.: list.append) de sys.setprofile. Chamadas a tipos, como
+#    list(...) e filter(...), nao geram 'c_call' e ficam de fora;
+#  - instrucoes: bytecodes executados (sys.settrace com f_trace_opcodes);
+#  - redimensionamentos: crescimentos do buffer da lista de saida, inferidos
+#    da capacidade final (sys.getsizeof) pela regra de list_resize do
+#    CPython. Lista pre-alocada (list(range), fatia) tem 0.
+#
+#  Cada execucao tambem gera um arquivo de pilhas colapsadas
+#  ("motor;funcao;funcao peso", formato do flamegraph.pl/speedscope) em
+#  relatorios/perfil/<motor>.folded. O peso e o numero de bytecodes
+#  executados com aquela pilha no topo; cada chamada a uma funcao C soma 1
+#  (o trabalho em C nao aparece como bytecode).
+#
+#  O rastreamento deixa o codigo dezenas de vezes mais lento: ele so e
+#  ligado dentro de perfilar() e nunca durante as medicoes de medicao.py,
+#  cujos tempos (e o cache) nao sao afetados.
+# ============================================================================
+
+SAIDA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'relatorios', 'perfil')
+N_PADRAO = 10_000
+MOTORES_PADRAO = ('for', 'lambda')
+
+# Tamanho de um ponteiro (cada posicao do buffer de uma lista)
+PONTEIRO = struct.calcsize('P')
+
+
+def capacidade_lista(lista):
+    """
+    Posicoes alocadas no buffer da lista (>= len(lista)).
+    """
+    return (sys.getsizeof(lista) - sys.getsizeof([])) // PONTEIRO
+
+
+def crescimento_append(k):
+    """
+    Simula k appends numa lista vazia com a regra de list_resize (3.9+).
+    Devolve (redimensionamentos, capacidade final).
+    """
+    alocado, redimensionamentos = 0, 0
+    for tamanho in range(1, k + 1):
+        if tamanho > alocado:
+            # new_allocated = (newsize + (newsize >> 3) + 6) & ~3
+            alocado = (tamanho + (tamanho >> 3) + 6) & ~3
+            redimensionamentos += 1
+    return redimensionamentos, alocado
+
+
+def redimensionamentos_saida(saida):
+    """
+    Redimensionamentos da lista de saida: os da sequencia de appends quando a
+    capacidade final bate com ela, 0 se a lista foi alocada de uma vez e None
+    se a saida nao for uma lista (ex.: array NumPy).
+    """
+    if type(saida) is not list:
+        return None
+    redimensionamentos, capacidade = crescimento_append(len(saida))
+    return redimensionamentos if capacidade == capacidade_lista(saida) else 0
+
+
+def nome_quadro(codigo):
+    """
+    Nome de um quadro Python na pilha colapsada (sem ';' nem espacos).
+    """
+    nome = getattr(codigo, 'co_qualname', codigo.co_name)
+    return f"{nome}:{os.path.basename(codigo.co_filename)}".replace(';', ',').replace(' ', '_')
+
+
+def nome_c(funcao):
+    """
+    Nome de uma funcao C na pilha colapsada (ex.: list.append).
+    """
+    nome = getattr(funcao, '__qualname__', None) or getattr(funcao, '__name__', repr(funcao))
+    return nome.replace(';', ',').replace(' ', '_')
+
+
+def perfilar(nome, funcao, entrada):
+    """
+    Executa funcao(entrada) uma vez sob sys.setprofile + sys.settrace.
+    Devolve (contagens, pilhas): contagens com 'chamadas_py', 'chamadas_c',
+    'instrucoes' e a saida; pilhas e um Counter {pilha colapsada: peso}.
+    """
+    pilha = [nome]
+    pilhas = Counter()
+    contagens = Counter()
+    alvo = funcao.__code__
+    ativo = [False]
+
+    def perfil(quadro, evento, arg):
+        if evento == 'call':
+            if quadro.f_code is alvo and not ativo[0]:
+                ativo[0] = True
+            elif not ativo[0]:
+                return
+            pilha.append(nome_quadro(quadro.f_code))
+            contagens['chamadas_py'] += 1
+        elif not ativo[0]:
+            return
+        elif evento == 'return':
+            pilha.pop()
+            if len(pilha) == 1:
+                ativo[0] = False
+        elif evento == 'c_call':
+            pilha.append(nome_c(arg))
+            contagens['chamadas_c'] += 1
+            pilhas[';'.join(pilha)] += 1
+        else:                                   # c_return / c_exception
+            pilha.pop()
+
+    def rastro_local(quadro, evento, arg):
+        if evento == 'opcode' and ativo[0]:
+            contagens['instrucoes'] += 1
+            pilhas[';'.join(pilha)] += 1
+        return rastro_local
+
+    def rastro(quadro, evento, arg):
+        quadro.f_trace_opcodes = True
+        return rastro_local
+
+    perfil_anterior, rastro_anterior = sys.getprofile(), sys.gettrace()
+    sys.setprofile(perfil)
+    sys.settrace(rastro)
+    try:
+        saida = funcao(entrada)
+    finally:
+        sys.settrace(rastro_anterior)
+        sys.setprofile(perfil_anterior)
+    contagens['saida'] = saida
+    return contagens, pilhas
+
+
+def perfilar_motor(nome, n=N_PADRAO, tipo_entrada='range', saida=SAIDA_PADRAO):
+    """
+    Perfil por elemento de um motor registrado; grava <saida>/<nome>.folded.
+    Devolve {'motor', 'n', 'chamadas', 'instrucoes', 'redimensionamentos',
+    'por_elemento': {...}, 'arquivo'}.
+    """
+    funcao = MOTORES[nome]['funcao']
+    contagens, pilhas = perfilar(nome, funcao, gerar_entrada(tipo_entrada, n))
+
+    os.makedirs(saida, exist_ok=True)
+    arquivo = os.path.join(saida, f"{nome}.folded")
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        for pilha, peso in sorted(pilhas.items()):
+            f.write(f"{pilha} {peso}\n")
+
+    chamadas = contagens['chamadas_py'] + contagens['chamadas_c']
+    redimensionamentos = redimensionamentos_saida(contagens['saida'])
+    return {'motor': nome, 'n': n, 'chamadas': chamadas, 'chamadas_c': contagens['chamadas_c'],
+            'instrucoes': contagens['instrucoes'], 'redimensionamentos': redimensionamentos,
+            'por_elemento': {'chamadas': chamadas / n, 'instrucoes': contagens['instrucoes'] / n,
+                             'redimensionamentos': None if redimensionamentos is None
+                             else redimensionamentos / n},
+            'arquivo': arquivo}
+
+
+def imprimir_perfis(perfis):
+    """
+    Tabela de custo por elemento no interpretador, um motor por linha.
+    """
+    print("=" * 96)
+    print(f"PERFIL DO INTERPRETADOR POR ELEMENTO (N = {perfis[0]['n']:,})")
+    print("=" * 96)
+    print(f"{'Motor':<13} {'Chamadas':<11} {'(em C)':<9} {'Bytecodes':<11} {'Redim.':<8} "
+          f"{'Cham./elem':<11} {'Bytecodes/elem':<15} {'Redim./elem':<11}")
+    print("-" * 96)
+    for p in perfis:
+        redim = '-' if p['redimensionamentos'] is None else f"{p['redimensionamentos']}"
+        redim_elem = '-' if p['redimensionamentos'] is None else f"{p['por_elemento']['redimensionamentos']:.4f}"
+        print(f"{p['motor']:<13} {p['chamadas']:<11,} {p['chamadas_c']:<9,} {p['instrucoes']:<11,} "
+              f"{redim:<8} {p['por_elemento']['chamadas']:<11.2f} "
+              f"{p['por_elemento']['instrucoes']:<15.2f} {redim_elem:<11}")
+    print("=" * 96)
+    print("Pilhas colapsadas (flamegraph.pl / speedscope):")
+    for p in perfis:
+        print(f"  {p['motor']:<13} {p['arquivo']}")
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil do interpretador por elemento de cada motor")
+    parser.add_argument('--n', type=int, default=N_PADRAO, help="N de amostra (padrao: 10.000)")
+    parser.add_argument('--motores', default=','.join(MOTORES_PADRAO),
+                        help="motores registrados, separados por virgula (padrao: for,lambda)")
+    parser.add_argument('--entrada', choices=('range', 'list'), default='range')
+    parser.add_argument('--saida', default=SAIDA_PADRAO,
+                        help="diretorio dos arquivos .folded (padrao: relatorios/perfil/)")
+    args = parser.parse_args()
+
+    nomes = args.motores.split(',')
+    desconhecidos = [nome for nome in nomes if nome not in MOTORES]
+    if desconhecidos:
+        parser.error(f"motores nao registrados: {', '.join(desconhecidos)}")
+    imprimir_perfis([perfilar_motor(nome, args.n, args.entrada, args.saida) for nome in nomes])
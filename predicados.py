@@ -0,0 +1,364 @@
+import json
+import math
+from bisect import bisect_left
+
+import numpy as np
+
+from medicao import medir
+
+# ============================================================================
+#  PROJETO: FILTRO GENERICO POR PREDICADO DECLARATIVO
+# ============================================================================
+#  numpares/numparesL fixam 'i % 2 == 0'. Aqui o criterio e descrito por um
+#  dicionario e o filtro escolhe um caminho especializado para ele:
+#
+#  Predicados:
+#  - {'tipo': 'modulo', 'k': 3, 'resto': 0}           i % k == resto
+#  - {'tipo': 'intervalo', 'min': 10, 'max': 20}      min <= i < max
+#  - {'tipo': 'mascara', 'mascara': 5, 'valor': 1}    (i & mascara) == valor
+#  - {'tipo': 'conjunto', 'valores': [1, 7, 42]}      i in valores
+#
+#  Caminhos:
+#  - passo:     entrada range; resolve o predicado na aritmetica do range
+#               (congruencia para modulo e mascaras de bits baixos, bisect
+#               para intervalo, varredura do conjunto para pertinencia) e
+#               devolve uma fatia, sem testar elemento a elemento.
+#  - numpy:     mascara booleana vetorizada sobre int64 ('&' quando k e
+#               potencia de 2; bitmap indexado para conjuntos densos,
+#               np.isin para os esparsos). Entradas que nao sao ndarray sao
+#               convertidas dentro da chamada (custo incluido).
+#  - compilado: list comprehension gerada com as constantes embutidas
+#               ('& (k-1)' no lugar de '% k' para potencias de 2,
+#               frozenset para pertinencia).
+#  - lambda:    list(filter(lambda ...)), a linha de base de numparesL.
+#
+#  filtrar() escolhe o caminho automaticamente (escolher_caminho);
+#  medir_predicados() compara todos contra a lambda (benchmark_pares.py
+#  --predicados).
+# ============================================================================
+
+TIPOS = ('modulo', 'intervalo', 'mascara', 'conjunto')
+CAMINHOS = ('passo', 'numpy', 'compilado', 'lambda')
+
+# Conjunto vira bitmap no caminho numpy se max(valores) < DENSIDADE_BITMAP * len(entrada)
+DENSIDADE_BITMAP = 4
+
+
+def validar_predicado(predicado):
+    """
+    Confere o tipo e os campos do predicado (ValueError se invalido).
+    """
+    campos = {'modulo': ('k', 'resto'), 'intervalo': ('min', 'max'),
+              'mascara': ('mascara', 'valor'), 'conjunto': ('valores',)}
+    tipo = predicado.get('tipo')
+    if tipo not in campos:
+        raise ValueError(f"tipo de predicado desconhecido: {tipo}")
+    faltando = [c for c in campos[tipo] if c not in predicado]
+    if faltando:
+        raise ValueError(f"predicado '{tipo}' sem os campos: {', '.join(faltando)}")
+    if tipo == 'modulo' and predicado['k'] <= 0:
+        raise ValueError("modulo: k deve ser positivo")
+    return predicado
+
+
+def vazio(predicado):
+    """
+    True se nenhum inteiro satisfaz o predicado (resto fora de 0..k-1, bits
+    fora da mascara): os caminhos especializados devolvem vazio direto.
+    """
+    if predicado['tipo'] == 'modulo':
+        return not 0 <= predicado['resto'] < predicado['k']
+    if predicado['tipo'] == 'mascara':
+        return bool(predicado['valor'] & ~predicado['mascara'])
+    return False
+
+
+def potencia_de_2(k):
+    """
+    True se k for uma potencia de 2 (1, 2, 4, ...).
+    """
+    return k > 0 and k & (k - 1) == 0
+
+
+def mascara_baixa(predicado):
+    """
+    Mascara de bits baixos (2**j - 1) equivale a modulo 2**j: devolve o
+    predicado de modulo correspondente, ou None.
+    """
+    m = predicado['mascara']
+    if m >= 0 and potencia_de_2(m + 1):
+        return {'tipo': 'modulo', 'k': m + 1, 'resto': predicado['valor']}
+    return None
+
+
+def descrever(predicado):
+    """
+    Rotulo curto do predicado para as tabelas.
+    """
+    tipo = predicado['tipo']
+    if tipo == 'modulo':
+        return f"i % {predicado['k']} == {predicado['resto']}"
+    if tipo == 'intervalo':
+        return f"{predicado['min']} <= i < {predicado['max']}"
+    if tipo == 'mascara':
+        return f"i & {predicado['mascara']:#x} == {predicado['valor']:#x}"
+    return f"i in conjunto({len(predicado['valores'])})"
+
+
+def funcao_predicado(predicado):
+    """
+    Predicado generico (funcao de um elemento), usado pela linha de base e
+    como referencia dos demais caminhos.
+    """
+    tipo = validar_predicado(predicado)['tipo']
+    if tipo == 'modulo':
+        k, resto = predicado['k'], predicado['resto']
+        return lambda i: i % k == resto
+    if tipo == 'intervalo':
+        minimo, maximo = predicado['min'], predicado['max']
+        return lambda i: minimo <= i < maximo
+    if tipo == 'mascara':
+        m, valor = predicado['mascara'], predicado['valor']
+        return lambda i: (i & m) == valor
+    valores = frozenset(predicado['valores'])
+    return lambda i: i in valores
+
+
+# ============================================================================
+#  CAMINHOS
+# ============================================================================
+
+def filtrar_lambda(entrada, predicado):
+    """
+    Linha de base: list(filter(lambda ...)), como em numparesL.
+    """
+    return list(filter(funcao_predicado(predicado), entrada))
+
+
+_compilados = {}
+
+def compilar(predicado):
+    """
+    Gera (e guarda) uma list comprehension com as constantes do predicado
+    embutidas no bytecode.
+    """
+    chave = json.dumps(predicado, sort_keys=True)
+    if chave in _compilados:
+        return _compilados[chave]
+
+    tipo = validar_predicado(predicado)['tipo']
+    ambiente = {}
+    if vazio(predicado):
+        tipo = 'nenhum'
+    elif tipo == 'mascara' and mascara_baixa(predicado):
+        predicado, tipo = mascara_baixa(predicado), 'modulo'
+    if tipo == 'nenhum':
+        teste = "False"
+    elif tipo == 'modulo':
+        k, resto = predicado['k'], predicado['resto']
+        if potencia_de_2(k):
+            teste = f"not i & {k - 1}" if resto == 0 else f"(i & {k - 1}) == {resto}"
+        else:
+            teste = f"not i % {k}" if resto == 0 else f"i % {k} == {resto}"
+    elif tipo == 'intervalo':
+        teste = f"{predicado['min']!r} <= i < {predicado['max']!r}"
+    elif tipo == 'mascara':
+        m, valor = predicado['mascara'], predicado['valor']
+        teste = f"not i & {m}" if valor == 0 else f"(i & {m}) == {valor}"
+    else:
+        ambiente['VALORES'] = frozenset(predicado['valores'])
+        teste = "i in VALORES"
+
+    fonte = f"def filtro(l):\n    return [i for i in l if {teste}]\n"
+    exec(compile(fonte, f"<predicado {descrever(predicado)}>", 'exec'), ambiente)
+    _compilados[chave] = ambiente['filtro']
+    return ambiente['filtro']
+
+
+def filtrar_compilado(entrada, predicado):
+    """
+    Caminho compilado: list comprehension especializada.
+    """
+    return compilar(predicado)(entrada)
+
+
+def congruencia(r, k, resto):
+    """
+    Elementos de r (range) com v % k == resto, como fatia de r:
+    resolve start + i*step == resto (mod k) para i.
+    """
+    g = math.gcd(r.step, k)
+    if (resto - r.start) % g:
+        return r[0:0]
+    periodo = k // g
+    if periodo == 1:
+        return r
+    primeiro = (resto - r.start) // g * pow(r.step // g, -1, periodo) % periodo
+    return r[primeiro::periodo]
+
+
+def filtrar_passo(entrada, predicado):
+    """
+    Caminho aritmetico para range: devolve list(fatia do range). Levanta
+    ValueError se o predicado nao tiver forma fechada (mascara arbitraria).
+    """
+    r = entrada
+    tipo = validar_predicado(predicado)['tipo']
+    if vazio(predicado):
+        return []
+    if tipo == 'mascara':
+        equivalente = mascara_baixa(predicado)
+        if equivalente is None:
+            raise ValueError(f"sem caminho aritmetico para {descrever(predicado)}")
+        predicado, tipo = equivalente, 'modulo'
+
+    if tipo == 'modulo':
+        return list(congruencia(r, predicado['k'], predicado['resto']))
+    if tipo == 'intervalo':
+        # range crescente e ordenado: bisect em O(log n) sem materializar nada
+        crescente = r if r.step > 0 else r[::-1]
+        fatia = crescente[bisect_left(crescente, predicado['min']):bisect_left(crescente, predicado['max'])]
+        return list(fatia if r.step > 0 else fatia[::-1])
+    # Conjunto: percorre os valores (nao o range) e testa pertinencia em O(1)
+    valores = sorted({v for v in predicado['valores'] if v in r}, reverse=r.step < 0)
+    return valores
+
+
+def filtrar_numpy(entrada, predicado):
+    """
+    Caminho vetorizado: mascara booleana sobre um ndarray int64.
+    """
+    a = entrada if isinstance(entrada, np.ndarray) else np.asarray(entrada, dtype=np.int64)
+    tipo = validar_predicado(predicado)['tipo']
+    if vazio(predicado):
+        return a[:0]
+    if tipo == 'modulo':
+        k, resto = predicado['k'], predicado['resto']
+        # '&' e '%' coincidem para potencias de 2 (tambem com negativos)
+        return a[(a & (k - 1)) == resto] if potencia_de_2(k) else a[a % k == resto]
+    if tipo == 'intervalo':
+        return a[(a >= predicado['min']) & (a < predicado['max'])]
+    if tipo == 'mascara':
+        return a[(a & predicado['mascara']) == predicado['valor']]
+
+    valores = np.unique(np.asarray(predicado['valores'], dtype=np.int64))
+    if valores.size and valores[0] >= 0 and valores[-1] < DENSIDADE_BITMAP * max(a.size, 1):
+        # Bitmap indexado pelo valor: uma leitura por elemento, sem busca
+        bitmap = np.zeros(int(valores[-1]) + 1, dtype=bool)
+        bitmap[valores] = True
+        dentro = (a >= 0) & (a <= valores[-1])
+        selecao = np.zeros(a.size, dtype=bool)
+        selecao[dentro] = bitmap[a[dentro]]
+        return a[selecao]
+    return a[np.isin(a, valores)]
+
+
+FILTROS = {'passo': filtrar_passo, 'numpy': filtrar_numpy,
+           'compilado': filtrar_compilado, 'lambda': filtrar_lambda}
+
+
+def caminhos_possiveis(entrada, predicado):
+    """
+    Caminhos que aceitam essa entrada e esse predicado, na ordem de CAMINHOS.
+    """
+    caminhos = []
+    if isinstance(entrada, range) and (predicado['tipo'] != 'mascara' or mascara_baixa(predicado)
+                                       or vazio(predicado)):
+        caminhos.append('passo')
+    return caminhos + ['numpy', 'compilado', 'lambda']
+
+
+def escolher_caminho(entrada, predicado):
+    """
+    Caminho automatico: passo para range, numpy para ndarray e compilado
+    para as demais entradas.
+    """
+    if isinstance(entrada, range) and 'passo' in caminhos_possiveis(entrada, predicado):
+        return 'passo'
+    if isinstance(entrada, np.ndarray):
+        return 'numpy'
+    return 'compilado'
+
+
+def filtrar(entrada, predicado, caminho=None):
+    """
+    Filtra 'entrada' pelo predicado declarativo, no caminho pedido ou no
+    escolhido por escolher_caminho().
+    """
+    validar_predicado(predicado)
+    return FILTROS[caminho or escolher_caminho(entrada, predicado)](entrada, predicado)
+
+
+# ============================================================================
+#  COMPARACAO CONTRA A LINHA DE BASE (LAMBDA)
+# ============================================================================
+
+def predicados_padrao(n):
+    """
+    Um predicado de cada tipo, com seletividades diferentes para N elementos.
+    """
+    rng = np.random.default_rng(0)
+    return [
+        {'tipo': 'modulo', 'k': 2, 'resto': 0},
+        {'tipo': 'modulo', 'k': 3, 'resto': 1},
+        {'tipo': 'intervalo', 'min': n // 4, 'max': n // 2},
+        {'tipo': 'mascara', 'mascara': 0b101, 'valor': 0b001},
+        {'tipo': 'conjunto', 'valores': rng.choice(n, size=max(n // 10, 1), replace=False).tolist()},
+    ]
+
+
+def entradas_padrao(n):
+    """
+    0..n-1 em range, list e ndarray int64 (construidos fora do cronometro).
+    """
+    return {'range': range(n), 'list': list(range(n)), 'numpy': np.arange(n, dtype=np.int64)}
+
+
+def medir_predicados(n, predicados=None, **opcoes):
+    """
+    Mede cada caminho possivel em cada (predicado, entrada) e valida a saida
+    contra a referencia. Devolve [{'predicado', 'entrada', 'caminho',
+    'resumo' (ou None se reprovado), 'auto'}].
+    """
+    linhas = []
+    entradas = entradas_padrao(n)
+    for predicado in predicados or predicados_padrao(n):
+        teste = funcao_predicado(predicado)
+        referencia = [v for v in range(n) if teste(v)]
+        for rotulo, entrada in entradas.items():
+            auto = escolher_caminho(entrada, predicado)
+            for caminho in caminhos_possiveis(entrada, predicado):
+                funcao = FILTROS[caminho]
+                ok = [int(v) for v in funcao(entrada, predicado)] == referencia
+                resumo = (medir(lambda dados: funcao(dados, predicado), entrada=entrada, **opcoes)
+                          if ok else None)
+                linhas.append({'predicado': predicado, 'entrada': rotulo, 'caminho': caminho,
+                               'resumo': resumo, 'auto': caminho == auto})
+    return linhas
+
+
+def imprimir_predicados(linhas, n):
+    """
+    Tabela por (predicado, entrada): mediana de cada caminho e speedup sobre
+    a lambda. '*' marca o caminho que filtrar() escolhe sozinho.
+    """
+    print("=" * 92)
+    print(f"PREDICADOS: caminhos especializados vs lambda (N={n:,}; * = escolha automatica)")
+    print("=" * 92)
+    print(f"{'Predicado':<26} {'Entrada':<8} {'Caminho':<11} {'Mediana (ms)':<13} "
+          f"{'ns/elem':<9} {'Speedup vs lambda':<18}")
+    print("-" * 92)
+    base = {(descrever(l['predicado']), l['entrada']): l['resumo']
+            for l in linhas if l['caminho'] == 'lambda'}
+    for l in linhas:
+        rotulo = descrever(l['predicado'])
+        caminho = l['caminho'] + ('*' if l['auto'] else '')
+        if l['resumo'] is None:
+            print(f"{rotulo:<26} {l['entrada']:<8} {caminho:<11} [ERRO] saida diferente da referencia")
+            continue
+        mediana = l['resumo']['mediana_ms']
+        lambda_ = base.get((rotulo, l['entrada']))
+        speedup = f"{lambda_['mediana_ms'] / mediana:.1f}x" if lambda_ else '-'
+        print(f"{rotulo:<26} {l['entrada']:<8} {caminho:<11} {mediana:<13.3f} "
+              f"{mediana * 1e6 / n:<9.2f} {speedup:<18}")
+    print("=" * 92)
@@ -0,0 +1,186 @@
+import matplotlib
+matplotlib.use('Agg')   # Sem janela: antes de qualquer import de pyplot
+
+import argparse
+import hashlib
+import html
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import arquivos_modulo, hash_arquivos
+
+# ============================================================================
+#  PROJETO: RENDERIZACAO DOS RELATORIOS EM ARQUIVO (SEM JANELA)
+# ============================================================================
+#  Gera todos os dashboards das analises como arquivos, sem plt.show():
+#  - backend Agg (nao bloqueia, roda em servidores/CI);
+#  - cada figura e renderizada num processo trabalhador separado;
+#  - saida em PNG e SVG, mais um index.html com todas as figuras.
+#
+#  Cada modulo de analise expoe carregar_dados() (dados brutos) e
+#  DASHBOARDS = {nome: funcao(dados) -> figura}.
+#
+#  Figuras inalteradas sao puladas: o hash SHA-256 dos dados de entrada, do
+#  codigo do modulo e dos modulos do projeto que ele importa fica em
+#  <saida>/.hashes.json. --forcar renderiza tudo.
+# ============================================================================
+
+MODULOS = ('analise_experimental', 'analise_teorica', 'analise_completa', 'hierarquia')
+FORMATOS = ('png', 'svg')
+SAIDA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'relatorios')
+MANIFESTO = '.hashes.json'
+
+
+def iniciar_trabalhador():
+    """
+    Garante o backend Agg tambem em trabalhadores iniciados por 'spawn'.
+    """
+    matplotlib.use('Agg')
+
+
+def hash_figura(modulo, dados):
+    """
+    SHA-256 dos dados de entrada (JSON canonico), do codigo do modulo e dos
+    modulos do projeto que ele importa (ajuste, resultados, colunar...),
+    como a chave de cache.py: editar um deles tambem refaz a figura.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(dados, sort_keys=True, default=str).encode('utf-8'))
+    return hash_arquivos(arquivos_modulo(modulo), h).hexdigest()
+
+
+def renderizar(nome_modulo, nome, dados, saida, formatos):
+    """
+    Trabalhador: constroi a figura 'nome' e grava um arquivo por formato.
+    Devolve os nomes dos arquivos (vazio se o dashboard nao tiver dados).
+    """
+    import matplotlib.pyplot as plt
+
+    modulo = importlib.import_module(nome_modulo)
+    fig = modulo.DASHBOARDS[nome](dados)
+    if fig is None:
+        return []
+    arquivos = []
+    for formato in formatos:
+        arquivo = f"{nome}.{formato}"
+        fig.savefig(os.path.join(saida, arquivo), dpi=120, bbox_inches='tight')
+        arquivos.append(arquivo)
+    plt.close(fig)
+    return arquivos
+
+
+def carregar_manifesto(saida):
+    """
+    Hashes e arquivos da ultima renderizacao de cada dashboard ({} se nao houver).
+    """
+    caminho = os.path.join(saida, MANIFESTO)
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def gravar_manifesto(saida, manifesto):
+    """
+    Grava o manifesto de forma atomica (arquivo temporario + os.replace).
+    """
+    caminho = os.path.join(saida, MANIFESTO)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=1, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def escrever_indice(saida, manifesto):
+    """
+    index.html com as figuras (SVG quando houver, senao PNG) na ordem dos modulos.
+    """
+    linhas = ['<!DOCTYPE html>', '<html lang="pt-BR"><head><meta charset="utf-8">',
+              '<title>Relatorios do benchmark</title></head><body>',
+              '<h1>Relatorios do benchmark</h1>']
+    for nome_modulo in MODULOS:
+        nomes = [n for n, e in manifesto.items() if e['modulo'] == nome_modulo and e['arquivos']]
+        if not nomes:
+            continue
+        linhas.append(f"<h2>{html.escape(nome_modulo)}</h2>")
+        for nome in nomes:
+            arquivos = manifesto[nome]['arquivos']
+            imagem = next((a for a in arquivos if a.endswith('.svg')), arquivos[0])
+            ligacoes = ' '.join(f'<a href="{html.escape(a)}">{html.escape(a)}</a>' for a in arquivos)
+            linhas.append(f'<figure><img src="{html.escape(imagem)}" alt="{html.escape(nome)}" '
+                          f'style="max-width:100%"><figcaption>{html.escape(nome)} ({ligacoes})'
+                          f'</figcaption></figure>')
+    linhas.append('</body></html>')
+    with open(os.path.join(saida, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+
+
+def gerar_relatorios(saida=SAIDA_PADRAO, formatos=FORMATOS, forcar=False, trabalhadores=None):
+    """
+    Renderiza em paralelo os dashboards cujo hash mudou (ou todos, com forcar).
+    Devolve (renderizados, pulados) como listas de nomes.
+    """
+    os.makedirs(saida, exist_ok=True)
+    manifesto = carregar_manifesto(saida)
+    formatos = tuple(formatos)
+
+    # --- Dados e hashes (no processo principal, uma carga por modulo) ---
+    pendentes, pulados = [], []
+    for nome_modulo in MODULOS:
+        modulo = importlib.import_module(nome_modulo)
+        dados = modulo.carregar_dados()
+        assinatura = hash_figura(modulo, dados)
+        for nome in modulo.DASHBOARDS:
+            anterior = manifesto.get(nome, {})
+            atualizado = (anterior.get('hash') == assinatura
+                          and anterior.get('formatos') == list(formatos)
+                          and all(os.path.exists(os.path.join(saida, a))
+                                  for a in anterior.get('arquivos', [])))
+            if atualizado and not forcar:
+                pulados.append(nome)
+            else:
+                pendentes.append((nome_modulo, nome, dados, assinatura))
+
+    # --- Renderizacao paralela (um processo por figura, ate 'trabalhadores') ---
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=trabalhadores or os.cpu_count(),
+                                 initializer=iniciar_trabalhador) as executor:
+            futuros = {nome: (nome_modulo, assinatura,
+                              executor.submit(renderizar, nome_modulo, nome, dados, saida, formatos))
+                       for nome_modulo, nome, dados, assinatura in pendentes}
+            for nome, (nome_modulo, assinatura, futuro) in futuros.items():
+                manifesto[nome] = {'modulo': nome_modulo, 'hash': assinatura,
+                                   'formatos': list(formatos), 'arquivos': futuro.result()}
+
+    gravar_manifesto(saida, manifesto)
+    escrever_indice(saida, manifesto)
+    return [p[1] for p in pendentes], pulados
+
+
+# ============================================================================
+#  EXECUCAO PRINCIPAL
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renderiza os dashboards em arquivos (PNG/SVG/HTML), sem janela.")
+    parser.add_argument('--saida', default=SAIDA_PADRAO,
+                        help="Diretorio de saida (padrao: relatorios/)")
+    parser.add_argument('--formatos', default=','.join(FORMATOS),
+                        help="Formatos separados por virgula (padrao: png,svg)")
+    parser.add_argument('--trabalhadores', type=int, default=None,
+                        help="Processos de renderizacao (padrao: os.cpu_count())")
+    parser.add_argument('--forcar', '--force', action='store_true',
+                        help="Renderiza tudo, mesmo com os dados inalterados")
+    args = parser.parse_args()
+
+    formatos = [f.strip() for f in args.formatos.split(',') if f.strip()]
+    renderizados, pulados = gerar_relatorios(args.saida, formatos, args.forcar, args.trabalhadores)
+
+    print(f"Renderizados: {len(renderizados)}  |  Inalterados (pulados): {len(pulados)}")
+    for nome in renderizados:
+        print(f"  [NOVO] {nome}")
+    for nome in pulados:
+        print(f"  [OK]   {nome}")
+    print(f"Indice: {os.path.join(args.saida, 'index.html')}")
@@ -0,0 +1,341 @@
+import json
+import os
+import platform
+import socket
+import sys
+import time
+
+# ============================================================================
+#  PROJETO: ARMAZENAMENTO DE RESULTADOS DO BENCHMARK
+# ============================================================================
+#  Arquivo JSON versionado escrito pelos benchmarks e lido pelas analises.
+#  Cada execucao fica sob a chave "host|python", com uma serie por motor:
+#
+#  {
+#    "versao": 1,
+#    "execucoes": {
+#      "maquina|3.11.7": {
+#        "host": ..., "python": ..., "plataforma": ..., "atualizado_em": ...,
+#        "motores": {
+#          "for": {"tipo_entrada": "range", "n": [...], "mediana_ms": [...], "amostras_ms": [[...]],
+#                  "a": ..., "b": ..., "ic_a": [...], "ic_b": [...], "r2": ...,
+#                  "pico_bytes": [...], "rss_delta_bytes": [...], "blocos_retidos": [...],
+#                  "ruidosas": [[false, true, ...], ...],
+#                  "instrucoes": [...], "ciclos": [...], "falhas_desvio": [...], "falhas_cache": [...]}
+#        },
+#        "motores_list": {...}
+#      }
+#    }
+#  }
+#
+#  Cada serie guarda o 'tipo_entrada' com que foi medida. A secao "motores"
+#  so tem series de entrada range (benchmark_completo, orquestrador...); as
+#  de outros tipos ficam em "motores_<tipo>" (ex.: "motores_list", de
+#  benchmark_pares), para que list e range nunca se misturem no mesmo N nem
+#  no mesmo ajuste. Gravar um tipo numa serie de outro tipo e um erro.
+#
+#  Experimentos que nao sao motores ficam em secoes proprias da execucao,
+#  no mesmo formato de "motores", fora dos dashboards e ajustes de todos os
+#  motores:
+#    "escalabilidade"  filtro paralelo por modo e processos ('paralelo_<modo>_p<k>');
+#    "hierarquia"      varredura log da hierarquia de cache (hierarquia.py);
+#    "streaming"       benchmark_pares --streaming ('fonte_stream', 'for_stream'...);
+#    "compartilhado"   benchmark_pares --compartilhado ('compartilhado_shm',
+#                      'paralelo_lista'...).
+#
+#  'ruidosas' (modo isolado) marca, alinhado com amostras_ms, as amostras
+#  com interferencia (troca de contexto, GC, frequencia) que sao outliers;
+#  elas ficam no arquivo, mas nao entram no ajuste nem nas series lidas.
+#  'estado_cpu' (tambem do modo isolado) guarda, por N, o governador, as
+#  frequencias atual/minima/maxima, o nucleo e o gc_modo da medicao, para
+#  identificar depois as execucoes ruidosas.
+#
+#  Cada gravacao tambem acrescenta as amostras medidas nela (nao as vindas
+#  do cache) ao historico colunar (resultados_colunar/, ver colunar.py), com
+#  o tipo de entrada de cada motor.
+#
+#  Sem arquivo (ou sem o motor pedido), as analises caem nos dados de
+#  referencia abaixo, coletados na maquina original do estudo.
+# ============================================================================
+
+VERSAO = 1
+
+# Perfil de memoria por N (opcional; ver medicao.medir_memoria)
+CAMPOS_MEMORIA = ('pico_bytes', 'rss_delta_bytes', 'blocos_retidos')
+# Contadores de hardware por chamada (opcional; ver contadores.py)
+CAMPOS_CONTADORES = ('instrucoes', 'ciclos', 'falhas_desvio', 'falhas_cache')
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados.json')
+
+# --- DADOS DE REFERENCIA (benchmark original, em ms) ---
+N_REFERENCIA = [100_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000]
+DADOS_REFERENCIA = {
+    'for': {'n': N_REFERENCIA,
+            'mediana_ms': [15.2, 152.7, 761.9, 1523.4, 7617.9],
+            'a': 0.0001523, 'b': 0.1},
+    'lambda': {'n': N_REFERENCIA,
+               'mediana_ms': [21.4, 215.3, 1076.5, 2154.3, 10769.2],
+               'a': 0.0002154, 'b': 0.15},
+}
+
+
+def chave_ambiente(host=None, python=None):
+    """
+    Chave da execucao: nome da maquina + versao do Python.
+    """
+    host = host or socket.gethostname()
+    python = python or platform.python_version()
+    return f"{host}|{python}"
+
+
+def carregar(caminho=ARQUIVO_PADRAO):
+    """
+    Le o arquivo de resultados (estrutura vazia se ainda nao existir).
+    """
+    if not os.path.exists(caminho):
+        return {'versao': VERSAO, 'execucoes': {}}
+    with open(caminho, encoding='utf-8') as f:
+        dados = json.load(f)
+    if dados.get('versao') != VERSAO:
+        raise ValueError(f"{caminho}: versao {dados.get('versao')} nao suportada (esperado {VERSAO})")
+    return dados
+
+
+def gravar(dados, caminho=ARQUIVO_PADRAO):
+    """
+    Escrita atomica: grava num temporario e substitui o arquivo final.
+    """
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, separators=(',', ':'))
+    os.replace(temporario, caminho)
+
+
+def amostras_limpas(serie):
+    """
+    amostras_ms de cada N sem as amostras marcadas como ruidosas (se todas
+    forem ruidosas, mantem o N inteiro). None se a serie nao tiver amostras.
+    """
+    amostras = serie.get('amostras_ms')
+    if not amostras:
+        return None
+    ruidosas = serie.get('ruidosas') or [None] * len(amostras)
+    limpas = []
+    for reps, marcas in zip(amostras, ruidosas):
+        if marcas and reps and not all(marcas):
+            reps = [a for a, ruidosa in zip(reps, marcas) if not ruidosa]
+        limpas.append(reps)
+    return limpas
+
+
+def secao_entrada(tipo_entrada='range', secao='motores'):
+    """
+    Secao da execucao que guarda as series de 'secao' com 'tipo_entrada':
+    range fica na propria secao; os demais tipos de "motores" em
+    "motores_<tipo>". As outras secoes ja sao de um unico experimento.
+    """
+    if secao != 'motores' or tipo_entrada == 'range':
+        return secao
+    return f"{secao}_{tipo_entrada}"
+
+
+def secoes_motores(execucao):
+    """
+    {tipo_entrada: {motor: serie}} de todas as secoes de motores da execucao.
+    """
+    return {('range' if secao == 'motores' else secao[len('motores_'):]): series
+            for secao, series in execucao.items()
+            if secao == 'motores' or (secao.startswith('motores_') and isinstance(series, dict))}
+
+
+def registrar_ajuste(serie):
+    """
+    Ajusta T(n) = a*n + b (OLS sobre todas as repeticoes) e grava na serie
+    os coeficientes, seus IC 95%, o R2 e o modelo preferido pelo BIC.
+    """
+    # ajuste importa numpy: so carrega quando ha algo a ajustar
+    from ajuste import ajustar, selecionar_modelo
+
+    amostras = amostras_limpas(serie) or serie['mediana_ms']
+    if len(serie['n']) < 2:
+        # Um unico N nao define reta: custo medio por elemento, sem intercepto
+        serie['a'], serie['b'] = serie['mediana_ms'][0] / serie['n'][0], 0.0
+        return
+    linear = ajustar(serie['n'], amostras, 'linear')
+    serie['a'], serie['b'] = linear['a'], linear['b']
+    serie['ic_a'], serie['ic_b'] = list(linear['ic_a']), list(linear['ic_b'])
+    serie['r2'] = linear['r2']
+    if len(serie['n']) > 2:
+        serie['modelo_bic'] = selecionar_modelo(serie['n'], amostras)[0]['modelo']
+
+
+def salvar_medicoes(medicoes, caminho=ARQUIVO_PADRAO, secao='motores', tipo_entrada='range',
+                    historico=None):
+    """
+    Grava o dicionario {(motor, n): resumo} produzido por medicao.py na
+    execucao do ambiente atual, mesclando com os N ja registrados. 'secao'
+    separa series que nao sao motores (ex.: 'escalabilidade'); so a secao
+    'motores' vai para o historico colunar.
+
+    - tipo_entrada: tipo de entrada das amostras ('range', 'list'...), ou
+      {motor: tipo} quando a execucao mistura tipos. Decide a secao da
+      serie (secao_entrada) e vale tambem para o historico colunar.
+    - historico: {(motor, n): resumo} so com as amostras medidas nesta
+      execucao (padrao: 'medicoes' sem as celulas vindas do cache).
+    """
+    dados = carregar(caminho)
+    chave = chave_ambiente()
+    execucao = dados['execucoes'].setdefault(chave, {
+        'host': socket.gethostname(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'motores': {},
+    })
+    execucao['implementacao'] = sys.implementation.name
+    execucao['atualizado_em'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def tipo_de(motor):
+        return tipo_entrada if isinstance(tipo_entrada, str) else tipo_entrada[motor]
+
+    secoes = set()
+    for (motor, n), resumo in medicoes.items():
+        tipo = tipo_de(motor)
+        secoes.add(secao_entrada(tipo, secao))
+        serie = execucao.setdefault(secao_entrada(tipo, secao), {}).setdefault(
+            motor, {'tipo_entrada': tipo, 'n': [], 'mediana_ms': [], 'amostras_ms': []})
+        if serie.setdefault('tipo_entrada', 'range') != tipo:
+            raise ValueError(f"serie '{motor}' foi medida com entrada {serie['tipo_entrada']}, "
+                             f"nao {tipo}: tipos diferentes nao se misturam")
+        valores = {'mediana_ms': resumo['mediana_ms'],
+                   'amostras_ms': [a / 1e6 for a in resumo['amostras_ns']]}
+        for campo in CAMPOS_MEMORIA:
+            valores[campo] = resumo.get(campo)
+        if 'qualidade' in resumo:
+            valores['ruidosas'] = [q['ruidosa'] for q in resumo['qualidade']]
+        elif 'ruidosas' in serie:
+            valores['ruidosas'] = None      # Remedido sem marcas: descarta as antigas
+        if 'estado_cpu' in resumo or 'estado_cpu' in serie:
+            valores['estado_cpu'] = resumo.get('estado_cpu')
+        for campo in CAMPOS_CONTADORES:
+            if campo in resumo or campo in serie:
+                valores[campo] = resumo.get(campo)
+        if n in serie['n']:
+            i = serie['n'].index(n)
+        else:
+            i = len(serie['n'])
+            serie['n'].append(n)
+        for campo, valor in valores.items():
+            coluna = serie.setdefault(campo, [None] * len(serie['n']))
+            coluna.extend([None] * (len(serie['n']) - len(coluna)))
+            coluna[i] = valor
+
+    # Mantem as series ordenadas por N e recalcula os coeficientes
+    for serie in (serie for nome in secoes for serie in execucao[nome].values()):
+        ordem = sorted(range(len(serie['n'])), key=serie['n'].__getitem__)
+        for campo in ('n', 'mediana_ms', 'amostras_ms', 'ruidosas', 'estado_cpu') + CAMPOS_MEMORIA + CAMPOS_CONTADORES:
+            if campo in serie:
+                serie[campo] = [serie[campo][i] for i in ordem]
+        registrar_ajuste(serie)
+
+    gravar(dados, caminho)
+    if secao != 'motores':
+        return chave
+
+    # Historico de todas as amostras (colunar.py importa numpy: so aqui).
+    # So entra o que foi medido agora: acertos do cache ja estao la
+    from colunar import anexar, diretorio_de
+    if historico is None:
+        historico = {celula: resumo for celula, resumo in medicoes.items()
+                     if not resumo.get('do_cache')}
+    por_tipo = {}
+    for (motor, n), resumo in historico.items():
+        por_tipo.setdefault(tipo_de(motor), {})[(motor, n)] = resumo
+    for tipo, grupo in por_tipo.items():
+        anexar(grupo, chave, diretorio_de(caminho), tipo)
+    return chave
+
+
+def escolher_execucao(dados, host=None, python=None):
+    """
+    Execucao pedida (host/python), a do ambiente atual, ou a mais recente.
+    """
+    execucoes = dados['execucoes']
+    if not execucoes:
+        return None
+    if host or python:
+        return execucoes.get(chave_ambiente(host, python))
+    atual = execucoes.get(chave_ambiente())
+    if atual is not None:
+        return atual
+    return max(execucoes.values(), key=lambda e: e.get('atualizado_em', ''))
+
+
+def carregar_series(*motores, host=None, python=None, caminho=ARQUIVO_PADRAO,
+                    tipo_entrada='range'):
+    """
+    Devolve (n_elementos, {motor: serie}) com as series restritas aos N
+    medidos por todos os motores pedidos, so com entrada 'tipo_entrada'.
+    Se algum motor nao estiver no arquivo, usa os dados de referencia.
+    """
+    execucao = escolher_execucao(carregar(caminho), host, python)
+    fonte = execucao.get(secao_entrada(tipo_entrada), {}) if execucao else {}
+    if not all(m in fonte for m in motores):
+        print("[AVISO] Sem resultados medidos para "
+              f"{', '.join(motores)} em {caminho}; usando dados de referencia.")
+        fonte = DADOS_REFERENCIA
+        faltando = [m for m in motores if m not in fonte]
+        if faltando:
+            raise KeyError(f"sem dados (medidos ou de referencia) para: {', '.join(faltando)}")
+
+    comuns = sorted(set.intersection(*(set(fonte[m]['n']) for m in motores)))
+    series = {}
+    for m in motores:
+        indice = {n: i for i, n in enumerate(fonte[m]['n'])}
+        serie = {'n': comuns,
+                 'mediana_ms': [fonte[m]['mediana_ms'][indice[n]] for n in comuns],
+                 'a': fonte[m]['a'], 'b': fonte[m]['b']}
+        for campo in CAMPOS_MEMORIA:
+            if campo in fonte[m]:
+                serie[campo] = [fonte[m][campo][indice[n]] for n in comuns]
+        limpas = amostras_limpas(fonte[m])
+        if limpas:
+            serie['amostras_ms'] = [limpas[indice[n]] for n in comuns]
+        series[m] = serie
+    return comuns, series
+
+
+def carregar_series_campos(campos, host=None, python=None, caminho=ARQUIVO_PADRAO,
+                           tipo_entrada='range'):
+    """
+    Colunas 'campos' dos motores gravados com entrada 'tipo_entrada':
+    {motor: {'n', campos...}}, so com os N em que o primeiro campo foi medido.
+    """
+    execucao = escolher_execucao(carregar(caminho), host, python)
+    if execucao is None:
+        return {}
+    series = {}
+    for motor, serie in execucao.get(secao_entrada(tipo_entrada), {}).items():
+        primeira = serie.get(campos[0]) or []
+        indices = [i for i, v in enumerate(primeira) if v is not None]
+        if indices:
+            series[motor] = {'n': [serie['n'][i] for i in indices]}
+            for campo in campos:
+                # Campo ausente em gravacoes antigas (ex.: renomeado) vira None
+                coluna = serie.get(campo) or [None] * len(serie['n'])
+                series[motor][campo] = [coluna[i] for i in indices]
+    return series
+
+
+def carregar_series_memoria(host=None, python=None, caminho=ARQUIVO_PADRAO, tipo_entrada='range'):
+    """
+    Perfil de memoria de todos os motores gravados: {motor: {'n', campos...}},
+    so com os N que tem medicao de memoria.
+    """
+    return carregar_series_campos(CAMPOS_MEMORIA, host, python, caminho, tipo_entrada)
+
+
+def carregar_series_contadores(host=None, python=None, caminho=ARQUIVO_PADRAO, tipo_entrada='range'):
+    """
+    Contadores de hardware de todos os motores gravados, so com os N que
+    foram medidos com --contadores.
+    """
+    return carregar_series_campos(CAMPOS_CONTADORES, host, python, caminho, tipo_entrada)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from ajuste import ajustar, intervalo_predicao, quantil_t, selecionar_modelo
+
+# Quantis 97.5% da t de Student (tabela)
+T_975 = {1: 12.7062, 2: 4.3027, 3: 3.1824, 10: 2.2281, 30: 2.0423, 100: 1.9840}
+
+
+@pytest.mark.parametrize('gl, esperado', sorted(T_975.items()))
+def test_quantil_t_tabela(gl, esperado):
+    assert quantil_t(0.975, gl) == pytest.approx(esperado, abs=1e-4)
+
+
+def test_quantil_t_simetria():
+    assert quantil_t(0.5, 5) == 0.0
+    assert quantil_t(0.025, 5) == pytest.approx(-quantil_t(0.975, 5))
+    assert quantil_t(0.975, 0) == float('inf')
+
+
+def amostras_reta(a, b, n, reps=5, ruido=0.01, semente=0):
+    rng = np.random.default_rng(semente)
+    return [list(a * ni + b + rng.normal(0, ruido * (a * ni + b), reps)) for ni in n]
+
+
+@pytest.mark.parametrize('ponderado', [False, True])
+def test_ajustar_recupera_reta(ponderado):
+    n = [10**4, 10**5, 10**6, 5 * 10**6]
+    ajuste = ajustar(n, amostras_reta(2e-4, 0.5, n), 'linear', ponderado=ponderado)
+    assert ajuste['a'] == pytest.approx(2e-4, rel=0.02)
+    assert ajuste['ic_a'][0] <= ajuste['a'] <= ajuste['ic_a'][1]
+    assert ajuste['ic_a'][0] < 2e-4 < ajuste['ic_a'][1]
+    assert ajuste['gl'] == len(n) * 5 - 2
+    assert ajuste['r2'] > 0.99
+
+
+def test_ajustar_sem_ruido_e_exato():
+    n = [1, 2, 3, 4]
+    ajuste = ajustar(n, [3.0 * x + 1.0 for x in n], 'linear')
+    assert ajuste['a'] == pytest.approx(3.0)
+    assert ajuste['b'] == pytest.approx(1.0)
+
+
+def test_ajustar_potencia():
+    n = [10**3, 10**4, 10**5, 10**6]
+    ajuste = ajustar(n, [1e-6 * x ** 1.5 for x in n], 'potencia')
+    assert ajuste['b'] == pytest.approx(1.5)
+    assert ajuste['a'] == pytest.approx(1e-6, rel=1e-6)
+
+
+def test_intervalo_predicao():
+    n = [10**4, 10**5, 10**6, 5 * 10**6]
+    ajuste = ajustar(n, amostras_reta(2e-4, 0.5, n), 'linear')
+    centro, baixo, alto = intervalo_predicao(ajuste, [10**5, 10**6])
+    assert centro.shape == baixo.shape == alto.shape == (2,)
+    assert np.all(baixo < centro) and np.all(centro < alto)
+    # Um nivel de confianca maior so alarga o intervalo
+    _, baixo99, alto99 = intervalo_predicao(ajuste, [10**5, 10**6], confianca=0.99)
+    assert np.all(baixo99 < baixo) and np.all(alto < alto99)
+    with pytest.raises(ValueError):
+        intervalo_predicao(ajustar(n, amostras_reta(2e-4, 0.5, n), 'potencia'), 10**5)
+
+
+def test_selecionar_modelo_quadratico():
+    n = [10**2, 10**3, 3 * 10**3, 10**4, 3 * 10**4]
+    melhor, ajustes = selecionar_modelo(n, [[1e-6 * x * x * f for f in (0.99, 1.0, 1.01)] for x in n])
+    assert melhor['modelo'] == 'quadratico'
+    assert set(ajustes) == {'linear', 'nlogn', 'quadratico', 'potencia'}
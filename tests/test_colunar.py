@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from colunar import abrir, anexar, resumo_historico
+
+
+def resumo(amostras_ns, ruidosas=None):
+    r = {'amostras_ns': amostras_ns}
+    if ruidosas is not None:
+        r['qualidade'] = [{'ruidosa': x} for x in ruidosas]
+    return r
+
+
+def test_anexar_abrir_ida_e_volta(tmp_path):
+    diretorio = str(tmp_path / 'colunar')
+    assert abrir(diretorio)[0] == {}
+    assert anexar({('for', 100): resumo([1_000_000, 3_000_000, 2_000_000])}, 'h|3.11', diretorio) == 3
+    assert anexar({('for', 100): resumo([5_000_000]),
+                   ('numpy', 200): resumo([4_000_000, 6_000_000])}, 'h|3.11', diretorio, 'list') == 3
+
+    colunas, indice = abrir(diretorio)
+    assert indice['linhas'] == 6
+    assert list(colunas['amostra_ns']) == [1_000_000, 3_000_000, 2_000_000, 5_000_000, 4_000_000, 6_000_000]
+    assert list(colunas['repeticao']) == [0, 1, 2, 0, 0, 1]
+    assert indice['dicionarios']['entrada'] == ['range', 'list']
+    assert indice['dicionarios']['motor'] == ['for', 'numpy']
+
+
+def test_resumo_historico_agrupa_e_ignora_ruidosas(tmp_path):
+    diretorio = str(tmp_path / 'colunar')
+    anexar({('for', 100): resumo([1_000_000, 2_000_000, 3_000_000, 90_000_000],
+                                 [False, False, False, True])}, 'h|3.11', diretorio)
+    anexar({('for', 100): resumo([4_000_000])}, 'h|3.11', diretorio, 'list')
+
+    linhas = {(l['motor'], l['entrada']): l for l in resumo_historico(diretorio)['linhas']}
+    assert linhas['for', 'range']['contagem'] == 3
+    assert linhas['for', 'range']['mediana_ms'] == pytest.approx(2.0)
+    assert linhas['for', 'range']['min_ms'] == pytest.approx(1.0)
+    assert linhas['for', 'list']['mediana_ms'] == pytest.approx(4.0)
+    completo = resumo_historico(diretorio, incluir_ruidosas=True)
+    assert completo['amostras'] == 5
+    assert max(l['p95_ms'] for l in completo['linhas']) == pytest.approx(90.0)
+
+
+def test_gravacao_interrompida_e_descartada(tmp_path):
+    diretorio = str(tmp_path / 'colunar')
+    anexar({('for', 100): resumo([1_000_000])}, 'h|3.11', diretorio)
+    # Bytes alem de 'linhas' (gravacao sem o indice) nao aparecem nem ficam
+    with open(tmp_path / 'colunar' / 'amostra_ns.bin', 'ab') as f:
+        np.array([7, 7], dtype='int64').tofile(f)
+    assert abrir(diretorio)[1]['linhas'] == 1
+    anexar({('for', 100): resumo([2_000_000])}, 'h|3.11', diretorio)
+    assert list(abrir(diretorio)[0]['amostra_ns']) == [1_000_000, 2_000_000]
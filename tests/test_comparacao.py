@@ -0,0 +1,24 @@
+import random
+
+from comparacao import mann_whitney
+
+
+def test_mann_whitney_deslocada():
+    rng = random.Random(0)
+    base = [10 + rng.gauss(0, 0.1) for _ in range(20)]
+    lenta = [11 + rng.gauss(0, 0.1) for _ in range(20)]
+    p_lenta, p_rapida = mann_whitney(base, lenta)
+    assert p_lenta < 1e-6
+    assert p_rapida > 0.99
+    p_lenta, p_rapida = mann_whitney(lenta, base)
+    assert p_rapida < 1e-6
+
+
+def test_mann_whitney_iguais():
+    amostras = [1.0, 2.0, 3.0, 4.0, 5.0]
+    p_lenta, p_rapida = mann_whitney(amostras, list(amostras))
+    assert p_lenta > 0.3 and p_rapida > 0.3
+
+
+def test_mann_whitney_empates_totais():
+    assert mann_whitney([2.0] * 5, [2.0] * 5) == (0.5, 0.5)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from hierarquia import ajustar_segmentos, valores_log
+
+
+def test_ajustar_segmentos_encontra_quebra():
+    n = np.array(valores_log(10**3, 10**7, 10), dtype=float)
+    rng = np.random.default_rng(0)
+    # Custo por elemento triplica a partir de 10^5 (trechos continuos)
+    tempos = np.where(n < 1e5, 1e-5 * n, 1.0 + 3e-5 * (n - 1e5))
+    tempos *= 1 + rng.normal(0, 0.005, n.size)
+    ajuste = ajustar_segmentos(n, tempos)
+    assert len(ajuste['quebras']) == 1
+    assert 10**4.8 < ajuste['quebras'][0] < 10**5.2
+    antes, depois = ajuste['segmentos']
+    assert antes['a'] == pytest.approx(1e-5, rel=0.05) and depois['a'] == pytest.approx(3e-5, rel=0.05)
+    assert antes['pontos'] + depois['pontos'] == n.size
+
+
+def test_ajustar_segmentos_reta_unica():
+    n = np.array(valores_log(10**3, 10**7, 10), dtype=float)
+    ajuste = ajustar_segmentos(n, 2e-5 * n + 0.01)
+    assert ajuste['quebras'] == []
+    assert len(ajuste['segmentos']) == 1
+
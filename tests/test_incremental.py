@@ -0,0 +1,47 @@
+import random
+
+from incremental import FRACAO_RECONSTRUCAO, consultar, contar, criar_filtro, remover
+
+
+def referencia(dados, removidas):
+    return [v for p, v in enumerate(dados) if v % 2 == 0 and p not in removidas]
+
+
+def test_acrescimos_e_remocoes_batem_com_a_referencia():
+    rng = random.Random(0)
+    dados = list(range(1000))
+    filtro = criar_filtro(dados)
+    removidas = set()
+    for rodada in range(50):
+        dados.extend(rng.randrange(10**6) for _ in range(rng.randrange(200)))
+        # Poucas remocoes (busca binaria) ou muitas (passada pelo bitmap)
+        quantas = rng.choice((1, len(dados) // FRACAO_RECONSTRUCAO + 50))
+        for posicao in rng.sample(range(len(dados)), quantas):
+            remover(filtro, posicao)
+            removidas.add(posicao)
+        assert consultar(filtro) == referencia(dados, removidas)
+    assert contar(filtro) == len(referencia(dados, removidas))
+
+
+def test_remocao_antes_do_acrescimo():
+    dados = [0, 2, 4]
+    filtro = criar_filtro(dados)
+    assert consultar(filtro) == [0, 2, 4]
+    remover(filtro, 4)
+    dados.extend([6, 8])
+    assert consultar(filtro) == [0, 2, 4, 6]
+
+
+def test_remover_duas_vezes_e_idempotente():
+    filtro = criar_filtro(list(range(10)))
+    remover(filtro, 2)
+    remover(filtro, 2)
+    assert consultar(filtro) == [0, 4, 6, 8]
+
+
+def test_dados_encolhidos_refazem_o_indice():
+    dados = list(range(10))
+    filtro = criar_filtro(dados)
+    consultar(filtro)
+    del dados[4:]
+    assert consultar(filtro) == [0, 2]
@@ -0,0 +1,40 @@
+import pytest
+
+from resultados import carregar, carregar_series, chave_ambiente, salvar_medicoes
+
+
+def medicoes(mediana_ms, ns=(1000, 2000, 4000)):
+    return {('for', n): {'mediana_ms': mediana_ms * n / 1000,
+                         'amostras_ns': [int(mediana_ms * n * 1e3)] * 3} for n in ns}
+
+
+def test_tipos_de_entrada_ficam_em_secoes_separadas(tmp_path):
+    caminho = str(tmp_path / 'resultados.json')
+    salvar_medicoes(medicoes(1.0), caminho)
+    salvar_medicoes(medicoes(5.0), caminho, tipo_entrada='list')
+
+    execucao = carregar(caminho)['execucoes'][chave_ambiente()]
+    assert execucao['motores']['for']['tipo_entrada'] == 'range'
+    assert execucao['motores_list']['for']['tipo_entrada'] == 'list'
+    assert carregar_series('for', caminho=caminho)[1]['for']['mediana_ms'] == [1.0, 2.0, 4.0]
+    lista = carregar_series('for', caminho=caminho, tipo_entrada='list')[1]['for']
+    assert lista['mediana_ms'] == [5.0, 10.0, 20.0]
+    assert lista['a'] == pytest.approx(5e-3)
+
+
+def test_tipos_diferentes_na_mesma_serie_sao_recusados(tmp_path):
+    caminho = str(tmp_path / 'resultados.json')
+    salvar_medicoes(medicoes(1.0), caminho, secao='compartilhado', tipo_entrada='list')
+    with pytest.raises(ValueError):
+        salvar_medicoes(medicoes(1.0), caminho, secao='compartilhado', tipo_entrada='range')
+
+
+def test_historico_colunar_so_recebe_amostras_novas(tmp_path):
+    from colunar import abrir, diretorio_de
+
+    caminho = str(tmp_path / 'resultados.json')
+    salvar_medicoes(medicoes(1.0), caminho)
+    do_cache = {celula: dict(r, do_cache=True) for celula, r in medicoes(1.0).items()}
+    salvar_medicoes(do_cache, caminho)
+    salvar_medicoes(medicoes(1.0), caminho, secao='streaming', tipo_entrada='blocos')
+    assert abrir(diretorio_de(caminho))[1]['linhas'] == 9